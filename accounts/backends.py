@@ -0,0 +1,35 @@
+# accounts/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+# One-to-one relations read by the base template and most views
+USER_CONTEXT_RELATED = ('profile', 'consultant_profile', 'subscription')
+
+
+class UserContextBackend(ModelBackend):
+    """
+    ModelBackend that loads the session user together with its candidate
+    profile, consultant profile and subscription in one joined query.
+
+    AuthenticationMiddleware keeps the user for the rest of the request,
+    so these relations no longer cost a query each time a page touches
+    them. A missing relation is cached too: `hasattr(user, 'profile')` and
+    the template lookups answer without a query.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related(*USER_CONTEXT_RELATED).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        # ModelBackend's async variant doesn't go through get_user()
+        UserModel = get_user_model()
+        try:
+            user = await UserModel._default_manager.select_related(*USER_CONTEXT_RELATED).aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
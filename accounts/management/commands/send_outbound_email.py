@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import MAX_ATTEMPTS, deliver_batch
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbound emails in batches over one mail server connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help="Emails sent per connection (default: 50)",
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=MAX_ATTEMPTS,
+            help=f"Attempts before an email is marked failed (default: {MAX_ATTEMPTS})",
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help="Keep running and poll for new emails instead of exiting when the outbox is empty",
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help="Seconds between polls of an empty outbox with --loop (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            try:
+                sent, failed = deliver_batch(
+                    batch_size=options['batch_size'],
+                    max_attempts=options['max_attempts'],
+                )
+            except Exception as exc:
+                # Mail server unreachable: nothing was attempted, try again later
+                if not options['loop']:
+                    raise
+                self.stderr.write(f"Delivery failed: {exc}")
+                time.sleep(options['interval'])
+                continue
+
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+            elif options['loop']:
+                time.sleep(options['interval'])
+            else:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total_sent} sent, {total_failed} failed."))
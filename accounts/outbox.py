@@ -0,0 +1,140 @@
+# accounts/outbox.py
+from datetime import timedelta
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+MAX_ATTEMPTS = 5
+
+# Retry delays: 1, 2, 4, 8... minutes, at most an hour
+BACKOFF_BASE = timedelta(minutes=1)
+BACKOFF_MAX = timedelta(hours=1)
+
+# How long claimed emails stay hidden from other workers
+LEASE = timedelta(minutes=10)
+
+
+def queue_email(subject, body, to, html_message=None, from_email=None):
+    """
+    Add an email to the outbox. Call it inside the transaction of the
+    change the email is about; the worker only sees it once committed.
+    """
+    if isinstance(to, str):
+        to = [to]
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        html_body=html_message or '',
+        from_email=from_email or '',
+        to=list(to),
+    )
+
+
+def backoff(attempts):
+    return min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+
+
+def claim_due_emails(batch_size):
+    """
+    Take up to `batch_size` due emails off the queue. They are leased
+    (next attempt pushed back by LEASE) rather than locked, so no
+    transaction stays open while talking to the mail server, and emails
+    of a worker that dies mid-batch are picked up again after the lease.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = OutboundEmail.objects.filter(status='PENDING', next_attempt_at__lte=now)
+        if db_connection.features.has_select_for_update_skip_locked:
+            # Parallel workers each claim different rows
+            emails = emails.select_for_update(skip_locked=True)
+        emails = list(emails.order_by('next_attempt_at', 'id')[:batch_size])
+        OutboundEmail.objects.filter(id__in=[email.id for email in emails]).update(next_attempt_at=now + LEASE)
+    return emails
+
+
+def build_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or None,
+        to=email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def deliver_batch(batch_size=50, max_attempts=MAX_ATTEMPTS, connection=None):
+    """
+    Send up to `batch_size` due emails over a single backend connection.
+    A failed email is retried later with exponential backoff, and marked
+    FAILED after `max_attempts`. When no connection can be opened the
+    batch is postponed without counting an attempt, and the error raised.
+    Returns (sent, failed) counts.
+    """
+    emails = claim_due_emails(batch_size)
+    if not emails:
+        return 0, 0
+
+    connection = connection or get_connection(fail_silently=False)
+    sent = failed = 0
+    try:
+        try:
+            connection.open()
+        except Exception as exc:
+            postpone(emails, exc)
+            raise
+
+        for index, email in enumerate(emails):
+            now = timezone.now()
+            email.attempts += 1
+            try:
+                connection.send_messages([build_message(email, connection)])
+            except Exception as exc:
+                email.last_error = f'{type(exc).__name__}: {exc}'
+                if email.attempts >= max_attempts:
+                    email.status = 'FAILED'
+                else:
+                    email.next_attempt_at = now + backoff(email.attempts)
+                failed += 1
+                # The error may have broken the connection: the rest of the
+                # batch goes over one new connection
+                _close_quietly(connection)
+                try:
+                    connection.open()
+                except Exception as exc:
+                    postpone(emails[index + 1:], exc)
+                    break
+            else:
+                email.status = 'SENT'
+                email.sent_at = now
+                email.last_error = ''
+                sent += 1
+    finally:
+        _close_quietly(connection)
+        OutboundEmail.objects.bulk_update(
+            emails, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+        )
+    return sent, failed
+
+
+def postpone(emails, exc):
+    """
+    Back off emails that couldn't be tried (mail server unreachable), so
+    they aren't claimed again right away. Not counted as an attempt.
+    """
+    now = timezone.now()
+    for email in emails:
+        email.last_error = f'{type(exc).__name__}: {exc}'
+        email.next_attempt_at = now + backoff(email.attempts + 1)
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
@@ -1,3 +1,201 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .backends import UserContextBackend
+from .models import OutboundEmail, User
+from .outbox import deliver_batch, queue_email
+
+
+class FlakyBackend(EmailBackend):
+    """
+    locmem backend that refuses mail to @broken.example.com and counts
+    the connections it opens. Like the SMTP backend, sending without an
+    open connection opens one for that call only.
+    """
+    opened = 0
+    unreachable = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.is_open = False
+
+    def open(self):
+        if FlakyBackend.unreachable:
+            raise ConnectionRefusedError('connection refused')
+        if self.is_open:
+            return False
+        FlakyBackend.opened += 1
+        self.is_open = True
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, messages):
+        new_connection = self.open()
+        try:
+            for message in messages:
+                if any(address.endswith('@broken.example.com') for address in message.to):
+                    raise ConnectionError('mailbox unavailable')
+            return super().send_messages(messages)
+        finally:
+            if new_connection:
+                self.close()
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class OutboxTests(TestCase):
+    def test_signup_queues_welcome_email_instead_of_sending(self):
+        response = self.client.post(reverse('accounts:signup'), {
+            'email': 'new@example.com', 'role': 'CANDIDATE',
+            'password': 'pass12345', 'password2': 'pass12345',
+        })
+
+        self.assertRedirects(response, reverse('jobs:jobs_list'))
+        self.assertEqual(mail.outbox, [])
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.to, ['new@example.com'])
+        self.assertIn('<h2>Welcome', email.html_body)
+
+        call_command('send_outbound_email', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['new@example.com'])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'SENT')
+        self.assertIsNotNone(email.sent_at)
+
+    @override_settings(EMAIL_BACKEND='accounts.tests.FlakyBackend')
+    def test_batch_shares_one_connection_and_retries_failures(self):
+        for address in ('a@example.com', 'b@broken.example.com', 'c@example.com', 'd@example.com'):
+            queue_email('Hello', 'Hi there', address)
+        FlakyBackend.opened = 0
+
+        self.assertEqual(deliver_batch(), (3, 1))
+        # One connection before the failure, one shared by the emails after it
+        self.assertEqual(FlakyBackend.opened, 2)
+        self.assertEqual(len(mail.outbox), 3)
+
+        failed = OutboundEmail.objects.get(status='PENDING')
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn('mailbox unavailable', failed.last_error)
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+
+        # Not due yet
+        self.assertEqual(deliver_batch(), (0, 0))
+
+    @override_settings(EMAIL_BACKEND='accounts.tests.FlakyBackend')
+    def test_gives_up_after_max_attempts(self):
+        email = queue_email('Hello', 'Hi there', 'x@broken.example.com')
+
+        for attempt in range(3):
+            OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+            deliver_batch(max_attempts=3)
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'FAILED')
+        self.assertEqual(email.attempts, 3)
+        self.assertEqual(mail.outbox, [])
+
+    @override_settings(EMAIL_BACKEND='accounts.tests.FlakyBackend')
+    def test_unreachable_server_postpones_the_batch(self):
+        email = queue_email('Hello', 'Hi there', 'a@example.com')
+
+        with mock.patch.object(FlakyBackend, 'unreachable', True):
+            with self.assertRaises(ConnectionRefusedError):
+                deliver_batch()
+            # Postponed, not due again right away
+            self.assertEqual(deliver_batch(), (0, 0))
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'PENDING')
+        self.assertEqual(email.attempts, 0)
+        self.assertIn('connection refused', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(mail.outbox, [])
+
+    def test_rolled_back_signup_leaves_no_email(self):
+        def queue_then_fail(*args, **kwargs):
+            queue_email(*args, **kwargs)
+            raise RuntimeError("signup failed after queueing")
+
+        with mock.patch('accounts.views.queue_email', side_effect=queue_then_fail):
+            with self.assertRaises(RuntimeError):
+                self.client.post(reverse('accounts:signup'), {
+                    'email': 'new@example.com', 'role': 'CANDIDATE',
+                    'password': 'pass12345', 'password2': 'pass12345',
+                })
+        self.assertFalse(User.objects.filter(email='new@example.com').exists())
+        self.assertFalse(OutboundEmail.objects.exists())
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserContextBackendTests(TestCase):
+    MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+    CONTEXT_BACKEND = 'accounts.backends.UserContextBackend'
+
+    # Queries saved per page: the lazy profile / consultant profile /
+    # subscription lookups of the base template and the views
+    SAVINGS = {
+        ('CANDIDATE', 'accounts:dashboard'): 2,
+        ('CANDIDATE', 'jobs:jobs_list'): 2,
+        ('CANDIDATE', 'training:course_list'): 2,
+        ('CANDIDATE', 'chatbot:greeting'): 3,
+        ('CANDIDATE', 'chatbot:greeting_async'): 3,
+        ('CONSULTANT', 'accounts:dashboard'): 1,
+        ('CONSULTANT', 'jobs:jobs_list'): 1,
+        ('CONSULTANT', 'chatbot:greeting'): 3,
+    }
+
+    def setUp(self):
+        self.users = {
+            role: User.objects.create_user(email=f'{role.lower()}@example.com', password='pass12345', role=role)
+            for role in ('CANDIDATE', 'CONSULTANT')
+        }
+
+    def count_queries(self, backend, user, name):
+        with self.settings(AUTHENTICATION_BACKENDS=[backend]):
+            self.client.force_login(user, backend=backend)
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200, name)
+        return len(captured)
+
+    def test_pages_save_relation_queries(self):
+        for (role, name), saved in self.SAVINGS.items():
+            with self.subTest(role=role, page=name):
+                # Fill the page's own caches first (facets, recommender...)
+                self.count_queries(self.CONTEXT_BACKEND, self.users[role], name)
+                before = self.count_queries(self.MODEL_BACKEND, self.users[role], name)
+                after = self.count_queries(self.CONTEXT_BACKEND, self.users[role], name)
+                self.assertEqual(before - after, saved)
+
+    def test_sessions_of_either_backend_stay_logged_in(self):
+        user = self.users['CANDIDATE']
+        for backend in (self.MODEL_BACKEND, self.CONTEXT_BACKEND):
+            with self.subTest(backend=backend):
+                self.client.force_login(user, backend=backend)
+                self.assertEqual(self.client.get(reverse('accounts:dashboard')).status_code, 200)
+
+    def test_login_uses_the_context_backend(self):
+        self.client.post(reverse('accounts:login'), {'username': 'candidate@example.com', 'password': 'pass12345'})
+        self.assertEqual(self.client.session['_auth_user_backend'], self.CONTEXT_BACKEND)
+
+    def test_user_loaded_with_relations_in_one_query(self):
+        consultant = self.users['CONSULTANT']
+        with self.assertNumQueries(1):
+            user = UserContextBackend().get_user(consultant.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.consultant_profile.user_id, consultant.pk)
+            self.assertFalse(hasattr(user, 'subscription'))
@@ -2,10 +2,11 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, authenticate
 from django.contrib.auth.decorators import login_required
 from django import forms
-from django.core.mail import send_mail
+from django.db import transaction
 from django.utils.html import strip_tags
 
 from accounts.models import User
+from accounts.outbox import queue_email
 from profiles.models import CandidateProfile
 
 # ----------------------------
@@ -40,30 +41,30 @@ def signup_view(request):
     if request.method == 'POST':
         form = SignUpForm(request.POST)
         if form.is_valid():
-            user = form.save(commit=False)
-            user.set_password(form.cleaned_data['password'])
-            user.save()
-
-            # Send welcome email
-            subject = "Welcome to Vetri Consultancy!"
-            role_text = "Employer" if user.role == 'EMPLOYER' else "Candidate"
-            html_message = f"""
-            <html><body>
-            <h2>Welcome, {role_text}!</h2>
-            <p>Hi {user.email}, welcome to <strong>Vetri Consultancy</strong>!</p>
-            <p><a href="http://127.0.0.1:8000/accounts/login/">Login Now</a></p>
-            </body></html>
-            """
-            send_mail(
-                subject,
-                strip_tags(html_message),
-                None,  # DEFAULT_FROM_EMAIL
-                [user.email],
-                html_message=html_message,
-                fail_silently=False,
-            )
-
-            login(request, user)
+            with transaction.atomic():
+                user = form.save(commit=False)
+                user.set_password(form.cleaned_data['password'])
+                user.save()
+
+                # Welcome email, delivered by the send_outbound_email worker
+                subject = "Welcome to Vetri Consultancy!"
+                role_text = "Employer" if user.role == 'EMPLOYER' else "Candidate"
+                html_message = f"""
+                <html><body>
+                <h2>Welcome, {role_text}!</h2>
+                <p>Hi {user.email}, welcome to <strong>Vetri Consultancy</strong>!</p>
+                <p><a href="http://127.0.0.1:8000/accounts/login/">Login Now</a></p>
+                </body></html>
+                """
+                queue_email(
+                    subject,
+                    strip_tags(html_message),
+                    [user.email],
+                    html_message=html_message,
+                )
+
+            # Not from authenticate(): name the backend (several are listed)
+            login(request, user, backend='accounts.backends.UserContextBackend')
             return redirect('jobs:jobs_list')  # ✅ after signup, go to jobs list
     else:
         form = SignUpForm()
@@ -148,6 +149,12 @@ def dashboard_view(request):
         # get or create subscription (safe)
         subscription, _ = Subscription.objects.get_or_create(user=user)
 
+    stats = None
+    unread_queries_count = None
+    if user.role == "CONSULTANT":
+        stats = get_dashboard_stats(user)
+        unread_queries_count = stats['open_queries']
+
     template = (
         'accounts/dashboard_candidate.html' if user.role == "CANDIDATE" else
         'accounts/dashboard_consultant.html' if user.role == "CONSULTANT" else
@@ -159,6 +166,8 @@ def dashboard_view(request):
         'profile': profile,
         'profile_completion': profile_completion,
         'subscription': subscription,  # 👈 NEW
+        'unread_queries_count': unread_queries_count,
+        'stats': stats,
     })
 
 
@@ -199,17 +208,14 @@ def candidate_profile_view(request):
 
 from django.db.models import Q
 
-from jobs.models import JobQuery
+from jobs.dashboard import get_dashboard_stats
+
 
 @login_required
 def consultant_dashboard_view(request):
-    user = request.user
-
-    unread_queries_count = JobQuery.objects.filter(
-        job__posted_by=user,
-        is_resolved=False
-    ).count()
+    stats = get_dashboard_stats(request.user)
 
     return render(request, 'accounts/dashboard_consultant.html', {
-        'unread_queries_count': unread_queries_count
+        'unread_queries_count': stats['open_queries'],
+        'stats': stats,
     })
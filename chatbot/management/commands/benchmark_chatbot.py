@@ -0,0 +1,94 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from chatbot.matcher import FAQMatcher
+from chatbot.ranking import FAQRanker
+
+WORDS = (
+    'apply', 'job', 'resume', 'profile', 'password', 'course', 'payment', 'plan', 'interview',
+    'meeting', 'company', 'salary', 'remote', 'location', 'skills', 'upload', 'account', 'email',
+)
+
+
+def naive_answer(faqs, message):
+    """
+    The previous matching: every FAQ, every keyword, substring tests.
+    """
+    message = message.lower()
+    for keywords, answer in faqs:
+        for keyword in [k.strip().lower() for k in keywords.split(',')]:
+            if keyword in message:
+                return answer
+    return None
+
+
+def synthetic_faqs(count, rng):
+    return [
+        (', '.join(f'{rng.choice(WORDS)} topic{index}x{n}' for n in range(3)), f'Answer {index}')
+        for index in range(count)
+    ]
+
+
+def synthetic_messages(count, faqs, rng):
+    messages = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(8)]
+        if rng.random() < 0.5:
+            # Mention one FAQ's keyword somewhere in the message
+            keywords, _ = rng.choice(faqs)
+            words.insert(rng.randrange(len(words)), rng.choice(keywords.split(', ')))
+        messages.append('How do I ' + ' '.join(words) + '?')
+    return messages
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-message FAQ matching cost of the keyword automaton, the old nested scan "
+        "and BM25 ranking (best answer + 3 alternatives)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10,100,1000,10000',
+            help="Comma separated FAQ counts to measure (default: 10,100,1000,10000)",
+        )
+        parser.add_argument('--messages', type=int, default=2000, help="Messages per size (default: 2000)")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed (default: 42)")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.stdout.write(f"{'FAQs':>8}{'build ms':>11}{'automaton us/msg':>19}{'scan us/msg':>14}{'bm25 us/msg':>14}")
+
+        for size in (int(value) for value in options['sizes'].split(',')):
+            faqs = synthetic_faqs(size, rng)
+            messages = synthetic_messages(options['messages'], faqs, rng)
+
+            start = time.perf_counter()
+            matcher = FAQMatcher(faqs)
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            answers = [matcher.answer(message) for message in messages]
+            automaton = (time.perf_counter() - start) / len(messages)
+
+            # The scan gets slow: time it on a subset for the large sizes
+            sample = messages[:max(20, len(messages) * 100 // size)]
+            start = time.perf_counter()
+            expected = [naive_answer(faqs, message) for message in sample]
+            scan = (time.perf_counter() - start) / len(sample)
+
+            ranker = FAQRanker(
+                (index, keywords, keywords, answer) for index, (keywords, answer) in enumerate(faqs)
+            )
+            start = time.perf_counter()
+            for message in messages:
+                ranker.rank(message, 4)
+            ranked = (time.perf_counter() - start) / len(messages)
+
+            if answers[:len(sample)] != expected:
+                self.stderr.write(self.style.ERROR(f"{size} FAQs: answers differ from the old matching"))
+
+            self.stdout.write(f"{size:>8}{build * 1000:>11.1f}{automaton * 1e6:>19.1f}{scan * 1e6:>14.1f}{ranked * 1e6:>14.1f}")
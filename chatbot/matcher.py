@@ -0,0 +1,134 @@
+# chatbot/matcher.py
+import threading
+
+from asgiref.sync import sync_to_async
+
+from config.cache import acurrent_version, bump_version, current_version
+
+VERSION_CACHE_KEY = 'chatbot:faq:version'
+
+NO_MATCH = float('inf')
+
+
+def split_keywords(text):
+    return [keyword for keyword in (part.strip().lower() for part in (text or '').split(',')) if keyword]
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over keywords, each tagged with a rank. One
+    pass over a message finds the lowest rank among all keywords it
+    contains (as substrings), whatever the number of keywords.
+    """
+
+    def __init__(self, keywords=()):
+        # Node 0 is the root; per node: transitions, failure link, and the
+        # lowest rank of the keywords ending there or at a suffix of it
+        self.goto = [{}]
+        self.fail = [0]
+        self.best = [NO_MATCH]
+        for keyword, rank in keywords:
+            self.add(keyword, rank)
+        self.finalize()
+
+    def add(self, keyword, rank):
+        node = 0
+        for char in keyword:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.best.append(NO_MATCH)
+            node = next_node
+        self.best[node] = min(self.best[node], rank)
+
+    def finalize(self):
+        # Breadth first, so failure links always point to finished nodes
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for char, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.best[child] = min(self.best[child], self.best[self.fail[child]])
+                queue.append(child)
+
+    def first_match(self, text):
+        """
+        Lowest rank of the keywords found in `text`, or None.
+        """
+        goto, fail, best = self.goto, self.fail, self.best
+        node = 0
+        found = NO_MATCH
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best[node] < found:
+                found = best[node]
+        return None if found is NO_MATCH else found
+
+
+class FAQMatcher:
+    """
+    All FAQ keywords compiled into one automaton. A message gets the answer
+    of the first FAQ (by id) having a keyword in it, as before, but in a
+    single pass over the message and without a database query.
+    """
+
+    def __init__(self, faqs):
+        self.answers = []
+        keywords = []
+        for rank, (keywords_text, answer) in enumerate(faqs):
+            self.answers.append(answer)
+            keywords.extend((keyword, rank) for keyword in split_keywords(keywords_text))
+        self.automaton = KeywordAutomaton(keywords)
+        self.version = None
+
+    def answer(self, message):
+        rank = self.automaton.first_match((message or '').lower())
+        return None if rank is None else self.answers[rank]
+
+
+# ----------------------------
+# Process-wide instance
+# ----------------------------
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher():
+    """
+    Shared matcher, built on first use and rebuilt after any FAQ change
+    (in this or another process, tracked with a cache version).
+    """
+    global _matcher
+    from .models import ChatbotFAQ
+
+    version = current_version(VERSION_CACHE_KEY)
+    with _matcher_lock:
+        if _matcher is None or _matcher.version != version:
+            matcher = FAQMatcher(ChatbotFAQ.objects.order_by('id').values_list('keywords', 'answer'))
+            matcher.version = version
+            _matcher = matcher
+        return _matcher
+
+
+async def aget_matcher():
+    """
+    get_matcher() for async views: the up to date matcher is returned
+    without leaving the event loop, only a rebuild runs in a thread.
+    """
+    version = await acurrent_version(VERSION_CACHE_KEY)
+    matcher = _matcher
+    if matcher is not None and matcher.version == version:
+        return matcher
+    return await sync_to_async(get_matcher)()
+
+
+def invalidate_matcher():
+    bump_version(VERSION_CACHE_KEY)
@@ -0,0 +1,176 @@
+# chatbot/ranking.py
+import re
+import threading
+
+import numpy as np
+from asgiref.sync import sync_to_async
+
+from config.cache import acurrent_version, current_version
+from .matcher import VERSION_CACHE_KEY
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Keywords are written to be matched, the answer only hints at the topic
+FIELD_WEIGHTS = {
+    'keywords': 3,
+    'question': 2,
+    'answer': 1,
+}
+
+DEFAULT_ALTERNATIVES = 3
+MAX_ALTERNATIVES = 10
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from', 'how',
+    'i', 'if', 'in', 'is', 'it', 'me', 'my', 'of', 'on', 'or', 'the', 'to', 'what', 'when',
+    'where', 'which', 'who', 'why', 'will', 'with', 'you', 'your',
+))
+
+# (suffix, replacement), longest first; only the first match is stripped
+SUFFIXES = (
+    ('ations', 'ate'), ('ation', 'ate'), ('ments', ''), ('ment', ''), ('ings', ''), ('ing', ''),
+    ('ies', 'y'), ('ied', 'y'), ('sses', 'ss'), ('ches', 'ch'), ('shes', 'sh'), ('xes', 'x'),
+    ('ed', ''), ('ss', 'ss'), ('s', ''),
+)
+
+
+def stem(token):
+    """
+    Light suffix stripping, enough for "applying", "applied" and "applies"
+    to meet "apply", or "uploaded" and "uploads" to meet "upload".
+    """
+    for suffix, replacement in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)] + replacement
+            break
+    # running -> run, save / saved -> sav
+    if len(token) > 3 and token[-1] == token[-2] and token[-1] not in 'lsz':
+        token = token[:-1]
+    if len(token) > 3 and token.endswith('e'):
+        token = token[:-1]
+    return token
+
+
+def analyze(text):
+    return [stem(token) for token in TOKEN_RE.findall((text or '').lower()) if token not in STOP_WORDS]
+
+
+class FAQRanker:
+    """
+    BM25 index of the FAQs (question, keywords and answer text).
+
+    FAQs change rarely and the whole index is rebuilt when they do, so the
+    idf is baked into the postings: scoring a message is one gather of the
+    postings of its terms, a bincount and a partial sort.
+    """
+
+    def __init__(self, faqs):
+        # faqs: (id, question, keywords, answer) rows
+        self.faq_ids = []
+        self.questions = []
+        self.answers = []
+        rows_terms = []
+        for faq_id, question, keywords, answer in faqs:
+            terms = {}
+            for field, text in (('keywords', keywords.replace(',', ' ')), ('question', question), ('answer', answer)):
+                for term in analyze(text):
+                    terms[term] = terms.get(term, 0) + FIELD_WEIGHTS[field]
+            self.faq_ids.append(faq_id)
+            self.questions.append(question)
+            self.answers.append(answer)
+            rows_terms.append(terms)
+        self.postings = self._build_postings(rows_terms)
+        self.version = None
+
+    @staticmethod
+    def _build_postings(rows_terms):
+        n = len(rows_terms)
+        if not n:
+            return {}
+        lengths = [sum(terms.values()) for terms in rows_terms]
+        avg_length = sum(lengths) / n
+
+        collected = {}
+        for row, terms in enumerate(rows_terms):
+            for term, tf in terms.items():
+                # Document side of BM25: tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+                weight = tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths[row] / avg_length))
+                collected.setdefault(term, ([], []))
+                collected[term][0].append(row)
+                collected[term][1].append(weight)
+
+        postings = {}
+        for term, (rows, weights) in collected.items():
+            idf = np.log(1 + (n - len(rows) + 0.5) / (len(rows) + 0.5))
+            postings[term] = (np.asarray(rows, dtype=np.int64), np.asarray(weights) * idf)
+        return postings
+
+    def __len__(self):
+        return len(self.faq_ids)
+
+    def rank(self, message, limit=1 + DEFAULT_ALTERNATIVES):
+        """
+        Up to `limit` best FAQs for a message, as dicts with id, question,
+        answer and score, best first. FAQs sharing no term are left out.
+        """
+        hits = [self.postings[term] for term in set(analyze(message)) if term in self.postings]
+        if not hits:
+            return []
+
+        rows = np.concatenate([rows for rows, _ in hits])
+        scores = np.bincount(rows, weights=np.concatenate([weights for _, weights in hits]), minlength=len(self))
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        # Best score first, then the older FAQ, as with keyword matching
+        candidates = sorted(candidates.tolist(), key=lambda row: (-scores[row], row))
+
+        return [
+            {
+                'id': self.faq_ids[row],
+                'question': self.questions[row],
+                'answer': self.answers[row],
+                'score': round(float(scores[row]), 4),
+            }
+            for row in candidates
+        ]
+
+
+# ----------------------------
+# Process-wide instance
+# ----------------------------
+_ranker = None
+_ranker_lock = threading.Lock()
+
+
+def get_ranker():
+    """
+    Shared ranker, rebuilt after any FAQ change (in this or another
+    process). Shares the cache version of the keyword matcher, so one
+    invalidation refreshes both.
+    """
+    global _ranker
+    from .models import ChatbotFAQ
+
+    version = current_version(VERSION_CACHE_KEY)
+    with _ranker_lock:
+        if _ranker is None or _ranker.version != version:
+            ranker = FAQRanker(ChatbotFAQ.objects.order_by('id').values_list('id', 'question', 'keywords', 'answer'))
+            ranker.version = version
+            _ranker = ranker
+        return _ranker
+
+
+async def aget_ranker():
+    """
+    get_ranker() for async views (see aget_matcher).
+    """
+    version = await acurrent_version(VERSION_CACHE_KEY)
+    ranker = _ranker
+    if ranker is not None and ranker.version == version:
+        return ranker
+    return await sync_to_async(get_ranker)()
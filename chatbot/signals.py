@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .matcher import invalidate_matcher
+from .models import ChatbotFAQ
+
+
+@receiver(post_save, sender=ChatbotFAQ)
+@receiver(post_delete, sender=ChatbotFAQ)
+def rebuild_faq_matcher(sender, **kwargs):
+    transaction.on_commit(invalidate_matcher)
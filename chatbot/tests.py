@@ -1,3 +1,194 @@
-from django.test import TestCase
+import json
+import random
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from config.test_runner import in_other_process
+from . import matcher, ranking
+from .management.commands.benchmark_chatbot import naive_answer, synthetic_faqs, synthetic_messages
+from .matcher import FAQMatcher, KeywordAutomaton, get_matcher
+from .models import ChatbotFAQ
+from .ranking import FAQRanker, analyze
+from .utils import FALLBACK_RESPONSE, get_bot_response
+
+
+class KeywordMatcherTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        matcher._matcher = None
+
+    def test_automaton_finds_overlapping_keywords(self):
+        automaton = KeywordAutomaton([('he', 3), ('she', 2), ('hers', 1), ('his', 0)])
+        self.assertEqual(automaton.first_match('ushers'), 1)
+        self.assertEqual(automaton.first_match('ushe'), 2)
+        self.assertEqual(automaton.first_match('the'), 3)
+        self.assertIsNone(automaton.first_match('xyz'))
+
+    def test_same_answers_as_nested_scan(self):
+        rng = random.Random(7)
+        faqs = synthetic_faqs(200, rng) + [('apply, job', 'Apply here')]
+        faq_matcher = FAQMatcher(faqs)
+        for message in synthetic_messages(300, faqs, rng) + ['APPLY now']:
+            self.assertEqual(faq_matcher.answer(message), naive_answer(faqs, message), message)
+
+    def test_empty_keywords_match_nothing(self):
+        faq_matcher = FAQMatcher([('  , resume,', 'Resume help')])
+        self.assertIsNone(faq_matcher.answer('hello'))
+        self.assertEqual(faq_matcher.answer('my Resume'), 'Resume help')
+
+    def test_first_faq_wins_and_no_query_per_message(self):
+        ChatbotFAQ.objects.create(question='Apply', answer='Use the Apply button.', keywords='apply, job')
+        ChatbotFAQ.objects.create(question='Jobs', answer='See the jobs list.', keywords='job')
+        get_matcher()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_bot_response('Which JOB should I apply to?'), 'Use the Apply button.')
+            self.assertEqual(get_bot_response('hello'), FALLBACK_RESPONSE)
+
+    def test_rebuilds_when_faqs_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            faq = ChatbotFAQ.objects.create(question='Pay', answer='Cards and UPI.', keywords='payment')
+        self.assertEqual(get_bot_response('payment options?'), 'Cards and UPI.')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            faq.keywords = 'pay, upi'
+            faq.save()
+        self.assertEqual(get_bot_response('payment options?'), 'Cards and UPI.')
+        self.assertEqual(get_bot_response('can I use upi'), 'Cards and UPI.')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            faq.delete()
+        self.assertEqual(get_bot_response('payment options?'), FALLBACK_RESPONSE)
+
+    def test_rebuilds_after_invalidation_in_other_process(self):
+        faq_matcher = get_matcher()
+        self.assertIs(get_matcher(), faq_matcher)
+
+        in_other_process("from chatbot.matcher import invalidate_matcher\ninvalidate_matcher()")
+        self.assertIsNot(get_matcher(), faq_matcher)
+
+    def test_ask_endpoint(self):
+        ChatbotFAQ.objects.create(question='Reset', answer='Use the reset link.', keywords='password')
+        user = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.client.force_login(user)
+
+        response = self.client.post(
+            reverse('chatbot:ask'), json.dumps({'message': 'I forgot my password'}), content_type='application/json'
+        )
+        self.assertEqual(response.json(), {'response': 'Use the reset link.'})
+
+
+class RankedRetrievalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        ranking._ranker = None
+        self.apply = ChatbotFAQ.objects.create(
+            question='How do I apply for a job?', answer='Open the job and press Apply.', keywords='apply, job',
+        )
+        self.upload = ChatbotFAQ.objects.create(
+            question='How do I upload my resume?', answer='Upload it from your profile page.', keywords='resume, upload',
+        )
+        self.status = ChatbotFAQ.objects.create(
+            question='Where can I see my applications?', answer='Applied jobs are listed under My Jobs.',
+            keywords='status, applied',
+        )
+        user = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.client.force_login(user)
+
+    def post(self, name, data):
+        return self.client.post(reverse(name), json.dumps(data), content_type='application/json').json()
+
+    def test_stemmed_terms(self):
+        self.assertEqual(analyze('Applying, applied and applies'), ['apply', 'apply', 'apply'])
+        self.assertEqual(analyze('uploaded resumes'), ['upload', 'resum'])
+
+    def test_best_answer_with_scored_alternatives(self):
+        ranker = FAQRanker(ChatbotFAQ.objects.order_by('id').values_list('id', 'question', 'keywords', 'answer'))
+        results = ranker.rank('I was uploading my resume before I applied', 3)
+
+        self.assertEqual(results[0]['id'], self.upload.id)
+        self.assertEqual({result['id'] for result in results[1:]}, {self.status.id, self.apply.id})
+        scores = [result['score'] for result in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertGreater(scores[-1], 0)
+        self.assertEqual(ranker.rank('hello there'), [])
+
+    def test_ask_ranked_mode(self):
+        data = self.post('chatbot:ask', {'message': 'resume upload failing', 'mode': 'ranked', 'alternatives': 1})
+
+        self.assertEqual(data['response'], 'Upload it from your profile page.')
+        self.assertGreater(data['score'], 0)
+        self.assertLessEqual(len(data['alternatives']), 1)
+
+        # Keyword mode stays the default, with its response shape
+        self.assertEqual(self.post('chatbot:ask', {'message': 'resume upload'}), {
+            'response': 'Upload it from your profile page.',
+        })
+
+    @override_settings(CHATBOT_RETRIEVAL_MODE='ranked')
+    def test_reply_ranked_by_default_setting(self):
+        data = self.post('chatbot:reply', {'message': 'Status of the jobs I applied to?'})
+        self.assertEqual(data['reply'], 'Applied jobs are listed under My Jobs.')
+        self.assertEqual([alt['id'] for alt in data['alternatives']], [self.apply.id])
+
+        data = self.post('chatbot:reply', {'message': 'zzz'})
+        self.assertEqual(data, {'reply': FALLBACK_RESPONSE, 'score': 0.0, 'alternatives': []})
+
+    def test_ranker_follows_faq_changes_without_queries_per_message(self):
+        self.post('chatbot:ask', {'message': 'resume', 'mode': 'ranked'})
+        with self.assertNumQueries(0):
+            ranking.get_ranker().rank('resume')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upload.delete()
+        data = self.post('chatbot:ask', {'message': 'resume', 'mode': 'ranked'})
+        self.assertEqual(data['response'], FALLBACK_RESPONSE)
+
+    def test_ranker_rebuilt_after_invalidation_in_other_process(self):
+        ranker = ranking.get_ranker()
+        self.assertIs(ranking.get_ranker(), ranker)
+
+        in_other_process("from chatbot.matcher import invalidate_matcher\ninvalidate_matcher()")
+        self.assertIsNot(ranking.get_ranker(), ranker)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        matcher._matcher = None
+        ranking._ranker = None
+        ChatbotFAQ.objects.create(question='Reset', answer='Use the reset link.', keywords='password')
+        self.user = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.user.profile.first_name = 'Asha'
+        self.user.profile.save()
+
+    async def post(self, name, data):
+        response = await self.async_client.post(reverse(name), json.dumps(data), content_type='application/json')
+        return response.json()
+
+    async def test_answers_like_the_sync_views(self):
+        await self.async_client.aforce_login(self.user)
+        message = {'message': 'I forgot my password'}
+
+        self.assertEqual(await self.post('chatbot:reply_async', message), {'reply': 'Use the reset link.'})
+        self.assertEqual(await self.post('chatbot:ask_async', message), {'response': 'Use the reset link.'})
+        ranked = await self.post('chatbot:ask_async', dict(message, mode='ranked'))
+        self.assertEqual(ranked['response'], 'Use the reset link.')
+        self.assertGreater(ranked['score'], 0)
+
+        response = await self.async_client.get(reverse('chatbot:greeting_async'))
+        self.assertIn('Hi Asha!', response.json()['message'])
+
+    async def test_matcher_rebuilt_after_faq_change(self):
+        self.assertEqual((await self.post('chatbot:reply_async', {'message': 'upi?'}))['reply'], FALLBACK_RESPONSE)
+
+        def add_faq():
+            with self.captureOnCommitCallbacks(execute=True):
+                ChatbotFAQ.objects.create(question='Pay', answer='Cards and UPI.', keywords='upi')
+
+        await sync_to_async(add_faq)()
+        self.assertEqual((await self.post('chatbot:reply_async', {'message': 'upi?'}))['reply'], 'Cards and UPI.')
@@ -1,5 +1,8 @@
 from django.urls import path
-from .views import chatbot_reply,ask_view,chatbot_greeting_view
+from .views import (
+    chatbot_reply, ask_view, chatbot_greeting_view,
+    chatbot_reply_async, ask_async_view, chatbot_greeting_async_view,
+)
 
 app_name = 'chatbot'
 
@@ -7,4 +10,9 @@ urlpatterns = [
     path('reply/', chatbot_reply, name='reply'),
     path('ask/', ask_view, name='ask'),
     path('greeting/', chatbot_greeting_view, name='greeting'),
+
+    # Async variants, for ASGI deployments
+    path('async/reply/', chatbot_reply_async, name='reply_async'),
+    path('async/ask/', ask_async_view, name='ask_async'),
+    path('async/greeting/', chatbot_greeting_async_view, name='greeting_async'),
 ]
@@ -1,27 +1,67 @@
-from .models import ChatbotFAQ
+from asgiref.sync import sync_to_async
+from django.conf import settings
 
-def get_bot_response(user_message):
-    user_message = user_message.lower()
+from .matcher import aget_matcher, get_matcher
+from .ranking import DEFAULT_ALTERNATIVES, MAX_ALTERNATIVES, aget_ranker, get_ranker
 
-    faqs = ChatbotFAQ.objects.all()
+FALLBACK_RESPONSE = (
+    "Sorry, I couldn't find an answer for that. "
+    "Please contact support or try asking differently."
+)
 
-    for faq in faqs:
-        keywords = [k.strip().lower() for k in faq.keywords.split(',')]
 
-        for keyword in keywords:
-            if keyword in user_message:
-                return faq.answer
+def get_bot_response(user_message, matcher=None):
+    # Answer of the first FAQ with a keyword in the message
+    answer = (matcher or get_matcher()).answer(user_message)
+    return answer if answer is not None else FALLBACK_RESPONSE
 
-    return (
-        "Sorry, I couldn't find an answer for that. "
-        "Please contact support or try asking differently."
-    )
+
+def get_ranked_response(user_message, alternatives=DEFAULT_ALTERNATIVES, ranker=None):
+    """
+    Best scoring FAQ answer for the message, with its BM25 score and up to
+    `alternatives` runner-up FAQs.
+    """
+    alternatives = max(0, min(alternatives, MAX_ALTERNATIVES))
+    results = (ranker or get_ranker()).rank(user_message, 1 + alternatives)
+    if not results:
+        return {'answer': FALLBACK_RESPONSE, 'score': 0.0, 'alternatives': []}
+    best, *others = results
+    return {'answer': best['answer'], 'score': best['score'], 'alternatives': others}
+
+
+def reply_mode(data):
+    return data.get('mode') or getattr(settings, 'CHATBOT_RETRIEVAL_MODE', 'keyword')
+
+
+def build_reply(data, matcher=None, ranker=None):
+    """
+    Reply payload for a chatbot request body: keyword matching, or BM25
+    ranking when `mode` is "ranked" (CHATBOT_RETRIEVAL_MODE by default).
+    """
+    message = data.get('message', '')
+    if reply_mode(data) != 'ranked':
+        return {'answer': get_bot_response(message, matcher)}
+    try:
+        alternatives = int(data.get('alternatives', DEFAULT_ALTERNATIVES))
+    except (TypeError, ValueError):
+        alternatives = DEFAULT_ALTERNATIVES
+    return get_ranked_response(message, alternatives, ranker)
+
+
+async def abuild_reply(data):
+    """
+    build_reply() for async views. Matching itself is in-memory work, so
+    only fetching the matcher or ranker awaits.
+    """
+    if reply_mode(data) != 'ranked':
+        return build_reply(data, matcher=await aget_matcher())
+    return build_reply(data, ranker=await aget_ranker())
 
 def get_greeting_message(user=None):
     if user and user.is_authenticated:
         name = (
-            getattr(user.profile, 'first_name', '') 
-            or getattr(user.consultant_profile, 'first_name', '') 
+            getattr(getattr(user, 'profile', None), 'first_name', '')
+            or getattr(getattr(user, 'consultant_profile', None), 'first_name', '')
             or user.email
         )
 
@@ -31,3 +71,20 @@ def get_greeting_message(user=None):
             return f"👋 Hi {name}! Welcome to Vetri Consultancy. How can I help you today?"
 
     return "👋 Hi there! Welcome to Vetri Consultancy. How can I help you today?"
+
+
+# Relations of the user the greeting reads
+GREETING_RELATIONS = ('profile', 'consultant_profile', 'subscription')
+
+
+async def aget_greeting_message(user=None):
+    """
+    get_greeting_message() for async views. The session user comes with
+    its profiles and subscription (see accounts.backends); a user without
+    them loaded is greeted from a thread.
+    """
+    if user and user.is_authenticated and not all(
+        getattr(type(user), name).is_cached(user) for name in GREETING_RELATIONS
+    ):
+        return await sync_to_async(get_greeting_message)(user)
+    return get_greeting_message(user)
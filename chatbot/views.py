@@ -1,52 +1,34 @@
-from .models import ChatbotFAQ
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from .utils import get_bot_response
+from .utils import build_reply
 import json
 
 
-def get_bot_response(user_message):
-    user_message = user_message.lower()
-
-    faqs = ChatbotFAQ.objects.all()
-
-    for faq in faqs:
-        keywords = [k.strip().lower() for k in faq.keywords.split(',')]
-
-        for keyword in keywords:
-            if keyword in user_message:
-                return faq.answer
-
-    return (
-        "Sorry, I couldn't find an answer for that. "
-        "Please contact support or try asking differently."
-    )
-
-
 @csrf_exempt
 def chatbot_reply(request):
     if request.method == 'POST':
         data = json.loads(request.body)
-        message = data.get('message', '')
 
-        reply = get_bot_response(message)
+        reply = build_reply(data)
+        # Ranked mode also returns the score and the alternatives
+        reply['reply'] = reply.pop('answer')
 
-        return JsonResponse({'reply': reply})
+        return JsonResponse(reply)
 
 import json
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
-from .utils import get_bot_response
+from .utils import build_reply
 
 @login_required
 @csrf_exempt
 def ask_view(request):
     if request.method == 'POST':
         data = json.loads(request.body)
-        user_message = data.get('message', '')
-        bot_reply = get_bot_response(user_message)
-        return JsonResponse({'response': bot_reply})
+        bot_reply = build_reply(data)
+        bot_reply['response'] = bot_reply.pop('answer')
+        return JsonResponse(bot_reply)
     return JsonResponse({'response': 'Invalid request'})
 
 
@@ -56,3 +38,33 @@ from .utils import get_greeting_message
 def chatbot_greeting_view(request):
     message = get_greeting_message(request.user)
     return JsonResponse({"message": message})
+
+
+# ============================
+# ASYNC VARIANTS (served under ASGI without holding a worker thread)
+# ============================
+from .utils import abuild_reply, aget_greeting_message
+
+
+@csrf_exempt
+async def chatbot_reply_async(request):
+    if request.method != 'POST':
+        return JsonResponse({'reply': 'Invalid request'})
+    reply = await abuild_reply(json.loads(request.body))
+    reply['reply'] = reply.pop('answer')
+    return JsonResponse(reply)
+
+
+@login_required
+@csrf_exempt
+async def ask_async_view(request):
+    if request.method != 'POST':
+        return JsonResponse({'response': 'Invalid request'})
+    bot_reply = await abuild_reply(json.loads(request.body))
+    bot_reply['response'] = bot_reply.pop('answer')
+    return JsonResponse(bot_reply)
+
+
+async def chatbot_greeting_async_view(request):
+    message = await aget_greeting_message(await request.auser())
+    return JsonResponse({"message": message})
@@ -0,0 +1,102 @@
+# config/cache.py
+import pickle
+import random
+import time
+import uuid
+import zlib
+
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import locks
+
+
+class SharedFileCache(FileBasedCache):
+    """
+    File cache shared by every process on the host: web workers and
+    management commands see the same entries, so an invalidation made by
+    one reaches all of them.
+
+    FileBasedCache lists its whole directory on every write to decide
+    whether to cull, which costs milliseconds once it holds thousands of
+    entries; this one checks on a sample of writes (OPTIONS['CULL_SAMPLE'],
+    default 1 in 50), letting the cache run slightly past MAX_ENTRIES.
+
+    incr() is atomic (the entry is rewritten in place under a file lock),
+    as with the other shared backends, so counters and versions can rely
+    on it. Entries it updates must not be overwritten with set().
+    """
+
+    def __init__(self, dir, params):
+        options = params.get('OPTIONS', {})
+        self._cull_sample = options.get('CULL_SAMPLE', 50)
+        params = {**params, 'OPTIONS': {k: v for k, v in options.items() if k != 'CULL_SAMPLE'}}
+        super().__init__(dir, params)
+
+    def _cull(self):
+        if random.randrange(self._cull_sample) == 0:
+            super()._cull()
+
+    def incr(self, key, delta=1, version=None):
+        try:
+            with open(self._key_to_file(key, version), 'r+b') as f:
+                locks.lock(f, locks.LOCK_EX)
+                try:
+                    expiry = pickle.load(f)
+                    if expiry is not None and expiry < time.time():
+                        raise ValueError(f"Key '{key}' not found")
+                    value = pickle.loads(zlib.decompress(f.read())) + delta
+                    f.seek(0)
+                    f.write(pickle.dumps(expiry, self.pickle_protocol))
+                    f.write(zlib.compress(pickle.dumps(value, self.pickle_protocol)))
+                    f.truncate()
+                finally:
+                    locks.unlock(f)
+        except FileNotFoundError:
+            raise ValueError(f"Key '{key}' not found")
+        return value
+
+
+# ----------------------------
+# Versions
+# ----------------------------
+# Data built from the database and kept in each process (the recommender,
+# the chatbot matchers) or cached under a versioned key (facets) is tagged
+# with a version counter stored in the shared cache; bumping it makes every
+# process drop or rebuild that data.
+def _new_version():
+    # A missing (culled) counter restarts from a random value, never from
+    # one a process may still hold
+    return uuid.uuid4().int >> 66
+
+
+def current_version(key):
+    """
+    The version counter stored under `key`, created if missing.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+async def acurrent_version(key):
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _new_version(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_version(key):
+    """
+    Make everything built for the current version of `key` stale, in
+    every process, and return the new version. incr() is atomic: a caller
+    getting back exactly the version it built its data for, plus one,
+    knows no other process changed anything in between.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        current_version(key)
+        return cache.incr(key)
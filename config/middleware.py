@@ -0,0 +1,198 @@
+# config/middleware.py
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+logger = logging.getLogger('performance')
+
+# Timings of the request being handled in this context (None when the
+# request isn't sampled). Context variables follow the request into the
+# threads sync_to_async runs database queries in.
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    __slots__ = ('queries', 'db_time', 'template_time', 'template_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+
+# ----------------------------
+# Hooks (installed once per process)
+# ----------------------------
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_time += time.perf_counter() - start
+        timings.queries += 1
+
+
+def _wrap_connection(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def timed_render(render, *args):
+    """
+    Call render(*args), adding its time to the template time of the request
+    being measured. Used by the templates of config.templates.
+    """
+    timings = _current.get()
+    if timings is None:
+        return render(*args)
+
+    # Templates rendered from inside another render are already counted
+    timings.template_depth += 1
+    start = time.perf_counter()
+    try:
+        return render(*args)
+    finally:
+        timings.template_depth -= 1
+        if not timings.template_depth:
+            timings.template_time += time.perf_counter() - start
+
+
+def install_hooks():
+    connection_created.connect(_wrap_connection, dispatch_uid='performance_query_timing')
+    for connection in connections.all():
+        _wrap_connection(connection)
+
+
+# ----------------------------
+# Middleware
+# ----------------------------
+class PerformanceMiddleware:
+    """
+    Records SQL query count and time, template render time and total time
+    of a sample of requests. Adds them as a Server-Timing header (shown in
+    the browser dev tools) and logs a structured line for slow requests.
+
+    Settings:
+        PERFORMANCE_SAMPLE_RATE     fraction of requests measured (default 1.0)
+        PERFORMANCE_SLOW_REQUEST_MS log requests slower than this (default 500)
+        PERFORMANCE_SERVER_TIMING   add the Server-Timing header (default True)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PERFORMANCE_SAMPLE_RATE', 1.0)
+        self.slow_request_ms = getattr(settings, 'PERFORMANCE_SLOW_REQUEST_MS', 500)
+        self.server_timing = getattr(settings, 'PERFORMANCE_SERVER_TIMING', True)
+        install_hooks()
+
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    def finish(self, request, response, timings, elapsed):
+        total_ms = elapsed * 1000
+        db_ms = timings.db_time * 1000
+        template_ms = timings.template_time * 1000
+
+        if self.server_timing:
+            metrics = [
+                f'db;dur={db_ms:.1f};desc="{timings.queries} queries"',
+                f'tpl;dur={template_ms:.1f}',
+                f'total;dur={total_ms:.1f}',
+            ]
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = ', '.join(([existing] if existing else []) + metrics)
+
+        if total_ms >= self.slow_request_ms:
+            match = getattr(request, 'resolver_match', None)
+            logger.warning(json.dumps({
+                'event': 'slow_request',
+                'url_name': match.view_name if match else None,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'total_ms': round(total_ms, 1),
+                'db_ms': round(db_ms, 1),
+                'queries': timings.queries,
+                'template_ms': round(template_ms, 1),
+            }))
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, usable without a thread switch under ASGI. WhiteNoise only
+    runs synchronously, which makes Django move every request (static or
+    not) into a worker thread and back for the middleware below it.
+    Here only serving a static file runs in a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # Development only: a prefix check, and a few stat() calls for
+            # static URLs, cheaper inline than in a thread
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -38,8 +38,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'config.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'config.middleware.StaticFilesMiddleware',  # WhiteNoise, async capable
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -52,7 +53,8 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, timing renders for PerformanceMiddleware
+        'BACKEND': 'config.templates.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -75,6 +77,23 @@ DATABASES = {
     }
 }
 
+# Cache
+# Shared by the web workers and management commands on this host, so
+# invalidations and counters (facets, recommendations, dashboards, chatbot
+# FAQs) reach every process
+CACHES = {
+    'default': {
+        'BACKEND': 'config.cache.SharedFileCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    }
+}
+
+# Tests get a cache directory of their own
+TEST_RUNNER = 'config.test_runner.TestRunner'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -113,11 +132,26 @@ LOGIN_REDIRECT_URL = 'jobs:jobs_list'
 LOGOUT_REDIRECT_URL = 'accounts:login'
 LOGIN_URL = 'accounts:login'
 
+# Request timing (Server-Timing header + slow request log)
+PERFORMANCE_SAMPLE_RATE = 1.0
+PERFORMANCE_SLOW_REQUEST_MS = 500
+
+# Chatbot answers: 'keyword' (first FAQ with a keyword in the message) or
+# 'ranked' (BM25 over the FAQs, with alternatives); requests may override
+CHATBOT_RETRIEVAL_MODE = 'keyword'
+
+# Seconds between checks for new job query thread events, per ASGI worker
+# (live thread updates, see jobs/live.py)
+JOB_EVENTS_POLL_INTERVAL = 1.0
+
 # Custom User model
 AUTH_USER_MODEL = 'accounts.User'
 
-# Default authentication backend
+# Authentication backends: ModelBackend loading the user's profiles and
+# subscription along with it, used for new logins; ModelBackend itself stays
+# listed so sessions started before it was added remain valid
 AUTHENTICATION_BACKENDS = (
+    'accounts.backends.UserContextBackend',
     'django.contrib.auth.backends.ModelBackend',
 )
 
@@ -0,0 +1,27 @@
+# config/templates.py
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from config.middleware import timed_render
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        return timed_render(super().render, context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    The Django template backend, whose templates add their render time to
+    the request timings of PerformanceMiddleware (Server-Timing "tpl" and
+    the slow request log).
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,52 @@
+# config/test_runner.py
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs the tests against a cache directory of their own, so they start
+    from an empty cache and never touch the one running servers share.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_dir = tempfile.mkdtemp(prefix='test-cache-')
+        caches = {
+            alias: {**config, 'LOCATION': f'{self._cache_dir}/{alias}'}
+            for alias, config in settings.CACHES.items()
+        }
+        self._cache_settings = override_settings(CACHES=caches)
+        self._cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_settings.disable()
+        shutil.rmtree(self._cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
+
+
+def in_other_process(code):
+    """
+    Run `code` in a new Python process using this test run's cache (e.g.
+    to check that an invalidation reaches other workers). Returns its
+    output.
+    """
+    script = (
+        "import json, sys, django\n"
+        "django.setup()\n"
+        "from django.test.utils import override_settings\n"
+        "with override_settings(CACHES=json.loads(sys.argv[1])):\n"
+        + ''.join(f"    {line}\n" for line in code.splitlines())
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script, json.dumps(settings.CACHES, default=str)],
+        capture_output=True, text=True, check=True,
+    )
+    return result.stdout
@@ -1,8 +1,24 @@
 from django.contrib import admin
-from .models import Job
+from .models import Job, Skill, SkillAlias
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
-    list_display = ('title', 'company', 'job_type', 'experience', 'location', 'is_active')
+    list_display = (
+        'title', 'company', 'job_type', 'experience', 'location', 'is_active',
+        'applications_count', 'saved_count', 'open_queries_count',
+    )
     list_filter = ('job_type', 'experience', 'location', 'domain', 'is_active')
     search_fields = ('title', 'company', 'skills', 'domain')
+    exclude = ('normalized_skills',)  # derived from skills
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name',)
+    search_fields = ('name', 'aliases__alias')
+    inlines = [SkillAliasInline]
@@ -0,0 +1,258 @@
+# jobs/benchmark.py
+"""
+End-to-end latency benchmark: replays a weighted mix of requests through
+the full Django stack (middleware, views, templates) against the current
+database, as logged-in candidates and consultants, and summarises latency,
+queries per request and throughput per endpoint.
+"""
+import json
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from .models import Job, JobQuery
+
+# Relative weight of every endpoint in the default mix
+DEFAULT_MIX = {
+    'jobs_list': 20,
+    'jobs_list_filtered': 15,
+    'job_detail': 15,
+    'apply': 5,
+    'recommended': 10,
+    'candidate_queries': 5,
+    'consultant_queries': 5,
+    'candidate_dashboard': 8,
+    'consultant_dashboard': 7,
+    'chatbot_ask': 10,
+}
+
+FILTERS = (
+    {'job_type': 'FT'},
+    {'experience': '3'},
+    {'location': 'chennai'},
+    {'domain': 'data'},
+    {'skills': 'python'},
+    {'job_type': 'RM', 'skills': 'react', 'experience': '5'},
+)
+CHATBOT_MESSAGES = (
+    'How do I apply for a job?', 'What does pro include?', 'I forgot my password',
+    'how are interviews scheduled', 'where are my saved jobs', 'tell me a joke',
+)
+RESUME = b'%PDF-1.4\n%benchmark\n'
+IN_MEMORY_STORAGE = 'django.core.files.storage.InMemoryStorage'
+
+
+class BenchmarkData:
+    """
+    Users and objects the requests are made with, sampled once from the
+    database with a fixed seed.
+    """
+
+    def __init__(self, rng, users=20):
+        candidates = list(
+            User.objects.filter(role='CANDIDATE', is_active=True)
+            .exclude(profile__skills='').order_by('id').values_list('id', flat=True)
+        )
+        consultants = list(
+            User.objects.filter(role='CONSULTANT', is_active=True, posted_jobs__isnull=False)
+            .distinct().order_by('id').values_list('id', flat=True)
+        )
+        self.job_ids = list(Job.objects.filter(is_active=True).order_by('id').values_list('id', flat=True))
+        if not candidates or not consultants or not self.job_ids:
+            raise ValueError(
+                "The database needs candidates with skills, consultants and active jobs "
+                "(see manage.py seed_perf_data)."
+            )
+
+        self.candidates = User.objects.in_bulk(rng.sample(candidates, min(users, len(candidates))))
+        self.consultants = User.objects.in_bulk(rng.sample(consultants, min(users, len(consultants))))
+
+        # Query threads the sampled users take part in
+        self.candidate_threads = list(
+            JobQuery.objects.filter(user__in=self.candidates).values_list('user_id', 'job_id').distinct()
+        )
+        self.consultant_threads = list(
+            Job.objects.filter(posted_by__in=self.consultants)
+            .annotate(queries_count=Count('queries')).filter(queries_count__gt=0)
+            .values_list('posted_by_id', 'id')
+        ) or list(Job.objects.filter(posted_by__in=self.consultants).values_list('posted_by_id', 'id'))
+
+
+class Request:
+    def __init__(self, user, method, url, data=None, content_type=None):
+        self.user = user
+        self.method = method
+        self.url = url
+        self.data = data
+        self.content_type = content_type
+
+
+def _pick(rng, users):
+    return users[rng.choice(list(users))]
+
+
+def build_request(endpoint, data, rng):
+    """
+    A concrete Request for one endpoint of the mix.
+    """
+    if endpoint == 'jobs_list':
+        return Request(_pick(rng, data.candidates), 'get', reverse('jobs:jobs_list'))
+    if endpoint == 'jobs_list_filtered':
+        return Request(_pick(rng, data.candidates), 'get', reverse('jobs:jobs_list'), dict(rng.choice(FILTERS)))
+    if endpoint == 'job_detail':
+        return Request(_pick(rng, data.candidates), 'get', reverse('jobs:job_detail', args=[rng.choice(data.job_ids)]))
+    if endpoint == 'apply':
+        job_id = rng.choice(data.job_ids)
+        return Request(
+            _pick(rng, data.candidates), 'post', reverse('jobs:apply_job', args=[job_id]),
+            {'cover_letter': 'I would like to apply.', 'resume': SimpleUploadedFile('resume.pdf', RESUME)},
+        )
+    if endpoint == 'recommended':
+        return Request(_pick(rng, data.candidates), 'get', reverse('jobs:recommended_jobs'))
+    if endpoint in ('candidate_queries', 'consultant_queries'):
+        if endpoint == 'candidate_queries':
+            threads, users = data.candidate_threads, data.candidates
+        else:
+            threads, users = data.consultant_threads, data.consultants
+        if not threads:
+            return None
+        user_id, job_id = rng.choice(threads)
+        return Request(users[user_id], 'get', reverse('jobs:job_queries', args=[job_id]))
+    if endpoint == 'candidate_dashboard':
+        return Request(_pick(rng, data.candidates), 'get', reverse('accounts:dashboard'))
+    if endpoint == 'consultant_dashboard':
+        return Request(_pick(rng, data.consultants), 'get', reverse('accounts:dashboard'))
+    if endpoint == 'chatbot_ask':
+        return Request(
+            _pick(rng, data.candidates), 'post', reverse('chatbot:ask'),
+            json.dumps({'message': rng.choice(CHATBOT_MESSAGES)}), content_type='application/json',
+        )
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
+
+
+def summarize(samples):
+    """
+    Per endpoint stats from {endpoint: [(seconds, queries), ...]}.
+    """
+    results = {}
+    for endpoint, measured in samples.items():
+        if not measured:
+            continue
+        timings = [seconds * 1000 for seconds, _ in measured]
+        queries = [count for _, count in measured]
+        results[endpoint] = {
+            'requests': len(measured),
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_queries': round(statistics.fmean(queries), 2),
+            'max_queries': max(queries),
+            'requests_per_second': round(len(timings) * 1000 / sum(timings), 1),
+        }
+    return results
+
+
+def run(mix=None, requests=1000, warmup=2, users=20, seed=42):
+    """
+    Replay `requests` requests drawn from the weighted `mix`, after
+    `warmup` unmeasured requests per endpoint (cold caches, lazy indexes).
+    Every request runs in a transaction that is rolled back, and uploads
+    go to in-memory storage, so the database and media are left unchanged.
+    """
+    mix = {endpoint: weight for endpoint, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+    rng = random.Random(seed)
+    data = BenchmarkData(rng, users=users)
+
+    clients = {}
+
+    def client_for(user):
+        if user.pk not in clients:
+            clients[user.pk] = Client()
+            clients[user.pk].force_login(user)
+        return clients[user.pk]
+
+    def send(request):
+        client = client_for(request.user)
+        kwargs = {'content_type': request.content_type} if request.content_type else {}
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = getattr(client, request.method)(request.url, request.data, **kwargs)
+                elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{request.method.upper()} {request.url} returned {response.status_code}")
+        return elapsed, len(captured)
+
+    endpoints, weights = list(mix), list(mix.values())
+    samples = {endpoint: [] for endpoint in endpoints}
+
+    with override_settings(STORAGES={**settings.STORAGES, 'default': {'BACKEND': IN_MEMORY_STORAGE}}):
+        for endpoint in endpoints:
+            for _ in range(warmup):
+                request = build_request(endpoint, data, rng)
+                if request:
+                    send(request)
+
+        started = time.perf_counter()
+        for endpoint in rng.choices(endpoints, weights, k=requests):
+            request = build_request(endpoint, data, rng)
+            if request:
+                samples[endpoint].append(send(request))
+        wall = time.perf_counter() - started
+
+    measured = sum(len(timings) for timings in samples.values())
+    return {
+        'meta': {
+            'requests': measured,
+            'seconds': round(wall, 3),
+            'requests_per_second': round(measured / wall, 1) if wall else 0.0,
+            'seed': seed,
+            'users': users,
+            'mix': mix,
+            'vendor': connection.vendor,
+            'jobs': len(data.job_ids),
+        },
+        'endpoints': summarize(samples),
+    }
+
+
+def compare(results, baseline, threshold=0.2, metric='p50', min_delta_ms=1.0):
+    """
+    Regressions of `results` against a saved `baseline`: an endpoint
+    regresses when its `metric` latency (p50, p95 or p99) grows by more
+    than `threshold` (a fraction) and by at least `min_delta_ms`, or when
+    it runs more queries per request.
+    """
+    key = f'{metric}_ms'
+    regressions = []
+    for endpoint, current in results['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(endpoint)
+        if not previous:
+            continue
+        if current[key] > previous[key] * (1 + threshold) and current[key] - previous[key] >= min_delta_ms:
+            regressions.append(
+                f"{endpoint}: {metric} {current[key]:.1f} ms vs baseline {previous[key]:.1f} ms "
+                f"(+{current[key] / previous[key] - 1:.0%})"
+            )
+        if current['max_queries'] > previous['max_queries']:
+            regressions.append(
+                f"{endpoint}: up to {current['max_queries']} queries per request "
+                f"vs baseline {previous['max_queries']}"
+            )
+    return regressions
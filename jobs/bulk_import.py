@@ -0,0 +1,215 @@
+# jobs/bulk_import.py
+"""
+Bulk job import from CSV or JSON (an array of objects, or one object per
+line). The file is read as a stream: rows are validated one at a time with
+JobForm and the valid ones inserted with bulk_create in batches, so only
+one batch of Job instances is held however long the file is.
+
+bulk_create sends no post_save signals: the search index and skill links
+of each batch are written in the same transaction, and the caches the
+signals would have cleared are invalidated once it commits.
+"""
+import copy
+import csv
+import json
+
+from django.db import transaction
+
+from .dashboard import invalidate_dashboard
+from .facets import invalidate_facets
+from .forms import JobForm
+from .models import Job, SkillWord
+from .recommendations import invalidate_for_job_terms, invalidate_recommender, job_terms
+from .search import index_jobs
+from .skills import link_skills, load_aliases
+
+# Jobs inserted per bulk_create
+BATCH_SIZE = 1000
+
+# Invalid rows listed in a report (all of them are counted)
+MAX_REPORTED_ERRORS = 1000
+
+# Characters read from a JSON file at a time
+READ_SIZE = 64 * 1024
+
+FORMATS = ('csv', 'json')
+
+FIELDS = JobForm._meta.fields
+
+# Values of is_active read as False (anything else, or no value, is True)
+FALSE_VALUES = {'false', '0', 'no', 'n', 'off'}
+
+# "Full Time" -> "FT", for files written by hand
+JOB_TYPE_LABELS = {label.lower(): code for code, label in Job.JOB_TYPE_CHOICES}
+
+# Between and around the objects of a JSON array or JSON lines file
+JSON_SEPARATORS = ' \t\r\n,[]'
+
+
+class SharedFields(dict):
+    # Returned as is by copy.deepcopy()
+    def __deepcopy__(self, memo):
+        return self
+
+
+class ImportJobForm(JobForm):
+    """
+    JobForm for one row after another. A form deep-copies its fields when
+    built, which was most of the cost of validating a row; these forms
+    share one copy instead (validation doesn't change the fields).
+    """
+
+
+ImportJobForm.base_fields = SharedFields(copy.deepcopy(JobForm.base_fields))
+
+
+class ImportFormatError(ValueError):
+    """
+    The file as a whole can't be read; nothing is imported.
+    """
+
+
+def import_format(filename, requested=None):
+    """
+    Format of an uploaded file: the requested one, else its extension.
+    """
+    file_format = (requested or filename.rsplit('.', 1)[-1]).lower()
+    if file_format in ('ndjson', 'jsonl'):
+        file_format = 'json'
+    if file_format not in FORMATS:
+        raise ImportFormatError("Upload a .csv or .json file.")
+    return file_format
+
+
+# ----------------------------
+# Reading rows
+# ----------------------------
+def csv_rows(stream):
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None:
+        return
+    missing = set(FIELDS) - {'is_active'} - {name.strip() for name in reader.fieldnames}
+    if missing:
+        raise ImportFormatError(f"Missing columns: {', '.join(sorted(missing))}.")
+    for row in reader:
+        yield {key.strip(): value for key, value in row.items() if key is not None}
+
+
+def json_rows(stream):
+    """
+    Values of a JSON array or JSON lines file, decoded as the text is read.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+    while True:
+        while position < len(buffer) and buffer[position] in JSON_SEPARATORS:
+            position += 1
+        if position < len(buffer):
+            try:
+                value, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as exc:
+                # Possibly cut off at the end of what was read so far
+                if eof:
+                    raise ImportFormatError(f"Invalid JSON: {exc.msg}.")
+            else:
+                yield value
+                continue
+        elif eof:
+            return
+        chunk = stream.read(READ_SIZE)
+        eof = not chunk
+        buffer, position = buffer[position:] + chunk, 0
+
+
+def form_data(row):
+    data = {field: row[field] for field in FIELDS if row.get(field) is not None}
+    job_type = data.get('job_type')
+    if isinstance(job_type, str):
+        data['job_type'] = JOB_TYPE_LABELS.get(job_type.strip().lower(), job_type.strip())
+    active = data.get('is_active', True)
+    if isinstance(active, str):
+        active = active.strip().lower() not in FALSE_VALUES
+    data['is_active'] = bool(active)
+    return data
+
+
+def build_job(row, posted_by):
+    """
+    (unsaved Job, None) for a valid row, (None, {field: [messages]}) otherwise.
+    """
+    if not isinstance(row, dict):
+        return None, {'__all__': ["Each row must be an object of job fields."]}
+    form = ImportJobForm(data=form_data(row))
+    if not form.is_valid():
+        return None, {field: list(messages) for field, messages in form.errors.items()}
+    job = form.save(commit=False)
+    job.posted_by = posted_by
+    return job, None
+
+
+# ----------------------------
+# Importing
+# ----------------------------
+def _insert(batch, aliases):
+    """
+    Insert a batch of jobs with what their post_save signals would write.
+    """
+    Job.objects.bulk_create(batch)
+    link_skills(Job, [(job.pk, job.skills) for job in batch], aliases=aliases)
+    index_jobs(batch)
+
+
+def import_jobs(stream, file_format, posted_by, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Import the jobs of a CSV or JSON text stream as posted by `posted_by`,
+    in one transaction: valid rows are inserted, invalid ones reported.
+    With `dry_run`, rows are only validated.
+
+    Raises ImportFormatError (and imports nothing) if the file can't be read.
+    """
+    rows = csv_rows(stream) if file_format == 'csv' else json_rows(stream)
+    aliases = load_aliases()
+    # Only words of a skill name can match candidates (candidates_affected_by)
+    skill_terms = set(SkillWord.objects.values_list('word', flat=True).distinct())
+    report = {'rows': 0, 'created': 0, 'invalid': 0, 'errors': [], 'dry_run': dry_run}
+    terms = set()
+    batch = []
+
+    def flush():
+        if not dry_run:
+            _insert(batch, aliases)
+            # Words the cached recommendations of candidates can depend on
+            terms.update(
+                term for job in batch if job.is_active for term in job_terms(job, aliases) if term in skill_terms
+            )
+        report['created'] += len(batch)
+        batch.clear()
+
+    try:
+        with transaction.atomic():
+            for number, row in enumerate(rows, 1):
+                report['rows'] = number
+                job, errors = build_job(row, posted_by)
+                if errors:
+                    report['invalid'] += 1
+                    if len(report['errors']) < MAX_REPORTED_ERRORS:
+                        report['errors'].append({'row': number, 'errors': errors})
+                    continue
+                batch.append(job)
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+
+            if report['created'] and not dry_run:
+                owner_id = posted_by.pk
+                transaction.on_commit(invalidate_facets)
+                transaction.on_commit(invalidate_recommender)
+                transaction.on_commit(lambda: invalidate_dashboard([owner_id]))
+                transaction.on_commit(lambda: invalidate_for_job_terms(terms))
+    except UnicodeDecodeError:
+        raise ImportFormatError("The file must be UTF-8 encoded.")
+    except csv.Error as exc:
+        raise ImportFormatError(f"Invalid CSV: {exc}.")
+
+    return report
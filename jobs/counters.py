@@ -0,0 +1,117 @@
+# jobs/counters.py
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.query import QuerySet
+
+# Denormalized counter on Job -> (reverse relation, filter of counted rows)
+COUNTERS = {
+    'applications_count': ('applications', {}),
+    'saved_count': ('saved_by', {}),
+    'open_queries_count': ('queries', {'is_resolved': False}),
+}
+
+
+def adjust_counter(job_id, field, delta):
+    """
+    Atomically add `delta` to a counter of a job (UPDATE ... SET n = n + delta).
+    A decrement never takes a counter below zero; reconcile_counters
+    reports and repairs such drift.
+    """
+    from .models import Job
+
+    jobs = Job.objects.filter(pk=job_id)
+    if delta < 0:
+        jobs = jobs.filter(**{f'{field}__gte': -delta})
+    jobs.update(**{field: F(field) + delta})
+
+
+def deleted_with_job(origin):
+    """
+    Whether a delete started from a Job (or a queryset of jobs): its rows
+    then go along with the job, and its counters with it.
+    """
+    from .models import Job
+
+    if isinstance(origin, QuerySet):
+        return origin.model is Job
+    return isinstance(origin, Job)
+
+
+def set_query_resolved(query, resolved):
+    """
+    Resolve or reopen a job query. The conditional UPDATE only matches when
+    the state actually changes, so concurrent toggles can't move the job's
+    open queries counter twice. Returns whether the query changed.
+    """
+    from .dashboard import invalidate_dashboard_for_jobs
+    from .live import publish
+    from .models import JobQuery
+
+    with transaction.atomic():
+        changed = JobQuery.objects.filter(pk=query.pk, is_resolved=not resolved).update(is_resolved=resolved)
+        if changed:
+            adjust_counter(query.job_id, 'open_queries_count', -1 if resolved else 1)
+            job_id = query.job_id
+            transaction.on_commit(lambda: invalidate_dashboard_for_jobs([job_id]))
+            publish('resolved' if resolved else 'reopened', query)
+    query.is_resolved = resolved
+    return bool(changed)
+
+
+def count_subquery(job_model, field):
+    relation, filters = COUNTERS[field]
+    related = job_model._meta.get_field(relation).related_model
+    counted = (
+        related.objects.filter(job=OuterRef('pk'), **filters)
+        .order_by().values('job').annotate(n=Count('id')).values('n')
+    )
+    return Coalesce(Subquery(counted), Value(0))
+
+
+def actual_counts(job_model, field):
+    """
+    {job id: count} of the rows a counter counts, in one grouped query.
+    """
+    relation, filters = COUNTERS[field]
+    related = job_model._meta.get_field(relation).related_model
+    return dict(
+        related.objects.filter(**filters).order_by()
+        .values('job_id').annotate(n=Count('id')).values_list('job_id', 'n')
+    )
+
+
+def reconcile_counters(job_model=None, fix=True, batch_size=1000, stdout=None):
+    """
+    Compare every job's counters with the rows they count and, with `fix`,
+    recompute the drifted ones. Works with both real and historical
+    (migration) models.
+
+    Returns {field: [(job id, stored, actual), ...]} of the drift found.
+    """
+    if job_model is None:
+        from .models import Job as job_model
+
+    fields = list(COUNTERS)
+    actual = {field: actual_counts(job_model, field) for field in fields}
+    drift = {field: [] for field in fields}
+
+    rows = job_model.objects.order_by('id').values_list('id', *fields)
+    for job_id, *stored in rows.iterator(chunk_size=batch_size):
+        for field, value in zip(fields, stored):
+            expected = actual[field].get(job_id, 0)
+            if value != expected:
+                drift[field].append((job_id, value, expected))
+
+    if fix:
+        for field, found in drift.items():
+            ids = [job_id for job_id, _, _ in found]
+            for start in range(0, len(ids), batch_size):
+                # Counted again at write time, so rows changed since the scan
+                # above are still set right
+                job_model.objects.filter(pk__in=ids[start:start + batch_size]).update(
+                    **{field: count_subquery(job_model, field)}
+                )
+            if stdout and found:
+                stdout.write(f"{field}: fixed {len(found)} jobs")
+    return drift
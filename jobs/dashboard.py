@@ -0,0 +1,108 @@
+# jobs/dashboard.py
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Application, Job
+
+CACHE_TIMEOUT = 60 * 60
+
+STATUSES = [value for value, _ in Application.STATUS_CHOICES]
+MEETING_STATUSES = [value for value, _ in Application.MEETING_STATUS_CHOICES]
+
+
+def _cache_key(user_id):
+    return f'jobs:dashboard:{user_id}'
+
+
+def _empty_job(row):
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'is_active': row['is_active'],
+        'open_queries': row['open_queries_count'],
+        'applications': 0,
+        'statuses': dict.fromkeys(STATUSES, 0),
+        'meetings': dict.fromkeys(MEETING_STATUSES, 0),
+    }
+
+
+def _stats_from_groups(groups):
+    """
+    Fold (job, application status, meeting status, count) groups into the
+    dashboard numbers. Jobs without applications come as one group with
+    no status and a zero count.
+    """
+    jobs = {}
+    for row in groups:
+        job = jobs.get(row['id'])
+        if job is None:
+            job = jobs[row['id']] = _empty_job(row)
+        count = row['count']
+        if count:
+            job['applications'] += count
+            job['statuses'][row['applications__status']] = job['statuses'].get(row['applications__status'], 0) + count
+            meeting = row['applications__meeting_status']
+            job['meetings'][meeting] = job['meetings'].get(meeting, 0) + count
+
+    per_job = list(jobs.values())
+    statuses = dict.fromkeys(STATUSES, 0)
+    meetings = dict.fromkeys(MEETING_STATUSES, 0)
+    for job in per_job:
+        for status, count in job['statuses'].items():
+            statuses[status] = statuses.get(status, 0) + count
+        for status, count in job['meetings'].items():
+            meetings[status] = meetings.get(status, 0) + count
+
+    active = sum(1 for job in per_job if job['is_active'])
+    return {
+        'jobs': {'total': len(per_job), 'active': active, 'inactive': len(per_job) - active},
+        'applications': {'total': sum(job['applications'] for job in per_job), **statuses},
+        'meetings': meetings,
+        'open_queries': sum(job['open_queries'] for job in per_job),
+        'per_job': per_job,
+    }
+
+
+def compute_dashboard_stats(user):
+    """
+    All consultant dashboard numbers: jobs by active state, applications by
+    status, meetings by status, unresolved queries and the same per job,
+    from a single grouped query over the consultant's jobs and applications.
+    """
+    groups = (
+        Job.objects.filter(posted_by=user)
+        .values(
+            'id', 'title', 'is_active', 'open_queries_count', 'posted_on',
+            'applications__status', 'applications__meeting_status',
+        )
+        .annotate(count=Count('applications'))
+        .order_by('-posted_on', '-id')
+    )
+    return _stats_from_groups(groups)
+
+
+def get_dashboard_stats(user):
+    """
+    compute_dashboard_stats() cached per consultant until one of their jobs,
+    its applications or its queries change. The cache is shared by every
+    worker (settings.CACHES), so a change made through any of them drops
+    the stats for all.
+    """
+    key = _cache_key(user.pk)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_dashboard_stats(user)
+        cache.set(key, stats, CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_dashboard(user_ids):
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids if user_id is not None])
+
+
+def invalidate_dashboard_for_jobs(job_ids):
+    """
+    Drop the cached stats of the consultants who posted these jobs.
+    """
+    owners = Job.objects.filter(pk__in=job_ids).values_list('posted_by_id', flat=True).distinct()
+    invalidate_dashboard(list(owners))
@@ -0,0 +1,123 @@
+# jobs/facets.py
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from config.cache import bump_version, current_version
+from .models import Job
+
+FACET_FIELDS = ('job_type', 'location', 'domain', 'experience')
+
+# Most frequent values shown for free-text facets
+MAX_FACET_VALUES = 8
+
+CACHE_TIMEOUT = 60 * 60
+VERSION_CACHE_KEY = 'jobs:facets:version'
+
+
+def normalize_filters(params):
+    """
+    Canonical form of the jobs list filters, so equivalent requests
+    (different case, spacing or parameter order) share one cache entry.
+    """
+    filters = {}
+    for name in ('location', 'domain', 'skills'):
+        value = ' '.join((params.get(name) or '').lower().split())
+        if value:
+            filters[name] = value
+
+    job_type = (params.get('job_type') or '').upper()
+    if job_type:
+        filters['job_type'] = job_type
+
+    experience = params.get('experience')
+    if experience:
+        try:
+            filters['experience'] = int(experience)
+        except ValueError:
+            pass
+    return filters
+
+
+def _facets_from_groups(groups):
+    """
+    Fold (job_type, location, domain, experience, count) groups into
+    per-facet value counts.
+    """
+    job_types = {}
+    locations = {}
+    domains = {}
+    experience = {}
+
+    for row in groups:
+        count = row['count']
+        job_types[row['job_type']] = job_types.get(row['job_type'], 0) + count
+        experience[row['experience']] = experience.get(row['experience'], 0) + count
+
+        for values, text in ((locations, row['location']), (domains, row['domain'])):
+            key = ' '.join(text.lower().split())
+            if not key:
+                continue
+            label, total = values.get(key, (text.strip(), 0))
+            values[key] = (label, total + count)
+
+    labels = dict(Job.JOB_TYPE_CHOICES)
+
+    # The experience filter means "at most N years", so counts are cumulative
+    experience_counts = []
+    running = 0
+    for years in sorted(experience):
+        running += experience[years]
+        experience_counts.append({'value': years, 'label': f"≤ {years} yrs", 'count': running})
+
+    def top(values):
+        ranked = sorted(values.values(), key=lambda item: (-item[1], item[0].lower()))
+        return [{'value': label, 'label': label, 'count': count} for label, count in ranked[:MAX_FACET_VALUES]]
+
+    return {
+        'job_type': [
+            {'value': value, 'label': labels.get(value, value), 'count': count}
+            for value, count in sorted(job_types.items(), key=lambda item: -item[1])
+        ],
+        'location': top(locations),
+        'domain': top(domains),
+        'experience': experience_counts,
+    }
+
+
+def compute_facets(queryset):
+    """
+    Counts for every facet value among the jobs in `queryset`,
+    from a single GROUP BY query.
+    """
+    groups = queryset.order_by().values(*FACET_FIELDS).annotate(count=Count('id'))
+    return _facets_from_groups(groups)
+
+
+def _cache_key(filters):
+    version = current_version(VERSION_CACHE_KEY)
+    digest = hashlib.md5(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    return f'jobs:facets:{version}:{digest}'
+
+
+def get_facets(queryset, filters):
+    """
+    compute_facets() cached per normalized filter set. `queryset` must be
+    the active jobs list narrowed by exactly these filters.
+    """
+    key = _cache_key(filters)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_facets():
+    """
+    Drop every cached facet set, in every process (called whenever a Job
+    changes).
+    """
+    bump_version(VERSION_CACHE_KEY)
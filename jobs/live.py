@@ -0,0 +1,232 @@
+# jobs/live.py
+"""
+Live updates of job query threads, streamed as Server-Sent Events.
+
+Writes record a ThreadEvent row once committed. In each process, one hub
+per event loop polls for new rows (a single indexed query per interval,
+whatever the number of open streams) and hands them to the queues of the
+streams watching that job. An idle stream is just a queue and a
+suspended coroutine, so one ASGI worker holds thousands of them.
+
+Event ids are row ids: a reconnecting EventSource sends Last-Event-ID
+and gets the events it missed replayed from the table.
+"""
+import asyncio
+import json
+import time
+import weakref
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import ThreadEvent
+
+# Comment line sent on idle streams, so proxies don't drop them
+KEEPALIVE_SECONDS = 15
+
+# Events kept for replay to reconnecting clients
+RETENTION = timedelta(hours=1)
+PRUNE_EVERY_SECONDS = 5 * 60
+
+# Events read per poll, and buffered per stream before it is dropped (the
+# client then reconnects and catches up from the table)
+POLL_BATCH = 500
+MAX_PENDING = 1000
+
+RETRY_MS = 3000
+
+
+# ----------------------------
+# Publishing
+# ----------------------------
+def author_name(user):
+    profile = getattr(user, 'profile', None)
+    name = f"{getattr(profile, 'first_name', '')} {getattr(profile, 'last_name', '')}".strip()
+    return name or user.email
+
+
+def publish(kind, query, **data):
+    """
+    Record a thread event once the current transaction commits.
+    """
+    job_id, query_id = query.job_id, query.pk
+    data = {'query': query_id, 'query_user': query.user_id, **data}
+    transaction.on_commit(lambda: record_event(job_id, query_id, kind, data))
+
+
+def record_event(job_id, query_id, kind, data):
+    ThreadEvent.objects.create(job_id=job_id, query_id=query_id, kind=kind, data=data)
+    maybe_prune_events()
+
+
+def publish_reply(reply):
+    publish(
+        'reply', reply.query,
+        reply=reply.pk,
+        author=author_name(reply.user),
+        author_role=reply.user.role,
+        message=reply.message,
+        created_at=reply.created_at.isoformat(),
+    )
+
+
+def latest_event_id():
+    return ThreadEvent.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+def fetch_events(after_id, job_id=None, limit=POLL_BATCH):
+    events = ThreadEvent.objects.filter(id__gt=after_id)
+    if job_id is not None:
+        events = events.filter(job_id=job_id)
+    return list(events.order_by('id').values('id', 'job_id', 'kind', 'data')[:limit])
+
+
+def prune_events():
+    ThreadEvent.objects.filter(created_at__lt=timezone.now() - RETENTION).delete()
+
+
+_last_prune = 0.0
+
+
+def maybe_prune_events():
+    """
+    prune_events(), at most once per PRUNE_EVERY_SECONDS in each process.
+    Run on every event recorded, so the table stays bounded whether or not
+    any stream is open (and under WSGI).
+    """
+    global _last_prune
+    now = time.monotonic()
+    if now - _last_prune > PRUNE_EVERY_SECONDS:
+        _last_prune = now
+        prune_events()
+
+
+# ----------------------------
+# Per-process hub
+# ----------------------------
+class EventHub:
+    """
+    Polls the event table while at least one stream is open and fans the
+    new events out to the streams of their job.
+    """
+
+    def __init__(self, poll_interval):
+        self.poll_interval = poll_interval
+        self.subscribers = {}         # job id -> set of queues
+        self.last_id = None
+        self.ready = asyncio.Event()  # set once last_id is known
+        self.task = None
+
+    def subscribe(self, job_id):
+        queue = asyncio.Queue(maxsize=MAX_PENDING)
+        self.subscribers.setdefault(job_id, set()).add(queue)
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        return queue
+
+    def unsubscribe(self, job_id, queue):
+        queues = self.subscribers.get(job_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[job_id]
+
+    @property
+    def stream_count(self):
+        return sum(len(queues) for queues in self.subscribers.values())
+
+    async def run(self):
+        try:
+            self.last_id = await sync_to_async(latest_event_id)()
+            self.ready.set()
+            while self.subscribers:
+                await self.poll()
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            # Idle: the next stream starts again from the newest event
+            self.task = None
+            self.last_id = None
+            self.ready = asyncio.Event()
+
+    async def poll(self):
+        events = await sync_to_async(fetch_events)(self.last_id)
+        for event in events:
+            self.last_id = event['id']
+            for queue in list(self.subscribers.get(event['job_id'], ())):
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Too slow a reader: end its stream (see stream_job_events)
+                    self.unsubscribe(event['job_id'], queue)
+                    queue.overflowed = True
+
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub():
+    """
+    Hub of the running event loop (one per ASGI worker).
+    """
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = EventHub(getattr(settings, 'JOB_EVENTS_POLL_INTERVAL', 1.0))
+    return hub
+
+
+# ----------------------------
+# Stream
+# ----------------------------
+def format_event(event):
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+def parse_event_id(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+async def stream_job_events(job_id, user_id=None, after=None):
+    """
+    SSE body for the threads of a job: events after `after` (replayed from
+    the table), then live ones. With `user_id`, only the events of that
+    user's own queries (candidates).
+    """
+    hub = get_hub()
+    queue = hub.subscribe(job_id)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+
+        # Replay what a reconnecting client missed. The hub reads its start
+        # id first, so every event is either replayed or delivered live
+        # (possibly both: ids already sent are skipped).
+        sent_id = 0
+        if after is not None:
+            await hub.ready.wait()
+            for event in await sync_to_async(fetch_events)(after, job_id, limit=None):
+                sent_id = event['id']
+                if user_id is None or event['data'].get('query_user') == user_id:
+                    yield format_event(event)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if getattr(queue, 'overflowed', False):
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            if event['id'] <= sent_id:
+                continue
+            sent_id = event['id']
+            if user_id is None or event['data'].get('query_user') == user_id:
+                yield format_event(event)
+    finally:
+        hub.unsubscribe(job_id, queue)
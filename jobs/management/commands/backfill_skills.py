@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+from jobs.skills import backfill_skills, load_aliases
+from profiles.models import CandidateProfile
+
+
+class Command(BaseCommand):
+    help = "Rebuild normalized skill links for jobs and candidate profiles from their skills text."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of rows processed per transaction (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        aliases = load_aliases()
+
+        for model in (Job, CandidateProfile):
+            total = backfill_skills(
+                model,
+                batch_size=options['batch_size'],
+                aliases=aliases,
+                stdout=self.stdout,
+            )
+            self.stdout.write(self.style.SUCCESS(f"{model.__name__}: linked skills for {total} rows."))
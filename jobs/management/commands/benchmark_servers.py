@@ -0,0 +1,70 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import server_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync JSON endpoints under WSGI (a pool of worker threads) with their async "
+        "variants under ASGI (one event loop) at the same concurrency: throughput, latency, peak "
+        "threads and peak Python memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help="Measured requests per server (default: 500)")
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help="Requests in flight: WSGI worker threads / concurrent ASGI requests (default: 50)",
+        )
+        parser.add_argument('--users', type=int, default=10, help="Logged-in candidates to sample (default: 10)")
+        parser.add_argument('--warmup', type=int, default=2, help="Unmeasured requests per endpoint (default: 2)")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed (default: 42)")
+        parser.add_argument(
+            '--server',
+            choices=server_benchmark.SERVERS,
+            action='append',
+            help="Only measure this server (repeatable, default: both)",
+        )
+        parser.add_argument('--output', help="Write the results as JSON to this file")
+
+    def handle(self, *args, **options):
+        try:
+            results = server_benchmark.run(
+                requests=options['requests'],
+                concurrency=options['concurrency'],
+                users=options['users'],
+                warmup=options['warmup'],
+                seed=options['seed'],
+                servers=options['server'] or server_benchmark.SERVERS,
+            )
+        except (ValueError, RuntimeError) as exc:
+            raise CommandError(str(exc))
+
+        self.report(results)
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def report(self, results):
+        header = (
+            f"{'server':<8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'threads':>9}{'peak mem KB':>13}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for server, stats in results['servers'].items():
+            self.stdout.write(
+                f"{server:<8}{stats['requests_per_second']:>9.1f}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+                f"{stats['p99_ms']:>10.1f}{stats['peak_threads']:>9}{stats['peak_memory_kb']:>13.1f}"
+            )
+        meta = results['meta']
+        self.stdout.write(
+            f"{meta['requests']} requests per server, {meta['concurrency']} in flight, "
+            f"{meta['users']} users ({meta['vendor']})"
+        )
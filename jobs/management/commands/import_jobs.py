@@ -0,0 +1,71 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from jobs.bulk_import import BATCH_SIZE, FORMATS, ImportFormatError, import_format, import_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Import jobs for a consultant from a CSV or JSON file (an array of objects or one object "
+        "per line). Valid rows are inserted, invalid ones reported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or - for standard input")
+        parser.add_argument('--consultant', required=True, help="Email of the consultant posting the jobs")
+        parser.add_argument('--format', choices=FORMATS, help="File format (default: from the extension)")
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Number of jobs inserted per query (default: {BATCH_SIZE})",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Only validate the rows")
+        parser.add_argument('--report', help="Write the report, with every reported error, as JSON to this file")
+
+    def handle(self, *args, **options):
+        consultant = User.objects.filter(email=options['consultant'], role='CONSULTANT').first()
+        if consultant is None:
+            raise CommandError(f"No consultant with email {options['consultant']}.")
+
+        path = options['path']
+        try:
+            if path == '-':
+                if not options['format']:
+                    raise CommandError("--format is required when reading standard input.")
+                sys.stdin.reconfigure(encoding='utf-8-sig', newline='')
+                report = import_jobs(
+                    sys.stdin, options['format'], consultant,
+                    batch_size=options['batch_size'], dry_run=options['dry_run'],
+                )
+            else:
+                file_format = import_format(path, options['format'])
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    report = import_jobs(
+                        stream, file_format, consultant,
+                        batch_size=options['batch_size'], dry_run=options['dry_run'],
+                    )
+        except (ImportFormatError, OSError) as exc:
+            raise CommandError(f"{exc} Nothing was imported.")
+
+        for entry in report['errors'][:20]:
+            problems = '; '.join(
+                f"{field}: {' '.join(messages)}" if field != '__all__' else ' '.join(messages)
+                for field, messages in entry['errors'].items()
+            )
+            self.stdout.write(self.style.WARNING(f"Row {entry['row']}: {problems}"))
+        if report['invalid'] > 20:
+            self.stdout.write(f"... and {report['invalid'] - 20} more invalid rows.")
+
+        done = "valid" if report['dry_run'] else "imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['rows']} rows read: {report['created']} jobs {done}, {report['invalid']} invalid."
+        ))
+
+        if options['report']:
+            with open(options['report'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Report written to {options['report']}")
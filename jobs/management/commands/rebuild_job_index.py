@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.models import Job
+from jobs.search import clear_index, index_jobs, optimize_index, fts_available
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for jobs from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help="Number of jobs indexed per transaction (default: 2000)",
+        )
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING(
+                "Full-text search needs SQLite FTS5; nothing to rebuild."
+            ))
+            return
+
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            clear_index()
+
+        total = 0
+        batch = []
+        jobs = Job.objects.order_by('id').only('id', 'title', 'company', 'location', 'domain', 'skills', 'description')
+
+        for job in jobs.iterator(chunk_size=batch_size):
+            batch.append(job)
+            if len(batch) >= batch_size:
+                total += self._flush(batch)
+                self.stdout.write(f"Indexed {total} jobs...")
+                batch = []
+
+        if batch:
+            total += self._flush(batch)
+
+        optimize_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} jobs."))
+
+    def _flush(self, batch):
+        with transaction.atomic():
+            index_jobs(batch)
+        return len(batch)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from jobs.recommendations import recommendation_cache_stats, reset_recommendation_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the per-candidate recommendation cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Reset the counters after printing them")
+
+    def handle(self, *args, **options):
+        stats = recommendation_cache_stats()
+        self.stdout.write(
+            f"hits: {stats['hits']}  misses: {stats['misses']}  hit ratio: {stats['hit_ratio']:.1%}"
+        )
+        if options['reset']:
+            reset_recommendation_cache_stats()
+            self.stdout.write("Counters reset.")
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from jobs.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized application, saved and open query counters of every job "
+        "and report the drift found."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report drift, don't fix it",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of jobs updated per query (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        drift = reconcile_counters(
+            fix=not options['dry_run'],
+            batch_size=options['batch_size'],
+            stdout=self.stdout,
+        )
+
+        for field, found in drift.items():
+            if not found:
+                self.stdout.write(f"{field}: no drift")
+                continue
+            off_by = sum(abs(actual - stored) for _, stored, actual in found)
+            self.stdout.write(self.style.WARNING(
+                f"{field}: {len(found)} jobs drifted, off by {off_by} in total"
+            ))
+            if options['verbosity'] > 1:
+                for job_id, stored, actual in found:
+                    self.stdout.write(f"  job {job_id}: stored {stored}, actual {actual}")
+
+        total = sum(len(found) for found in drift.values())
+        if not total:
+            self.stdout.write(self.style.SUCCESS("All job counters are exact."))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING("Dry run: nothing changed."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Drifted counters recomputed."))
@@ -0,0 +1,108 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import benchmark
+
+
+def parse_mix(value):
+    """
+    Endpoint weights from a JSON file or an inline "jobs_list=5,job_detail=2".
+    """
+    if value.endswith('.json'):
+        with open(value) as handle:
+            mix = json.load(handle)
+    else:
+        mix = {}
+        for item in value.split(','):
+            name, _, weight = item.partition('=')
+            mix[name.strip()] = float(weight or 1)
+
+    unknown = set(mix) - set(benchmark.DEFAULT_MIX)
+    if unknown:
+        raise CommandError(
+            f"Unknown endpoints: {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(benchmark.DEFAULT_MIX)}"
+        )
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a mix of requests as logged-in candidates and consultants against the current "
+        "database and report latency percentiles, queries per request and throughput per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help="Measured requests (default: 1000)")
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=2,
+            help="Unmeasured requests per endpoint before measuring (default: 2)",
+        )
+        parser.add_argument('--users', type=int, default=20, help="Users of each role to sample (default: 20)")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed (default: 42)")
+        parser.add_argument(
+            '--mix',
+            type=parse_mix,
+            help="Endpoint weights, as a JSON file or name=weight pairs (default: the built-in mix)",
+        )
+        parser.add_argument('--output', help="Write the results as JSON to this file (e.g. a new baseline)")
+        parser.add_argument('--baseline', help="Compare against a JSON baseline and fail on regressions")
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,
+            help="Allowed slowdown against the baseline, as a fraction (default: 0.2)",
+        )
+        parser.add_argument(
+            '--metric',
+            choices=('p50', 'p95', 'p99'),
+            default='p50',
+            help="Latency percentile compared with the baseline (default: p50, the least noisy)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            results = benchmark.run(
+                mix=options['mix'],
+                requests=options['requests'],
+                warmup=options['warmup'],
+                users=options['users'],
+                seed=options['seed'],
+            )
+        except (ValueError, RuntimeError) as exc:
+            raise CommandError(str(exc))
+
+        self.report(results)
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['baseline']:
+            with open(options['baseline']) as handle:
+                baseline = json.load(handle)
+            regressions = benchmark.compare(
+                results, baseline, threshold=options['threshold'], metric=options['metric']
+            )
+            if regressions:
+                raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def report(self, results):
+        header = f"{'endpoint':<22}{'reqs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'req/s':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for endpoint, stats in sorted(results['endpoints'].items()):
+            self.stdout.write(
+                f"{endpoint:<22}{stats['requests']:>6}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+                f"{stats['p99_ms']:>10.1f}{stats['mean_queries']:>9.1f}{stats['requests_per_second']:>9.1f}"
+            )
+        meta = results['meta']
+        self.stdout.write(
+            f"{meta['requests']} requests in {meta['seconds']:.1f} s ({meta['requests_per_second']:.1f} req/s) "
+            f"against {meta['jobs']} active jobs"
+        )
@@ -0,0 +1,188 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from accounts.models import User
+from chatbot.matcher import invalidate_matcher
+from chatbot.models import ChatbotFAQ
+from jobs import perf_data
+from jobs.facets import invalidate_facets
+from jobs.models import Application, Job, JobQuery, JobQueryReply, SavedJob
+from jobs.recommendations import invalidate_recommender
+from profiles.models import CandidateProfile, ConsultantProfile
+from subscriptions.models import Subscription
+from training.models import Course, Enrollment
+
+MODELS = {
+    'user': User,
+    'candidate_profile': CandidateProfile,
+    'consultant_profile': ConsultantProfile,
+    'subscription': Subscription,
+    'job': Job,
+    'application': Application,
+    'saved_job': SavedJob,
+    'job_query': JobQuery,
+    'job_query_reply': JobQueryReply,
+    'course': Course,
+    'enrollment': Enrollment,
+    'chatbot_faq': ChatbotFAQ,
+}
+
+# Rows (users, jobs) or candidates (activity) generated per worker task
+CHUNK_SIZES = {'user': 5000, 'job': 5000, 'activity': 500}
+
+
+@contextmanager
+def explicit_timestamps():
+    """
+    Let bulk_create keep the generated creation dates instead of
+    auto_now_add overwriting them with the current time.
+    """
+    fields = [
+        field for model in MODELS.values() for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def bounded_map(executor, fn, iterable, window):
+    """
+    executor.map(fn, iterable), keeping at most `window` calls submitted
+    ahead of the result being consumed. map() submits everything at once,
+    so finished chunks would pile up in memory while inserts lag behind.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, reproducible synthetic dataset (users, jobs, applications, "
+        "queries, courses, FAQs) for performance work."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help="Random seed (default: 42)")
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1.0,
+            help="Multiplier for every default row count, e.g. 0.01 for a quick dataset (default: 1)",
+        )
+        for name, value in perf_data.DEFAULT_COUNTS.items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                type=int,
+                dest=name,
+                help=f"Number of {name.replace('_', ' ')} (default: {value:,} x scale)",
+            )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes generating rows; 1 generates in this process (default: CPU count)",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help="Rows per INSERT (default: 2000)",
+        )
+        parser.add_argument(
+            '--password',
+            default='perfpass123',
+            help="Password of every generated user (default: perfpass123)",
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.inserted = 0
+        plan = perf_data.build_plan(
+            now=timezone.now(),
+            seed=options['seed'],
+            scale=options['scale'],
+            base_ids=self.next_ids(),
+            # Hashed once: hashing per user would dominate the run
+            password=make_password(options['password']),
+            **{name: options[name] for name in perf_data.DEFAULT_COUNTS},
+        )
+        counts = plan['counts']
+        self.stdout.write("Generating " + ", ".join(f"{value:,} {name}" for name, value in counts.items()))
+
+        tasks = [
+            [('user', plan, start, stop)
+             for start, stop in perf_data.chunks(counts['consultants'] + counts['candidates'], CHUNK_SIZES['user'])],
+            [('job', plan, start, stop) for start, stop in perf_data.chunks(counts['jobs'], CHUNK_SIZES['job'])],
+            [('activity', plan, start, stop)
+             for start, stop in perf_data.chunks(counts['candidates'], CHUNK_SIZES['activity'])],
+        ]
+
+        # Bulk inserts send no post_save signals: profiles and subscriptions
+        # are generated explicitly, derived data is rebuilt at the end
+        with explicit_timestamps():
+            self.insert(perf_data.catalog_rows(plan))
+            if options['workers'] > 1:
+                # Workers only generate rows; this process does all the writing
+                # (SQLite allows a single writer anyway)
+                connections.close_all()
+                with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+                    for stage in tasks:
+                        for rows in bounded_map(executor, perf_data.generate, stage, options['workers'] * 2):
+                            self.insert(rows)
+            else:
+                for stage in tasks:
+                    for task in stage:
+                        self.insert(perf_data.generate(task))
+
+        self.stdout.write("Rebuilding derived data...")
+        call_command('backfill_skills', stdout=self.stdout)
+        call_command('rebuild_job_index', stdout=self.stdout)
+        call_command('reconcile_job_counters', stdout=self.stdout)
+        # The rows went in without signals: tell running servers (through
+        # the shared cache) to drop what they built from the old data
+        invalidate_facets()
+        invalidate_recommender()
+        invalidate_matcher()
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Users log in with password '{options['password']}'."
+        ))
+
+    def next_ids(self):
+        return {
+            name: (MODELS[name].objects.aggregate(last=Max('id'))['last'] or 0) + 1
+            for name in ('user', 'candidate_profile', 'job', 'job_query', 'course')
+        }
+
+    def insert(self, rows):
+        with transaction.atomic():
+            for name, values in rows.items():
+                model, fields = MODELS[name], perf_data.FIELDS[name]
+                model.objects.bulk_create(
+                    [model(**dict(zip(fields, row))) for row in values],
+                    batch_size=self.batch_size,
+                )
+        self.inserted += sum(len(values) for values in rows.values())
+        self.stdout.write(f"Inserted {self.inserted:,} rows...")
@@ -0,0 +1,92 @@
+from django.db import migrations
+
+# Built-in synonyms when this migration was written: a copy of
+# jobs.skills.DEFAULT_ALIASES, so later edits there don't change it
+ALIASES = {
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'k8s': 'kubernetes',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'dl': 'deep learning',
+    'c sharp': 'c#',
+    'csharp': 'c#',
+    'cpp': 'c++',
+    'aws cloud': 'aws',
+    'amazon web services': 'aws',
+    'gcp': 'google cloud',
+}
+
+
+def skill_names(text):
+    """
+    Canonical skill names of a comma separated skills string, in order.
+    """
+    names = []
+    for name in (text or '').split(','):
+        name = ' '.join(name.lower().split())[:100]
+        name = ALIASES.get(name, name)
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def link_skills(model, Skill, rows):
+    field = model._meta.get_field('normalized_skills')
+    through = field.remote_field.through
+    source = f'{field.m2m_field_name()}_id'
+    target = f'{field.m2m_reverse_field_name()}_id'
+
+    parsed = {pk: skill_names(text) for pk, text in rows}
+    names = {name for names in parsed.values() for name in names}
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    skill_ids = dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+    through.objects.bulk_create(
+        [through(**{source: pk, target: skill_ids[name]}) for pk, names in parsed.items() for name in names],
+        ignore_conflicts=True
+    )
+
+
+def backfill_skills(model, Skill, batch_size=1000):
+    batch = []
+    for row in model.objects.order_by('id').values_list('id', 'skills').iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            link_skills(model, Skill, batch)
+            batch = []
+    if batch:
+        link_skills(model, Skill, batch)
+
+
+def backfill(apps, schema_editor):
+    Skill = apps.get_model('jobs', 'Skill')
+    Job = apps.get_model('jobs', 'Job')
+    CandidateProfile = apps.get_model('profiles', 'CandidateProfile')
+
+    backfill_skills(Job, Skill)
+    backfill_skills(CandidateProfile, Skill)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_skill_taxonomy'),
+        ('profiles', '0009_candidateprofile_normalized_skills'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
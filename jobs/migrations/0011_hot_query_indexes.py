@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_backfill_normalized_skills'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'applied_at'], name='application_job_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', 'applied_at'], name='application_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['posted_on', 'id'], name='job_active_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['job_type', 'location', 'domain', 'experience', 'is_active'], name='job_active_facets_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['posted_by', 'posted_on', 'id'], name='job_owner_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobquery',
+            index=models.Index(fields=['job', 'is_resolved', 'created_at'], name='jobquery_job_resolved_idx'),
+        ),
+    ]
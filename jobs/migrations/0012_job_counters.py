@@ -0,0 +1,52 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Counter -> (reverse relation, filter of counted rows), as in jobs.counters
+# when this migration was written
+COUNTERS = {
+    'applications_count': ('applications', {}),
+    'saved_count': ('saved_by', {}),
+    'open_queries_count': ('queries', {'is_resolved': False}),
+}
+
+
+def backfill(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    counts = {}
+    for field, (relation, filters) in COUNTERS.items():
+        related = Job._meta.get_field(relation).related_model
+        counted = (
+            related.objects.filter(job=OuterRef('pk'), **filters)
+            .order_by().values('job').annotate(n=Count('id')).values('n')
+        )
+        counts[field] = Coalesce(Subquery(counted), Value(0))
+    Job.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='open_queries_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='saved_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_job_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThreadEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('query', 'New query'), ('reply', 'Reply'), ('resolved', 'Resolved'), ('reopened', 'Reopened')], max_length=10)),
+                ('data', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='thread_events', to='jobs.job')),
+                ('query', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='jobs.jobquery')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'id'], name='threadevent_job_idx'), models.Index(fields=['created_at'], name='threadevent_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:05
+
+import profiles.resumes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_thread_events'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='resume',
+            field=models.FileField(storage=profiles.resumes.get_resume_storage, upload_to='applications/resumes/'),
+        ),
+    ]
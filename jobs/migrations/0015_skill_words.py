@@ -0,0 +1,54 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:14
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Words as jobs.recommendations.tokenize splits them when this was written
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+
+def add_skill_words(SkillWord, skills):
+    SkillWord.objects.bulk_create(
+        [
+            SkillWord(skill_id=skill_id, word=word)
+            for skill_id, name in skills
+            for word in {token.rstrip('.') for token in TOKEN_RE.findall(name.lower())}
+        ],
+        ignore_conflicts=True
+    )
+
+
+def backfill(apps, schema_editor, batch_size=1000):
+    Skill = apps.get_model('jobs', 'Skill')
+    SkillWord = apps.get_model('jobs', 'SkillWord')
+    batch = []
+    for skill in Skill.objects.order_by('id').values_list('id', 'name').iterator(chunk_size=batch_size):
+        batch.append(skill)
+        if len(batch) >= batch_size:
+            add_skill_words(SkillWord, batch)
+            batch = []
+    add_skill_words(SkillWord, batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_alter_application_resume'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillWord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=100)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='words', to='jobs.skill')),
+            ],
+            options={
+                'unique_together': {('word', 'skill')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,50 @@
 from django.db import models
 from django.conf import settings
+from profiles.resumes import get_resume_storage
+
+class Skill(models.Model):
+    """
+    Canonical, normalized skill (e.g. "javascript").
+    Jobs and candidate profiles link to it instead of matching free text.
+    """
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """
+    Alternative spelling or synonym that resolves to a Skill (e.g. "js" -> "javascript").
+    """
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+
+    class Meta:
+        verbose_name_plural = 'skill aliases'
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+
+class SkillWord(models.Model):
+    """
+    Word of a skill name (e.g. "machine" and "learning" for "machine learning"),
+    so the skills sharing a word with some text are found through an index.
+    Kept in sync by jobs.skills.add_skill_words.
+    """
+    word = models.CharField(max_length=100)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='words')
+
+    class Meta:
+        unique_together = ('word', 'skill')
+
+    def __str__(self):
+        return f"{self.word} ({self.skill.name})"
+
 
 class Job(models.Model):
     JOB_TYPE_CHOICES = (
@@ -20,13 +65,51 @@ class Job(models.Model):
     job_type = models.CharField(max_length=2, choices=JOB_TYPE_CHOICES)
     domain = models.CharField(max_length=150, help_text="Eg: Web Development, Data Science")
     skills = models.TextField(help_text="Comma separated skills")
+    normalized_skills = models.ManyToManyField(Skill, blank=True, related_name='jobs')
     description = models.TextField()
     posted_on = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
 
+    # Denormalized counters, only ever changed with F() updates (jobs/counters.py)
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
+    saved_count = models.PositiveIntegerField(default=0, editable=False)
+    open_queries_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ('applications_count', 'saved_count', 'open_queries_count')
+
+    class Meta:
+        indexes = [
+            # Newest-first listings (jobs list, cursor pagination).
+            # Partial on is_active: Django renders is_active=True as a bare
+            # column test, which SQLite can't match against a leading column.
+            models.Index(
+                fields=['posted_on', 'id'],
+                condition=models.Q(is_active=True),
+                name='job_active_posted_idx',
+            ),
+            # Facet counts: covering, so GROUP BY never reads the wide rows
+            models.Index(
+                fields=['job_type', 'location', 'domain', 'experience', 'is_active'],
+                condition=models.Q(is_active=True),
+                name='job_active_facets_idx',
+            ),
+            # Consultant's posted jobs
+            models.Index(fields=['posted_by', 'posted_on', 'id'], name='job_owner_posted_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} at {self.company}"
 
+    def save(self, *args, **kwargs):
+        # Saving a job loaded a while ago (edit form, admin) must not write
+        # back counters that have moved since
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class SavedJob(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_jobs')
@@ -56,7 +139,7 @@ class Application(models.Model):
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='applications')
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
-    resume = models.FileField(upload_to='applications/resumes/')
+    resume = models.FileField(upload_to='applications/resumes/', storage=get_resume_storage)
     cover_letter = models.TextField(blank=True)
     applied_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
@@ -65,6 +148,12 @@ class Application(models.Model):
 
     class Meta:
         unique_together = ('user', 'job')
+        indexes = [
+            # Applicants of a job, newest first
+            models.Index(fields=['job', 'applied_at'], name='application_job_applied_idx'),
+            # Shortlisted / rejected applicants across a consultant's jobs
+            models.Index(fields=['job', 'status', 'applied_at'], name='application_job_status_idx'),
+        ]
 
 # Query Models
 from django.db import models
@@ -77,6 +166,12 @@ class JobQuery(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_resolved = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Query queue / threads of a job (open first, newest first)
+            models.Index(fields=['job', 'is_resolved', 'created_at'], name='jobquery_job_resolved_idx'),
+        ]
+
     def __str__(self):
         return f"Query by {self.user.email} on {self.job.title}"
 
@@ -94,3 +189,34 @@ class JobQueryReply(models.Model):
         return f"Reply by {self.user.email} on Query {self.query.id}"
 
 
+
+
+class ThreadEvent(models.Model):
+    """
+    Change to the query threads of a job (new query, reply, resolution),
+    kept for a while so the live streams of every process pick it up
+    (see jobs/live.py).
+    """
+    KIND_CHOICES = (
+        ('query', 'New query'),
+        ('reply', 'Reply'),
+        ('resolved', 'Resolved'),
+        ('reopened', 'Reopened'),
+    )
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='thread_events')
+    query = models.ForeignKey(JobQuery, on_delete=models.CASCADE, related_name='events')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Events of a job after a given id (stream resume)
+            models.Index(fields=['job', 'id'], name='threadevent_job_idx'),
+            # Pruning of old events
+            models.Index(fields=['created_at'], name='threadevent_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} on query {self.query_id}"
@@ -0,0 +1,164 @@
+# jobs/pagination.py
+import base64
+import hashlib
+import json
+from datetime import datetime
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# Job lists paginated by cursor must be ordered newest first
+KEYSET_ORDERING = ('-posted_on', '-id')
+KEYSET_FIELD = 'posted_on'
+
+COUNT_CACHE_TIMEOUT = 60 * 5
+
+
+def encode_cursor(obj, direction, field=KEYSET_FIELD):
+    payload = json.dumps({'p': getattr(obj, field).isoformat(), 'i': obj.pk, 'd': direction})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Returns (timestamp, id, direction), or None for a missing or tampered cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        direction = payload['d'] if payload['d'] in ('next', 'prev') else 'next'
+        return datetime.fromisoformat(payload['p']), int(payload['i']), direction
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def estimated_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """
+    COUNT(*) of a queryset, cached for a few minutes per distinct query.
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+
+    key = 'jobs:count:' + hashlib.md5(repr((sql, params)).encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+class CursorPaginator:
+    """
+    Keyset pagination over (posted_on, id), or (`field`, id), newest first:
+    every page is a single indexed range query with LIMIT, however deep it
+    is, and no COUNT(*) is run unless `count` is asked for (then a cached
+    estimate, unless the exact count was passed in).
+    """
+
+    def __init__(self, queryset, per_page, field=KEYSET_FIELD, count=None):
+        self.field = field
+        self.queryset = queryset.order_by(f'-{field}', '-id')
+        self.per_page = per_page
+        self.count_is_estimate = count is None
+        if count is not None:
+            self.count = count
+
+    @cached_property
+    def count(self):
+        return estimated_count(self.queryset)
+
+    def get_page(self, cursor=None):
+        position = decode_cursor(cursor)
+        return self._page(position, list(self._rows(position)))
+
+    async def aget_page(self, cursor=None):
+        """
+        get_page() for async views (the same single query).
+        """
+        position = decode_cursor(cursor)
+        return self._page(position, [row async for row in self._rows(position)])
+
+    def _rows(self, position):
+        # The rows of a page, plus one telling whether there are more
+        if position is None:
+            return self.queryset[:self.per_page + 1]
+
+        value, row_id, direction = position
+        field = self.field
+        if direction == 'next':
+            return self.queryset.filter(
+                Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': row_id})
+            )[:self.per_page + 1]
+        return self.queryset.filter(
+            Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': row_id})
+        ).order_by(field, 'id')[:self.per_page + 1]
+
+    def _page(self, position, rows):
+        more = len(rows) > self.per_page
+        if position is None:
+            return CursorPage(self, rows[:self.per_page], has_next=more, has_previous=False)
+        if position[2] == 'next':
+            return CursorPage(self, rows[:self.per_page], has_next=more, has_previous=True)
+        return CursorPage(self, rows[:self.per_page][::-1], has_next=True, has_previous=more)
+
+
+class CursorPage:
+    """
+    Page of a CursorPaginator. Mirrors the parts of Django's Page used by
+    the templates, with opaque next/previous cursors instead of numbers.
+    """
+    is_cursor = True
+
+    def __init__(self, paginator, object_list, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return encode_cursor(self.object_list[-1], 'next', self.paginator.field)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return encode_cursor(self.object_list[0], 'prev', self.paginator.field)
+
+
+def paginate_jobs(request, jobs, per_page, count=None):
+    """
+    Paginate a Job queryset: by cursor when it is in newest-first order,
+    otherwise (e.g. relevance ranked search results) by page number.
+    `count`, the number of jobs when already known, saves the COUNT(*).
+    """
+    if tuple(jobs.query.order_by) == KEYSET_ORDERING:
+        return CursorPaginator(jobs, per_page, count=count).get_page(request.GET.get('cursor'))
+    paginator = Paginator(jobs, per_page)
+    if count is not None:
+        # Set before get_page(), which checks the page number against it
+        paginator.count = count
+    return paginator.get_page(request.GET.get('page'))
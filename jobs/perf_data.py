@@ -0,0 +1,385 @@
+# jobs/perf_data.py
+"""
+Deterministic synthetic rows for the seed_perf_data command.
+
+Everything here is plain Python (no ORM), so chunks can be generated in
+worker processes. Every chunk has its own random generator seeded from
+(seed, kind, chunk start): the output is identical whatever the number
+of workers. Primary keys are assigned up front from the plan, so rows of
+one chunk can reference rows of another without a database round trip.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+# Columns of the tuples produced for each table
+FIELDS = {
+    'user': ('id', 'email', 'password', 'role', 'first_name', 'last_name', 'is_active', 'date_joined'),
+    'candidate_profile': (
+        'id', 'user_id', 'first_name', 'last_name', 'phone', 'location',
+        'experience_years', 'skills', 'created_at',
+    ),
+    'consultant_profile': ('user_id', 'first_name', 'last_name', 'company', 'designation', 'created_at'),
+    'subscription': ('user_id', 'plan', 'start_date', 'end_date', 'is_active'),
+    'job': (
+        'id', 'posted_by_id', 'title', 'company', 'location', 'experience', 'job_type',
+        'domain', 'skills', 'description', 'posted_on', 'is_active',
+    ),
+    'application': (
+        'user_id', 'job_id', 'resume', 'cover_letter', 'applied_at', 'status',
+        'meeting_status', 'meeting_datetime',
+    ),
+    'saved_job': ('user_id', 'job_id', 'saved_at'),
+    'job_query': ('id', 'job_id', 'user_id', 'question', 'created_at', 'is_resolved'),
+    'job_query_reply': ('query_id', 'user_id', 'message', 'created_at'),
+    'course': ('id', 'title', 'description', 'created_at'),
+    'enrollment': ('candidate_id', 'course_id', 'applied_at', 'progress', 'completed'),
+    'chatbot_faq': ('question', 'answer', 'keywords'),
+}
+
+# Row counts at scale 1
+DEFAULT_COUNTS = {
+    'jobs': 100_000,
+    'candidates': 50_000,
+    'consultants': 500,
+    'applications': 1_000_000,
+    'saved_jobs': 200_000,
+    'queries': 100_000,
+    'replies': 150_000,
+    'courses': 200,
+    'enrollments': 100_000,
+    'faqs': 500,
+}
+
+FIRST_NAMES = (
+    'Aarav', 'Aditi', 'Arjun', 'Divya', 'Karthik', 'Kavya', 'Lakshmi', 'Meena', 'Nila', 'Pooja',
+    'Priya', 'Rahul', 'Ravi', 'Sanjay', 'Sneha', 'Suresh', 'Tamil', 'Vetri', 'Vikram', 'Yamini',
+)
+LAST_NAMES = (
+    'Balaji', 'Chandran', 'Iyer', 'Krishnan', 'Kumar', 'Menon', 'Nair', 'Natarajan', 'Pillai',
+    'Raman', 'Ramamoorthy', 'Rao', 'Reddy', 'Sharma', 'Subramanian', 'Venkatesh',
+)
+LOCATIONS = (
+    'Chennai', 'Bangalore', 'Hyderabad', 'Pune', 'Mumbai', 'Delhi', 'Noida', 'Gurgaon',
+    'Kochi', 'Coimbatore', 'Madurai', 'Kolkata', 'Ahmedabad', 'Trichy', 'Remote',
+)
+COMPANIES = (
+    'Vetri Consultancy', 'Infosys', 'TCS', 'Wipro', 'Zoho', 'Freshworks', 'HCL', 'Cognizant',
+    'Accenture', 'Capgemini', 'Tech Mahindra', 'Mindtree', 'Chargebee', 'Razorpay', 'Swiggy',
+    'Flipkart', 'Myntra', 'PhonePe', 'Paytm', 'Ola',
+)
+# domain -> (job titles, skill pool)
+DOMAINS = {
+    'Web Development': (
+        ('Python Developer', 'Django Developer', 'Full Stack Developer', 'Frontend Engineer', 'Backend Engineer'),
+        ('Python', 'Django', 'JavaScript', 'React', 'HTML', 'CSS', 'REST APIs', 'PostgreSQL', 'Node.js', 'TypeScript'),
+    ),
+    'Data Science': (
+        ('Data Scientist', 'Data Analyst', 'ML Engineer', 'Data Engineer', 'BI Developer'),
+        ('Python', 'Pandas', 'NumPy', 'Machine Learning', 'SQL', 'Power BI', 'TensorFlow', 'Spark', 'Statistics'),
+    ),
+    'Cloud & DevOps': (
+        ('DevOps Engineer', 'Cloud Engineer', 'Site Reliability Engineer', 'Platform Engineer'),
+        ('AWS', 'Azure', 'Docker', 'Kubernetes', 'Terraform', 'Linux', 'CI/CD', 'Python', 'Bash'),
+    ),
+    'Mobile Development': (
+        ('Android Developer', 'iOS Developer', 'Flutter Developer', 'React Native Developer'),
+        ('Kotlin', 'Java', 'Swift', 'Flutter', 'Dart', 'React Native', 'Firebase', 'REST APIs'),
+    ),
+    'Quality Assurance': (
+        ('QA Engineer', 'Automation Tester', 'SDET', 'Test Lead'),
+        ('Selenium', 'Java', 'Python', 'Cypress', 'JMeter', 'Postman', 'Manual Testing'),
+    ),
+    'Enterprise Software': (
+        ('Java Developer', '.NET Developer', 'SAP Consultant', 'Salesforce Developer'),
+        ('Java', 'Spring Boot', 'C#', '.NET', 'SAP', 'Salesforce', 'Oracle', 'Microservices'),
+    ),
+}
+DOMAIN_NAMES = tuple(DOMAINS)
+SENIORITY = ('', '', 'Junior ', 'Senior ', 'Lead ')
+JOB_TYPES = ('FT', 'FT', 'FT', 'PT', 'RM', 'RM')
+DESIGNATIONS = ('Recruiter', 'Talent Partner', 'HR Manager', 'Hiring Manager')
+QUESTIONS = (
+    'Is this role open to freshers?', 'Is remote work possible?', 'What is the notice period expected?',
+    'What does the interview process look like?', 'Is relocation assistance provided?',
+    'What is the salary range for this role?', 'Which tech stack does the team use?',
+    'Can I apply if I have a career gap?',
+)
+REPLIES = (
+    'Thanks for asking, yes.', 'Please check the job description.', 'We will get back to you shortly.',
+    'Two technical rounds and one HR round.', 'Up to 30 days.', 'Hybrid, three days from office.',
+)
+COURSE_TOPICS = (
+    'Python', 'Django', 'React', 'SQL', 'Machine Learning', 'AWS', 'Docker', 'Interview Skills',
+    'Resume Writing', 'Data Structures', 'System Design', 'Communication',
+)
+FAQ_TOPICS = (
+    ('apply', 'How do I apply for a job?', 'Open the job and click Apply, your profile resume is attached.'),
+    ('resume', 'How do I update my resume?', 'Upload a new resume from your profile page.'),
+    ('subscription', 'What does Pro include?', 'Pro unlocks training courses and priority support.'),
+    ('payment', 'Which payment methods are accepted?', 'Cards, UPI and net banking are accepted.'),
+    ('interview', 'How are interviews scheduled?', 'The consultant schedules a meeting once you are shortlisted.'),
+    ('password', 'I forgot my password.', 'Use the reset link on the login page.'),
+    ('course', 'How do I enroll in a course?', 'Open the course and click Enroll (Pro plan needed).'),
+    ('saved', 'Where are my saved jobs?', 'Saved jobs are listed under Saved Jobs in the menu.'),
+)
+
+
+def build_plan(now, seed=42, scale=1.0, base_ids=None, password='!', **counts):
+    """
+    Everything the generators need: row counts, first primary key of every
+    table with explicit ids, the password hash shared by all users and a
+    fixed 'now' the timestamps are spread back from.
+    """
+    plan_counts = {name: max(int(value * scale), 0) for name, value in DEFAULT_COUNTS.items()}
+    plan_counts.update({name: value for name, value in counts.items() if value is not None})
+    plan_counts['consultants'] = max(plan_counts['consultants'], 1)
+    plan_counts['jobs'] = max(plan_counts['jobs'], 1)
+
+    base_ids = base_ids or {}
+    return {
+        'seed': seed,
+        'now': now.timestamp(),
+        'password': password,
+        'counts': plan_counts,
+        'ids': {
+            name: base_ids.get(name, 1)
+            for name in ('user', 'candidate_profile', 'job', 'job_query', 'course')
+        },
+    }
+
+
+def chunks(total, size):
+    """
+    (start, stop) ranges covering range(total).
+    """
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def share(total, parts, index):
+    """
+    How many of `total` rows part `index` of `parts` gets (even split).
+    """
+    base, extra = divmod(total, parts)
+    return base + (1 if index < extra else 0)
+
+
+def offset(total, parts, index):
+    """
+    Number of rows owned by the parts before `index`.
+    """
+    base, extra = divmod(total, parts)
+    return base * index + min(index, extra)
+
+
+def _rng(plan, kind, start):
+    return random.Random(f"{plan['seed']}:{kind}:{start}")
+
+
+def _time(plan, seconds_ago):
+    return datetime.fromtimestamp(plan['now'] - seconds_ago, tz=timezone.utc)
+
+
+# Jobs are spread over the last year, oldest first, like autoincrement ids
+YEAR = 365 * 24 * 3600
+
+
+def job_posted_ago(plan, index):
+    jobs = plan['counts']['jobs']
+    return YEAR * (jobs - index) / jobs
+
+
+def job_poster(plan, index):
+    """
+    Consultant (user index) who posted job `index`.
+    """
+    return (index * 2654435761) % plan['counts']['consultants']
+
+
+def candidate_user_id(plan, index):
+    return plan['ids']['user'] + plan['counts']['consultants'] + index
+
+
+def _skills(rng, domain):
+    pool = DOMAINS[domain][1]
+    return ', '.join(rng.sample(pool, rng.randint(2, min(6, len(pool)))))
+
+
+# ----------------------------
+# Generators, one chunk each
+# ----------------------------
+def user_rows(plan, start, stop):
+    """
+    Users [start, stop): consultants first, then candidates. Every user gets
+    a candidate profile (like the post_save signal does), consultants a
+    consultant profile and candidates a subscription.
+    """
+    rng = _rng(plan, 'user', start)
+    consultants = plan['counts']['consultants']
+    rows = {'user': [], 'candidate_profile': [], 'consultant_profile': [], 'subscription': []}
+
+    for index in range(start, stop):
+        user_id = plan['ids']['user'] + index
+        role = 'CONSULTANT' if index < consultants else 'CANDIDATE'
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        joined = _time(plan, rng.uniform(0, 2 * YEAR))
+
+        rows['user'].append((
+            user_id, f'{role.lower()}{user_id}@perf.example.com', plan['password'], role,
+            first, last, True, joined,
+        ))
+        if role == 'CONSULTANT':
+            rows['candidate_profile'].append((
+                plan['ids']['candidate_profile'] + index, user_id, '', '', '', '', None, '', joined,
+            ))
+            rows['consultant_profile'].append((
+                user_id, first, last, rng.choice(COMPANIES), rng.choice(DESIGNATIONS), joined,
+            ))
+            continue
+
+        domain = rng.choice(DOMAIN_NAMES)
+        rows['candidate_profile'].append((
+            plan['ids']['candidate_profile'] + index, user_id, first, last,
+            f'9{rng.randrange(10 ** 9):09d}', rng.choice(LOCATIONS),
+            round(rng.choice((0, 0.5, 1, 2, 3, 4, 5, 6, 8, 10, 12)) + 0.0, 1),
+            _skills(rng, domain), joined,
+        ))
+        if rng.random() < 0.1:
+            ends = joined + timedelta(days=30 * rng.randint(1, 12))
+            rows['subscription'].append((user_id, 'PRO', joined, ends, True))
+        else:
+            rows['subscription'].append((user_id, 'FREE', joined, None, True))
+    return rows
+
+
+def job_rows(plan, start, stop):
+    rng = _rng(plan, 'job', start)
+    rows = []
+    for index in range(start, stop):
+        domain = rng.choice(DOMAIN_NAMES)
+        title = rng.choice(SENIORITY) + rng.choice(DOMAINS[domain][0])
+        company = rng.choice(COMPANIES)
+        skills = _skills(rng, domain)
+        rows.append((
+            plan['ids']['job'] + index,
+            plan['ids']['user'] + job_poster(plan, index),
+            title,
+            company,
+            rng.choice(LOCATIONS),
+            rng.choice((0, 1, 1, 2, 2, 3, 3, 4, 5, 6, 8, 10)),
+            rng.choice(JOB_TYPES),
+            domain,
+            skills,
+            f'{company} is hiring a {title} for its {domain.lower()} team. '
+            f'You will work with {skills} on production systems used by thousands of customers.',
+            _time(plan, job_posted_ago(plan, index)),
+            rng.random() < 0.9,
+        ))
+    return {'job': rows}
+
+
+def catalog_rows(plan):
+    """
+    Courses and chatbot FAQs (small tables, generated in one go).
+    """
+    rng = _rng(plan, 'catalog', 0)
+    courses = []
+    for index in range(plan['counts']['courses']):
+        topic = COURSE_TOPICS[index % len(COURSE_TOPICS)]
+        level = ('Foundations', 'Intermediate', 'Advanced', 'Bootcamp')[index // len(COURSE_TOPICS) % 4]
+        courses.append((
+            plan['ids']['course'] + index,
+            f'{topic} {level} {index // (4 * len(COURSE_TOPICS)) + 1}',
+            f'A self-paced {level.lower()} course on {topic}.',
+            _time(plan, rng.uniform(0, YEAR)),
+        ))
+
+    faqs = []
+    for index in range(plan['counts']['faqs']):
+        keyword, question, answer = FAQ_TOPICS[index % len(FAQ_TOPICS)]
+        variant = index // len(FAQ_TOPICS)
+        faqs.append((
+            f'{question} ({variant})' if variant else question,
+            answer,
+            f'{keyword}, {keyword}{variant}' if variant else keyword,
+        ))
+    return {'course': courses, 'chatbot_faq': faqs}
+
+
+def _pick_jobs(rng, jobs, count):
+    """
+    `count` distinct job indexes, skewed towards recent jobs so a few
+    jobs get many applicants (the shape that hurts the applicant views).
+    """
+    count = min(count, jobs)
+    picked = set()
+    while len(picked) < count:
+        picked.add(jobs - 1 - int(jobs * rng.random() ** 2))
+    return sorted(picked)
+
+
+def activity_rows(plan, start, stop):
+    """
+    Applications, saved jobs, queries (with replies) and enrollments of
+    candidates [start, stop).
+    """
+    rng = _rng(plan, 'activity', start)
+    counts = plan['counts']
+    candidates, jobs = counts['candidates'], counts['jobs']
+    rows = {name: [] for name in ('application', 'saved_job', 'job_query', 'job_query_reply', 'enrollment')}
+
+    for index in range(start, stop):
+        user_id = candidate_user_id(plan, index)
+
+        applied = _pick_jobs(rng, jobs, share(counts['applications'], candidates, index))
+        for job in applied:
+            ago = rng.uniform(0, job_posted_ago(plan, job))
+            status = rng.choices(('PENDING', 'SHORTLISTED', 'REJECTED'), (70, 15, 15))[0]
+            meeting = status == 'SHORTLISTED' and rng.random() < 0.5
+            rows['application'].append((
+                user_id, plan['ids']['job'] + job, 'applications/resumes/resume.pdf', '',
+                _time(plan, ago), status,
+                'SCHEDULED' if meeting else 'NOT_SCHEDULED',
+                _time(plan, ago - 7 * 24 * 3600) if meeting else None,
+            ))
+
+        for job in _pick_jobs(rng, jobs, share(counts['saved_jobs'], candidates, index)):
+            rows['saved_job'].append((
+                user_id, plan['ids']['job'] + job, _time(plan, rng.uniform(0, job_posted_ago(plan, job))),
+            ))
+
+        first_query = offset(counts['queries'], candidates, index)
+        for number in range(share(counts['queries'], candidates, index)):
+            query_index = first_query + number
+            job = rng.choice(applied) if applied else rng.randrange(jobs)
+            ago = rng.uniform(0, job_posted_ago(plan, job))
+            query_id = plan['ids']['job_query'] + query_index
+            replies = share(counts['replies'], max(counts['queries'], 1), query_index)
+            rows['job_query'].append((
+                query_id, plan['ids']['job'] + job, user_id, rng.choice(QUESTIONS),
+                _time(plan, ago), replies > 0 and rng.random() < 0.6,
+            ))
+            for reply in range(replies):
+                author = plan['ids']['user'] + job_poster(plan, job) if reply % 2 == 0 else user_id
+                ago = max(ago - rng.uniform(0, 3 * 24 * 3600), 0)
+                rows['job_query_reply'].append((query_id, author, rng.choice(REPLIES), _time(plan, ago)))
+
+        courses = counts['courses']
+        if courses:
+            for course in rng.sample(range(courses), min(share(counts['enrollments'], candidates, index), courses)):
+                progress = rng.choice((0, 10, 25, 50, 75, 100))
+                rows['enrollment'].append((
+                    plan['ids']['candidate_profile'] + counts['consultants'] + index,
+                    plan['ids']['course'] + course,
+                    _time(plan, rng.uniform(0, YEAR)),
+                    progress,
+                    progress == 100,
+                ))
+    return rows
+
+
+def generate(task):
+    """
+    Process pool entry point: task is (kind, plan, start, stop).
+    """
+    kind, plan, start, stop = task
+    return {'user': user_rows, 'job': job_rows, 'activity': activity_rows}[kind](plan, start, stop)
@@ -0,0 +1,452 @@
+# jobs/recommendations.py
+import re
+import threading
+
+import numpy as np
+from django.core.cache import cache
+
+from config.cache import bump_version, current_version
+
+from .skills import load_aliases, normalize_skills, split_skills
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Title and skills count more than the description
+FIELD_WEIGHTS = {
+    'title': 3,
+    'skills': 3,
+    'domain': 2,
+    'description': 1,
+}
+
+# Rebuild from scratch once this share of matrix rows are stale
+MAX_STALE_RATIO = 0.25
+
+VERSION_CACHE_KEY = 'jobs:recommender:version'
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+
+def tokenize(text):
+    return [token.rstrip('.') for token in TOKEN_RE.findall((text or '').lower())]
+
+
+def job_terms(job, aliases=None):
+    """
+    Weighted term frequencies of a job: {term: tf}.
+    """
+    counts = {}
+    fields = {
+        'title': job.title,
+        'skills': ' '.join(normalize_skills(split_skills(job.skills), aliases)),
+        'domain': job.domain,
+        'description': job.description,
+    }
+    for field, text in fields.items():
+        weight = FIELD_WEIGHTS[field]
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + weight
+    return counts
+
+
+def profile_terms(profile):
+    """
+    Query terms of a candidate profile, taken from its normalized skills.
+    """
+    names = profile.normalized_skills.values_list('name', flat=True) if profile.skills else []
+    return {token for name in names for token in tokenize(name)}
+
+
+class JobRecommender:
+    """
+    In-memory BM25 index of active jobs.
+
+    Jobs are rows of a sparse matrix holding the document side of BM25,
+    stored column-major (CSC: col_ptr / rows / data arrays) so a profile
+    only touches the postings of its own terms. All jobs are scored at
+    once with one vectorized gather + bincount.
+
+    Updates are incremental: a changed job is appended to a small delta
+    block and its old row is marked stale. The matrix is rebuilt from
+    scratch only when the delta or the stale rows grow too large.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = None
+        self._reset()
+
+    def _reset(self):
+        self.vocabulary = {}          # term -> column
+        self.doc_freq = []            # column -> number of live jobs containing it
+        self.job_rows = {}            # job id -> live row
+        self.row_job_ids = []         # row -> job id
+        self.row_terms = []           # row -> {column: tf}
+        self.total_length = 0.0
+        self._matrix = None
+        self._delta = None
+
+    # ----------------------------
+    # Building
+    # ----------------------------
+    def build(self, jobs):
+        aliases = load_aliases()
+        with self._lock:
+            self._reset()
+            for job in jobs:
+                self._add(job, aliases)
+            self._build_matrix()
+
+    def _add(self, job, aliases=None):
+        terms = job_terms(job, aliases)
+        columns = {}
+        for term, tf in terms.items():
+            column = self.vocabulary.get(term)
+            if column is None:
+                column = self.vocabulary[term] = len(self.doc_freq)
+                self.doc_freq.append(0)
+            self.doc_freq[column] += 1
+            columns[column] = tf
+
+        row = len(self.row_job_ids)
+        self.job_rows[job.pk] = row
+        self.row_job_ids.append(job.pk)
+        self.row_terms.append(columns)
+        self.total_length += sum(columns.values())
+
+        if self._matrix is not None:
+            self._append_delta(row, columns)
+
+    def _remove(self, job_id):
+        row = self.job_rows.pop(job_id, None)
+        if row is None:
+            return
+        columns = self.row_terms[row]
+        for column in columns:
+            self.doc_freq[column] -= 1
+        self.total_length -= sum(columns.values())
+        self.row_terms[row] = {}
+
+        if self._matrix is not None and row < len(self._matrix['alive']):
+            self._matrix['alive'][row] = False
+
+    # ----------------------------
+    # Incremental updates
+    # ----------------------------
+    def update_job(self, job):
+        """
+        Re-index a created or edited job; inactive jobs are dropped.
+        """
+        with self._lock:
+            self._remove(job.pk)
+            if job.is_active:
+                self._add(job)
+
+    def remove_job(self, job_id):
+        with self._lock:
+            self._remove(job_id)
+
+    @property
+    def size(self):
+        return len(self.job_rows)
+
+    # ----------------------------
+    # Matrix
+    # ----------------------------
+    def _bm25_doc_weights(self, tf, doc_length, avg_length):
+        # Document side of BM25: tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+        return tf * (K1 + 1) / (tf + K1 * (1 - B + B * doc_length / avg_length))
+
+    def _compact(self):
+        alive = [row for row, job_id in enumerate(self.row_job_ids) if self.job_rows.get(job_id) == row]
+        self.row_job_ids = [self.row_job_ids[row] for row in alive]
+        self.row_terms = [self.row_terms[row] for row in alive]
+        self.job_rows = {job_id: row for row, job_id in enumerate(self.row_job_ids)}
+
+    def _build_matrix(self):
+        self._compact()
+
+        n_rows = len(self.row_job_ids)
+        n_columns = len(self.doc_freq)
+        avg_length = (self.total_length / n_rows) if n_rows else 1.0
+
+        lengths = np.fromiter((len(terms) for terms in self.row_terms), dtype=np.int64, count=n_rows)
+        nnz = int(lengths.sum())
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64), lengths)
+        columns = np.fromiter(
+            (column for terms in self.row_terms for column in terms), dtype=np.int64, count=nnz
+        )
+        tf = np.fromiter(
+            (value for terms in self.row_terms for value in terms.values()), dtype=np.float64, count=nnz
+        )
+        doc_length = np.fromiter(
+            (sum(terms.values()) for terms in self.row_terms), dtype=np.float64, count=n_rows
+        )
+        data = self._bm25_doc_weights(tf, doc_length[rows], avg_length)
+
+        # Row-major -> column-major
+        order = np.argsort(columns, kind='stable')
+        col_ptr = np.zeros(n_columns + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=n_columns), out=col_ptr[1:])
+
+        self._matrix = {
+            'col_ptr': col_ptr,
+            'rows': rows[order],
+            'data': data[order],
+            'avg_length': avg_length,
+            'base_rows': n_rows,
+            'job_ids': np.asarray(self.row_job_ids, dtype=np.int64),
+            'alive': np.ones(n_rows, dtype=bool),
+        }
+        self._delta = {'rows': [], 'columns': [], 'data': []}
+        return self._matrix
+
+    def _append_delta(self, row, columns):
+        matrix = self._matrix
+        doc_length = sum(columns.values())
+        for column, tf in columns.items():
+            self._delta['rows'].append(row)
+            self._delta['columns'].append(column)
+            self._delta['data'].append(self._bm25_doc_weights(tf, doc_length, matrix['avg_length']))
+
+        matrix['job_ids'] = np.append(matrix['job_ids'], self.row_job_ids[row])
+        matrix['alive'] = np.append(matrix['alive'], True)
+
+    def _needs_rebuild(self):
+        if self._matrix is None:
+            return True
+        n_rows = len(self._matrix['alive'])
+        stale = n_rows - len(self.job_rows)
+        delta_rows = n_rows - self._matrix['base_rows']
+        return stale > MAX_STALE_RATIO * n_rows or delta_rows > MAX_STALE_RATIO * n_rows
+
+    def _idf(self, columns):
+        df = np.asarray([self.doc_freq[column] for column in columns], dtype=np.float64)
+        n = max(len(self.job_rows), 1)
+        return np.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    # ----------------------------
+    # Scoring
+    # ----------------------------
+    def score(self, terms):
+        """
+        BM25 score of every live job for the given query terms.
+        Returns (job_ids, scores) arrays.
+        """
+        with self._lock:
+            if self._needs_rebuild():
+                self._build_matrix()
+            matrix = self._matrix
+
+            columns = sorted({self.vocabulary[term] for term in terms if term in self.vocabulary})
+            n_rows = len(matrix['job_ids'])
+            if not columns or not n_rows:
+                return matrix['job_ids'][:0], np.zeros(0)
+
+            idf = dict(zip(columns, self._idf(columns)))
+
+            # Postings of the query terms in the main block
+            col_ptr = matrix['col_ptr']
+            slices = [
+                (col_ptr[column], col_ptr[column + 1], idf[column])
+                for column in columns if column + 1 < len(col_ptr)
+            ]
+            rows = [matrix['rows'][start:end] for start, end, _ in slices]
+            weights = [matrix['data'][start:end] * weight for start, end, weight in slices]
+
+            # ... and in the delta block
+            if self._delta['rows']:
+                delta_columns = np.asarray(self._delta['columns'])
+                delta_idf = np.zeros(len(self.doc_freq))
+                delta_idf[columns] = [idf[column] for column in columns]
+                rows.append(np.asarray(self._delta['rows'], dtype=np.int64))
+                weights.append(np.asarray(self._delta['data']) * delta_idf[delta_columns])
+
+            if not rows:
+                return matrix['job_ids'][:0], np.zeros(0)
+
+            scores = np.bincount(
+                np.concatenate(rows),
+                weights=np.concatenate(weights),
+                minlength=n_rows,
+            )
+            scores[~matrix['alive']] = 0.0
+            return matrix['job_ids'], scores
+
+    def recommend(self, terms, exclude=(), limit=50):
+        """
+        Top `limit` job ids by relevance, best first, skipping `exclude`.
+        """
+        job_ids, scores = self.score(terms)
+        if not len(scores):
+            return []
+
+        if exclude:
+            scores[np.isin(job_ids, list(exclude))] = 0.0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+
+        # Highest score first, newest job first on ties
+        order = np.lexsort((-job_ids[candidates], -scores[candidates]))
+        return [int(job_id) for job_id in job_ids[candidates[order]]]
+
+
+# ----------------------------
+# Process-wide instance
+# ----------------------------
+_recommender = None
+_recommender_lock = threading.Lock()
+
+
+def get_recommender():
+    """
+    Shared recommender, built from the active jobs on first use and rebuilt
+    when another process has changed jobs (tracked with a cache version).
+    """
+    global _recommender
+    from .models import Job
+
+    version = current_version(VERSION_CACHE_KEY)
+    with _recommender_lock:
+        if _recommender is None or _recommender.version != version:
+            recommender = JobRecommender()
+            recommender.build(
+                Job.objects.filter(is_active=True)
+                .only('id', 'title', 'skills', 'domain', 'description')
+                .iterator(chunk_size=2000)
+            )
+            recommender.version = version
+            _recommender = recommender
+        return _recommender
+
+
+def _apply(update):
+    with _recommender_lock:
+        version = bump_version(VERSION_CACHE_KEY)
+        # Patched in place only when this bump directly follows the version
+        # the index is up to date with; if another process bumped in
+        # between, its change is missing here and the next lookup rebuilds
+        if _recommender is not None and _recommender.version == version - 1:
+            update(_recommender)
+            _recommender.version = version
+
+
+def invalidate_recommender():
+    """
+    Rebuild the index on next use, in every process (after bulk writes
+    that send no signals).
+    """
+    bump_version(VERSION_CACHE_KEY)
+
+
+def job_changed(job):
+    """
+    Apply a created, edited or deactivated job to the loaded index.
+    """
+    _apply(lambda recommender: recommender.update_job(job))
+
+
+def job_deleted(job_id):
+    _apply(lambda recommender: recommender.remove_job(job_id))
+
+
+def recommend_job_ids(profile, exclude=(), limit=50):
+    terms = profile_terms(profile)
+    if not terms:
+        return []
+    return get_recommender().recommend(terms, exclude=exclude, limit=limit)
+
+
+# ----------------------------
+# Per-candidate cache
+# ----------------------------
+# Ordered recommended job ids per candidate. An entry is dropped when
+# the candidate applies somewhere, when a job sharing terms with their
+# skills changes, and ignored when their skills or experience change.
+CACHE_KEY_PREFIX = 'jobs:recommended:'
+CACHE_TIMEOUT = 60 * 60 * 24
+CACHE_HITS_KEY = 'jobs:recommended:stats:hits'
+CACHE_MISSES_KEY = 'jobs:recommended:stats:misses'
+
+
+def recommendation_cache_key(user_id):
+    return f'{CACHE_KEY_PREFIX}{user_id}'
+
+
+def profile_fingerprint(profile):
+    return (profile.skills or '', str(profile.experience_years))
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def cached_recommend_job_ids(profile, exclude=(), limit=50):
+    """
+    recommend_job_ids() served from the per-candidate cache when possible.
+    `exclude` must be the candidate's applied job ids.
+    """
+    key = recommendation_cache_key(profile.user_id)
+    fingerprint = profile_fingerprint(profile)
+
+    entry = cache.get(key)
+    if entry and entry['fingerprint'] == fingerprint and entry['limit'] == limit:
+        _count(CACHE_HITS_KEY)
+        return entry['job_ids']
+
+    _count(CACHE_MISSES_KEY)
+    job_ids = recommend_job_ids(profile, exclude=exclude, limit=limit)
+    cache.set(key, {'fingerprint': fingerprint, 'limit': limit, 'job_ids': job_ids}, CACHE_TIMEOUT)
+    return job_ids
+
+
+def invalidate_recommendations(user_ids):
+    cache.delete_many([recommendation_cache_key(user_id) for user_id in user_ids])
+
+
+def candidates_affected_by(terms):
+    """
+    User ids of candidates having a skill that shares a word with `terms`,
+    i.e. the only candidates whose recommendations a job with these terms
+    can change.
+    """
+    from profiles.models import CandidateProfile
+
+    terms = set(terms)
+    if not terms:
+        return []
+
+    through = CandidateProfile.normalized_skills.through
+    return list(
+        through.objects.filter(skill__words__word__in=terms)
+        .values_list('candidateprofile__user_id', flat=True)
+        .distinct()
+    )
+
+
+def invalidate_for_job_terms(terms):
+    invalidate_recommendations(candidates_affected_by(terms))
+
+
+def recommendation_cache_stats():
+    hits = cache.get(CACHE_HITS_KEY, 0)
+    misses = cache.get(CACHE_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': (hits / total) if total else 0.0,
+    }
+
+
+def reset_recommendation_cache_stats():
+    cache.delete_many([CACHE_HITS_KEY, CACHE_MISSES_KEY])
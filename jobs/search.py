@@ -0,0 +1,128 @@
+# jobs/search.py
+import re
+
+from django.db import connection
+
+# SQLite FTS5 index over the searchable Job columns.
+# The rowid of every index row is the Job id.
+FTS_TABLE = 'jobs_job_fts'
+FTS_COLUMNS = ('title', 'company', 'location', 'domain', 'skills', 'description')
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def _job_row(job):
+    return [job.pk] + [getattr(job, column) or '' for column in FTS_COLUMNS]
+
+
+# ----------------------------
+# Keeping the index in sync
+# ----------------------------
+def index_jobs(jobs):
+    """
+    Insert or replace the index rows of the given Job instances.
+    """
+    if not fts_available():
+        return
+
+    rows = [_job_row(job) for job in jobs]
+    if not rows:
+        return
+
+    placeholders = ', '.join(['%s'] * (len(FTS_COLUMNS) + 1))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+            [[row[0]] for row in rows]
+        )
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) "
+            f"VALUES ({placeholders})",
+            rows
+        )
+
+
+def index_job(job):
+    index_jobs([job])
+
+
+def unindex_job(job_id):
+    if not fts_available():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [job_id])
+
+
+def clear_index():
+    if not fts_available():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+
+def optimize_index():
+    if not fts_available():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+
+# ----------------------------
+# Querying
+# ----------------------------
+def build_match_expression(**filters):
+    """
+    Turn column filters into an FTS5 MATCH expression.
+
+    Every word of a filter value must appear (as a word prefix) in that
+    column, e.g. location="new del" -> location : ("new"* AND "del"*).
+    Returns an empty string when no filter has any searchable words.
+    """
+    clauses = []
+    for column, value in filters.items():
+        if column not in FTS_COLUMNS or not value:
+            continue
+
+        tokens = TOKEN_RE.findall(str(value).lower())
+        if not tokens:
+            continue
+
+        terms = ' AND '.join(f'"{token}"*' for token in tokens)
+        clauses.append(f'{column} : ({terms})')
+
+    return ' AND '.join(clauses)
+
+
+def search_jobs(queryset, **filters):
+    """
+    Restrict a Job queryset to rows matching the text filters,
+    ordered by relevance (best match first).
+
+    Falls back to icontains lookups on databases without FTS5.
+    """
+    filters = {column: value for column, value in filters.items() if value}
+    if not filters:
+        return queryset
+
+    if not fts_available():
+        for column, value in filters.items():
+            queryset = queryset.filter(**{f'{column}__icontains': value})
+        return queryset
+
+    expression = build_match_expression(**filters)
+    if not expression:
+        return queryset.none()
+
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = jobs_job.id', f'{FTS_TABLE} MATCH %s'],
+        params=[expression],
+        select={'search_rank': f'{FTS_TABLE}.rank'},
+    ).order_by('search_rank', '-posted_on')
@@ -0,0 +1,307 @@
+# jobs/server_benchmark.py
+"""
+Concurrency benchmark of the read-heavy JSON endpoints: the sync views
+served by the WSGI application (config.wsgi) from a pool of worker
+threads, as a threaded WSGI server does, against their async variants
+served by the ASGI application (config.asgi) on one event loop, with the
+same number of requests in flight.
+
+Reports throughput, latency, the peak number of threads and the peak
+Python memory of each. Requests are made in process, without sockets, so
+only the cost of the Django stack is measured.
+"""
+import asyncio
+import io
+import json
+import random
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from accounts.models import User
+from .benchmark import CHATBOT_MESSAGES, FILTERS, percentile
+
+# endpoint -> (sync route, async route, method)
+ENDPOINTS = {
+    'chatbot_reply': ('chatbot:reply', 'chatbot:reply_async', 'POST'),
+    'chatbot_ask': ('chatbot:ask', 'chatbot:ask_async', 'POST'),
+    'chatbot_greeting': ('chatbot:greeting', 'chatbot:greeting_async', 'GET'),
+    'jobs_json': ('jobs:jobs_list_json', 'jobs:jobs_list_json_async', 'GET'),
+}
+
+SERVERS = ('wsgi', 'asgi')
+HOST = 'testserver'
+
+# How often the thread count is sampled while a run is in progress
+THREAD_SAMPLE_SECONDS = 0.002
+
+
+class Request:
+    def __init__(self, endpoint, method, paths, query_string=b'', body=b'', cookie=b''):
+        self.endpoint = endpoint
+        self.method = method
+        self.paths = paths  # server -> path
+        self.query_string = query_string
+        self.body = body
+        self.cookie = cookie
+
+
+def build_requests(endpoints, cookies, rng):
+    requests = []
+    for endpoint in endpoints:
+        sync_route, async_route, method = ENDPOINTS[endpoint]
+        body = query_string = b''
+        if method == 'POST':
+            body = json.dumps({'message': rng.choice(CHATBOT_MESSAGES)}).encode()
+        elif endpoint == 'jobs_json' and rng.random() < 0.5:
+            query_string = urlencode(rng.choice(FILTERS)).encode()
+        requests.append(Request(
+            endpoint, method, {'wsgi': reverse(sync_route), 'asgi': reverse(async_route)},
+            query_string, body, rng.choice(cookies),
+        ))
+    return requests
+
+
+# ----------------------------
+# In-process servers
+# ----------------------------
+def call_wsgi(application, request):
+    environ = {
+        'REQUEST_METHOD': request.method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': request.paths['wsgi'],
+        'QUERY_STRING': request.query_string.decode(),
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(request.body)),
+        'HTTP_HOST': HOST,
+        'HTTP_COOKIE': request.cookie.decode(),
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(request.body),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    status = []
+    result = application(environ, lambda line, headers, exc_info=None: status.append(line))
+    try:
+        for _ in result:
+            pass
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return int(status[0].split()[0])
+
+
+async def call_asgi(application, request):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': request.method,
+        'scheme': 'http',
+        'path': request.paths['asgi'],
+        'raw_path': request.paths['asgi'].encode(),
+        'query_string': request.query_string,
+        'root_path': '',
+        'headers': [
+            (b'host', HOST.encode()),
+            (b'cookie', request.cookie),
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(request.body)).encode()),
+        ],
+        'client': ('127.0.0.1', 0),
+        'server': (HOST, 80),
+    }
+    done = asyncio.Event()
+    messages = [{'type': 'http.request', 'body': request.body, 'more_body': False}]
+    status = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # Connection stays open until the response is sent
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+        elif not message.get('more_body'):
+            done.set()
+
+    await application(scope, receive, send)
+    done.set()
+    return status[0]
+
+
+def check(request, status):
+    if status >= 400:
+        raise RuntimeError(f"{request.method} {request.paths} returned {status}")
+
+
+def run_wsgi(application, requests, concurrency):
+    """
+    (seconds, [(endpoint, seconds), ...]) of serving `requests` from a
+    pool of `concurrency` threads.
+    """
+    def serve(request):
+        start = time.perf_counter()
+        check(request, call_wsgi(application, request))
+        return request.endpoint, time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = list(pool.map(serve, requests))
+    return time.perf_counter() - started, timings
+
+
+def run_asgi(application, requests, concurrency):
+    """
+    run_wsgi() for the ASGI application: `concurrency` requests in flight
+    on one event loop.
+    """
+    async def serve_all():
+        pending = iter(requests)
+        timings = []
+
+        async def worker():
+            for request in pending:
+                start = time.perf_counter()
+                check(request, await call_asgi(application, request))
+                timings.append((request.endpoint, time.perf_counter() - start))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started, timings
+
+    return asyncio.run(serve_all())
+
+
+class ThreadSampler:
+    """
+    Highest number of live threads while in use (sampled).
+    """
+
+    def __enter__(self):
+        self.peak = threading.active_count()
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def sample(self):
+        while self.running:
+            # Not counting the sampler itself
+            self.peak = max(self.peak, threading.active_count() - 1)
+            time.sleep(THREAD_SAMPLE_SECONDS)
+
+    def __exit__(self, *exc_info):
+        self.running = False
+        self.thread.join()
+
+
+def measure(server, application, requests, concurrency):
+    runner = run_wsgi if server == 'wsgi' else run_asgi
+
+    # Timed run, then the same load again with allocations traced (which
+    # slows both servers down alike)
+    with ThreadSampler() as threads:
+        seconds, timings = runner(application, requests, concurrency)
+    tracemalloc.start()
+    try:
+        runner(application, requests, concurrency)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = [elapsed * 1000 for _, elapsed in timings]
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        measured = [elapsed * 1000 for name, elapsed in timings if name == endpoint]
+        if measured:
+            endpoints[endpoint] = {
+                'requests': len(measured),
+                'p50_ms': round(percentile(measured, 50), 3),
+                'p95_ms': round(percentile(measured, 95), 3),
+            }
+    return {
+        'requests': len(timings),
+        'seconds': round(seconds, 3),
+        'requests_per_second': round(len(timings) / seconds, 1) if seconds else 0.0,
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'peak_threads': threads.peak,
+        'peak_memory_kb': round(peak_memory / 1024, 1),
+        'endpoints': endpoints,
+    }
+
+
+def run(requests=500, concurrency=50, users=10, warmup=2, seed=42, servers=SERVERS):
+    """
+    Serve the same `requests` requests (a uniform mix of ENDPOINTS, as
+    logged-in candidates) through each of `servers` with `concurrency`
+    requests in flight, after `warmup` requests per endpoint. The endpoints only read, so the database is left
+    as it was apart from the sessions, which are deleted afterwards.
+    """
+    from config.asgi import application as asgi_application
+    from config.wsgi import application as wsgi_application
+
+    applications = {'wsgi': wsgi_application, 'asgi': asgi_application}
+    rng = random.Random(seed)
+
+    candidates = list(
+        User.objects.filter(role='CANDIDATE', is_active=True).order_by('id').values_list('id', flat=True)[:1000]
+    )
+    if not candidates:
+        raise ValueError("The database needs candidates (see manage.py seed_perf_data).")
+
+    clients = []
+    for user in User.objects.filter(pk__in=rng.sample(candidates, min(users, len(candidates)))):
+        client = Client()
+        client.force_login(user)
+        clients.append(client)
+    cookies = [
+        f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}".encode()
+        for client in clients
+    ]
+
+    try:
+        # Unmeasured requests to every endpoint first (FAQ matcher built,
+        # lazy imports and URL resolvers loaded)
+        warmup_requests = build_requests([endpoint for endpoint in ENDPOINTS for _ in range(warmup)], cookies, rng)
+        for server in servers:
+            runner = run_wsgi if server == 'wsgi' else run_asgi
+            runner(applications[server], warmup_requests, 1)
+
+        load = build_requests(rng.choices(list(ENDPOINTS), k=requests), cookies, rng)
+        results = {server: measure(server, applications[server], load, concurrency) for server in servers}
+    finally:
+        for client in clients:
+            client.logout()
+
+    return {
+        'meta': {
+            'requests': requests,
+            'concurrency': concurrency,
+            'users': len(cookies),
+            'seed': seed,
+            'vendor': connection.vendor,
+        },
+        'servers': results,
+    }
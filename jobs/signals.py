@@ -0,0 +1,271 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from profiles.models import CandidateProfile
+from profiles.resume_index import queue_candidates
+from profiles.resumes import acquire, release
+from .counters import adjust_counter, deleted_with_job
+from .dashboard import invalidate_dashboard, invalidate_dashboard_for_jobs
+from .facets import invalidate_facets
+from .live import author_name, publish, publish_reply
+from .models import Application, Job, JobQuery, JobQueryReply, SavedJob, Skill
+from .recommendations import (
+    invalidate_for_job_terms,
+    invalidate_recommendations,
+    job_changed,
+    job_deleted,
+    job_terms,
+)
+from .search import index_job, unindex_job
+from .skills import add_skill_words, sync_skills
+
+
+@receiver(post_save, sender=Job)
+def update_job_search_index(sender, instance, **kwargs):
+    index_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_from_search_index(sender, instance, **kwargs):
+    unindex_job(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+def update_job_recommendations(sender, instance, **kwargs):
+    transaction.on_commit(lambda: job_changed(instance))
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_from_recommendations(sender, instance, **kwargs):
+    job_id = instance.pk
+    transaction.on_commit(lambda: job_deleted(job_id))
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_facets(sender, **kwargs):
+    transaction.on_commit(invalidate_facets)
+
+
+# ----------------------------
+# Per-candidate recommendation cache
+# ----------------------------
+@receiver(pre_save, sender=Job)
+def remember_old_job_terms(sender, instance, raw=False, **kwargs):
+    old = None
+    if instance.pk and not raw:
+        old = Job.objects.filter(pk=instance.pk).only('title', 'skills', 'domain', 'description').first()
+    instance._old_terms = set(job_terms(old)) if old else set()
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_recommendations(sender, instance, **kwargs):
+    terms = set(job_terms(instance)) | getattr(instance, '_old_terms', set())
+    transaction.on_commit(lambda: invalidate_for_job_terms(terms))
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_applicant_recommendations(sender, instance, created=True, **kwargs):
+    if created:
+        user_id = instance.user_id
+        transaction.on_commit(lambda: invalidate_recommendations([user_id]))
+
+
+# ----------------------------
+# Normalized skills
+# ----------------------------
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=CandidateProfile)
+def update_normalized_skills(sender, instance, created, raw=False, **kwargs):
+    if raw or (created and not instance.skills):
+        return
+    sync_skills(instance)
+
+
+@receiver(post_save, sender=Skill)
+def update_skill_words(sender, instance, created, raw=False, **kwargs):
+    # Skills are created in bulk (get_skill_ids); this covers admin edits
+    if raw:
+        return
+    if not created:
+        instance.words.all().delete()
+    add_skill_words([(instance.pk, instance.name)])
+
+
+# ----------------------------
+# Job counters
+# ----------------------------
+@receiver(post_save, sender=Application)
+@receiver(post_save, sender=SavedJob)
+def count_added_row(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        field = 'applications_count' if sender is Application else 'saved_count'
+        adjust_counter(instance.job_id, field, 1)
+
+
+@receiver(post_delete, sender=Application)
+@receiver(post_delete, sender=SavedJob)
+def count_removed_row(sender, instance, origin=None, **kwargs):
+    if not deleted_with_job(origin):
+        field = 'applications_count' if sender is Application else 'saved_count'
+        adjust_counter(instance.job_id, field, -1)
+
+
+@receiver(pre_save, sender=JobQuery)
+def remember_query_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    was_resolved = None
+    if instance.pk and not raw and (update_fields is None or 'is_resolved' in update_fields):
+        was_resolved = JobQuery.objects.filter(pk=instance.pk).values_list('is_resolved', flat=True).first()
+    instance._was_resolved = was_resolved
+
+
+@receiver(post_save, sender=JobQuery)
+def count_open_query(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        if not instance.is_resolved:
+            adjust_counter(instance.job_id, 'open_queries_count', 1)
+        return
+    was_resolved = getattr(instance, '_was_resolved', None)
+    if was_resolved is not None and was_resolved != instance.is_resolved:
+        adjust_counter(instance.job_id, 'open_queries_count', 1 if was_resolved else -1)
+
+
+@receiver(post_delete, sender=JobQuery)
+def count_closed_query(sender, instance, origin=None, **kwargs):
+    if not instance.is_resolved and not deleted_with_job(origin):
+        adjust_counter(instance.job_id, 'open_queries_count', -1)
+
+
+# ----------------------------
+# Consultant dashboard stats
+# ----------------------------
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_owner_dashboard(sender, instance, **kwargs):
+    owner_id = instance.posted_by_id
+    transaction.on_commit(lambda: invalidate_dashboard([owner_id]))
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=JobQuery)
+@receiver(post_delete, sender=JobQuery)
+def invalidate_job_owner_dashboard(sender, instance, origin=None, **kwargs):
+    if deleted_with_job(origin):
+        return
+    if sender.job.is_cached(instance):
+        owner_id = instance.job.posted_by_id
+        transaction.on_commit(lambda: invalidate_dashboard([owner_id]))
+    else:
+        job_id = instance.job_id
+        transaction.on_commit(lambda: invalidate_dashboard_for_jobs([job_id]))
+
+
+# ----------------------------
+# Resume blob references
+# ----------------------------
+@receiver(pre_save, sender=CandidateProfile)
+@receiver(pre_save, sender=Application)
+def remember_old_resume(sender, instance, raw=False, update_fields=None, **kwargs):
+    # None when the resume can't have changed (new row, or not saved)
+    old = None
+    if instance.pk and not raw and (update_fields is None or 'resume' in update_fields):
+        old = sender.objects.filter(pk=instance.pk).values_list('resume', flat=True).first() or ''
+    instance._old_resume = old
+    # A new upload, gone from the field once stored: kept for acquire()
+    resume = instance.resume
+    instance._resume_upload = None if raw or resume._committed else resume.file
+
+
+@receiver(post_save, sender=CandidateProfile)
+@receiver(post_save, sender=Application)
+def count_resume_reference(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new = instance.resume.name or ''
+    if created:
+        acquire(new, getattr(instance, '_resume_upload', None))
+        return
+    old = getattr(instance, '_old_resume', None)
+    if old is not None and old != new:
+        acquire(new, getattr(instance, '_resume_upload', None))
+        release(old)
+
+
+@receiver(post_delete, sender=CandidateProfile)
+@receiver(post_delete, sender=Application)
+def release_resume_reference(sender, instance, **kwargs):
+    release(instance.resume.name)
+
+
+# ----------------------------
+# Resume search index
+# ----------------------------
+@receiver(post_save, sender=CandidateProfile)
+@receiver(post_save, sender=Application)
+def queue_resume_indexing(sender, instance, created, raw=False, **kwargs):
+    # Only queued here: `manage.py index_resumes` extracts and indexes
+    if raw:
+        return
+    old = '' if created else getattr(instance, '_old_resume', None)
+    if old is not None and old != (instance.resume.name or ''):
+        queue_candidates([instance.user_id])
+
+
+def deleted_with_user(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is get_user_model()
+
+
+@receiver(post_delete, sender=CandidateProfile)
+@receiver(post_delete, sender=Application)
+def queue_resume_unindexing(sender, instance, origin=None, **kwargs):
+    # Rows going with their job or user are queued all at once (below)
+    if instance.resume.name and not deleted_with_job(origin) and not deleted_with_user(origin):
+        queue_candidates([instance.user_id])
+
+
+@receiver(pre_delete, sender=Job)
+def queue_applicants_unindexing(sender, instance, **kwargs):
+    queue_candidates(
+        Application.objects.filter(job=instance).exclude(resume='').values_list('user_id', flat=True)
+    )
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def queue_user_unindexing(sender, instance, **kwargs):
+    queue_candidates([instance.pk])
+
+
+# ----------------------------
+# Live thread events
+# ----------------------------
+@receiver(post_save, sender=JobQuery)
+def publish_query_event(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        publish(
+            'query', instance,
+            author=author_name(instance.user),
+            question=instance.question,
+            created_at=instance.created_at.isoformat(),
+        )
+        return
+    was_resolved = getattr(instance, '_was_resolved', None)
+    if was_resolved is not None and was_resolved != instance.is_resolved:
+        publish('resolved' if instance.is_resolved else 'reopened', instance)
+
+
+@receiver(post_save, sender=JobQueryReply)
+def publish_reply_event(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish_reply(instance)
@@ -0,0 +1,219 @@
+# jobs/skills.py
+import re
+
+from django.db import connection, transaction
+
+# Built-in synonyms. Admins can add more through SkillAlias.
+DEFAULT_ALIASES = {
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'k8s': 'kubernetes',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'dl': 'deep learning',
+    'c sharp': 'c#',
+    'csharp': 'c#',
+    'cpp': 'c++',
+    'aws cloud': 'aws',
+    'amazon web services': 'aws',
+    'gcp': 'google cloud',
+}
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def split_skills(text):
+    """
+    Split a comma separated skills string into cleaned names.
+    """
+    if not text:
+        return []
+    return [clean_skill_name(s) for s in text.split(',') if s.strip()]
+
+
+def clean_skill_name(name):
+    return WHITESPACE_RE.sub(' ', name.strip().lower())[:100]
+
+
+def load_aliases(names=None):
+    """
+    Alias map (alias -> canonical name): built-in defaults plus SkillAlias rows.
+    """
+    from .models import SkillAlias
+
+    aliases = dict(DEFAULT_ALIASES)
+    rows = SkillAlias.objects.all()
+    if names is not None:
+        rows = rows.filter(alias__in=names)
+    aliases.update(rows.values_list('alias', 'skill__name'))
+    return aliases
+
+
+def normalize_skills(names, aliases=None):
+    """
+    Resolve cleaned names to canonical skill names, keeping order and
+    dropping duplicates, e.g. ["JS", "javascript", "py"] -> ["javascript", "python"].
+    """
+    if aliases is None:
+        aliases = load_aliases(names)
+
+    normalized = []
+    for name in names:
+        name = aliases.get(name, name)
+        if name and name not in normalized:
+            normalized.append(name)
+    return normalized
+
+
+def get_skill_ids(names, skill_model=None, create=True):
+    """
+    Map canonical names to Skill ids, creating missing skills in bulk.
+    """
+    if skill_model is None:
+        from .models import Skill
+        skill_model = Skill
+
+    names = set(names)
+    if not names:
+        return {}
+
+    existing = dict(skill_model.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = names - existing.keys()
+    if missing and create:
+        skill_model.objects.bulk_create(
+            [skill_model(name=name) for name in missing],
+            ignore_conflicts=True
+        )
+        created = skill_model.objects.filter(name__in=missing).values_list('name', 'id')
+        existing.update(created)
+        add_skill_words([(skill_id, name) for name, skill_id in created], skill_model=skill_model)
+    return existing
+
+
+def add_skill_words(skills, skill_model=None):
+    """
+    Store the words of (id, name) skills as SkillWord rows (words already
+    stored are kept).
+    """
+    from .recommendations import tokenize
+
+    if skill_model is None:
+        from .models import Skill
+        skill_model = Skill
+    word_model = skill_model._meta.get_field('words').related_model
+
+    words = [word_model(skill_id=skill_id, word=word) for skill_id, name in skills for word in set(tokenize(name))]
+    word_model.objects.bulk_create(words, ignore_conflicts=True)
+
+
+# ----------------------------
+# Keeping links in sync
+# ----------------------------
+def sync_skills(instance):
+    """
+    Update the normalized_skills links of a Job or CandidateProfile
+    from its comma separated skills text, touching only what changed.
+    """
+    wanted = set(get_skill_ids(normalize_skills(split_skills(instance.skills))).values())
+    current = set(instance.normalized_skills.values_list('id', flat=True))
+
+    if wanted - current:
+        instance.normalized_skills.add(*(wanted - current))
+    if current - wanted:
+        instance.normalized_skills.remove(*(current - wanted))
+
+
+def link_skills(model, rows, skill_model=None, aliases=None):
+    """
+    Replace the normalized_skills links of (id, skills text) rows of a model
+    in bulk, for writes that skip the post_save signal (bulk_create, backfills).
+    """
+    field = model._meta.get_field('normalized_skills')
+    through = field.remote_field.through
+    source = through._meta.get_field(field.m2m_field_name()).column
+    target = through._meta.get_field(field.m2m_reverse_field_name()).column
+
+    if skill_model is None:
+        skill_model = field.remote_field.model
+    if aliases is None:
+        aliases = dict(DEFAULT_ALIASES)
+
+    parsed = {pk: normalize_skills(split_skills(text), aliases) for pk, text in rows}
+    skill_ids = get_skill_ids(
+        {name for names in parsed.values() for name in names},
+        skill_model=skill_model
+    )
+    links = [(pk, skill_ids[name]) for pk, names in parsed.items() for name in names]
+    quote = connection.ops.quote_name
+    with transaction.atomic():
+        through.objects.filter(**{f'{source}__in': list(parsed)}).delete()
+        if links:
+            # Plain executemany(): no model instance per link
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {quote(through._meta.db_table)} ({quote(source)}, {quote(target)}) "
+                    "VALUES (%s, %s)",
+                    links
+                )
+
+
+def backfill_skills(model, skill_model=None, batch_size=1000, aliases=None, stdout=None):
+    """
+    Rebuild normalized_skills links for every row of a model, in batches.
+    Works with both real and historical (migration) models.
+    """
+    if aliases is None:
+        aliases = dict(DEFAULT_ALIASES)
+
+    total = 0
+    rows = model.objects.order_by('id').values_list('id', 'skills')
+    batch = []
+
+    def flush():
+        link_skills(model, batch, skill_model=skill_model, aliases=aliases)
+
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+            total += len(batch)
+            batch = []
+            if stdout:
+                stdout.write(f"{model.__name__}: {total} rows...")
+
+    if batch:
+        flush()
+        total += len(batch)
+
+    return total
+
+
+def filter_by_skills(queryset, text):
+    """
+    Restrict a Job queryset to jobs having every skill in the comma separated text.
+    Uses the indexed Job <-> Skill join instead of substring matching.
+    """
+    names = normalize_skills(split_skills(text))
+    if not names:
+        return queryset
+
+    skill_ids = get_skill_ids(names, create=False)
+    if len(skill_ids) < len(names):
+        return queryset.none()
+
+    for skill_id in skill_ids.values():
+        queryset = queryset.filter(normalized_skills=skill_id)
+    return queryset
@@ -6,3 +6,35 @@ register = template.Library()
 @register.filter
 def dict_get(dict_obj, key):
     return dict_obj.get(key)
+
+
+@register.simple_tag(takes_context=True)
+def page_url(context, page_obj, direction):
+    """
+    Query string for the next/previous page that keeps the current filters.
+    Works with both cursor pages and Django's numbered pages.
+    """
+    params = context['request'].GET.copy()
+    params.pop('page', None)
+    params.pop('cursor', None)
+
+    if getattr(page_obj, 'is_cursor', False):
+        params['cursor'] = page_obj.next_cursor if direction == 'next' else page_obj.previous_cursor
+    else:
+        params['page'] = (
+            page_obj.next_page_number() if direction == 'next' else page_obj.previous_page_number()
+        )
+    return '?' + params.urlencode()
+
+
+@register.simple_tag(takes_context=True)
+def query_with(context, name, value):
+    """
+    Query string of the current page with one filter set to `value`
+    (pagination is reset).
+    """
+    params = context['request'].GET.copy()
+    params.pop('page', None)
+    params.pop('cursor', None)
+    params[name] = value
+    return '?' + params.urlencode()
@@ -1,3 +1,1601 @@
-from django.test import TestCase
+import asyncio
+import csv
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, reset_queries, transaction
+from django.db.models import Count, Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+
+from accounts.models import User
+from chatbot.models import ChatbotFAQ
+from chatbot import matcher
+from config.cache import bump_version, current_version
+from config.test_runner import in_other_process
+from profiles.models import CandidateProfile
+from subscriptions.models import Subscription
+from training.models import Course, Enrollment
+from . import benchmark, bulk_import, export, live, recommendations, server_benchmark
+from .counters import reconcile_counters, set_query_resolved
+from .dashboard import compute_dashboard_stats, get_dashboard_stats
+from .facets import VERSION_CACHE_KEY as FACETS_VERSION_KEY, compute_facets, get_facets, normalize_filters
+from .management.commands.seed_perf_data import bounded_map
+from .models import Application, Job, JobQuery, JobQueryReply, SavedJob, Skill, SkillAlias, ThreadEvent
+from .pagination import CursorPaginator
+from .search import build_match_expression, search_jobs, clear_index
+from .skills import normalize_skills, split_skills
+from .triage import MAX_SELECTED
+
+
+def make_job(consultant, **kwargs):
+    fields = {
+        'title': 'Python Developer',
+        'company': 'Vetri',
+        'location': 'Chennai',
+        'experience': 2,
+        'job_type': 'FT',
+        'domain': 'Web Development',
+        'skills': 'python, django',
+        'description': 'Build web applications.',
+    }
+    fields.update(kwargs)
+    return Job.objects.create(posted_by=consultant, **fields)
+
+
+class JobSearchIndexTests(TestCase):
+    def setUp(self):
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.candidate = User.objects.create_user(
+            email='candidate@example.com', password='pass12345', role='CANDIDATE'
+        )
+
+    def search(self, **filters):
+        return list(search_jobs(Job.objects.all(), **filters))
+
+    def test_match_expression_prefixes_every_word(self):
+        self.assertEqual(
+            build_match_expression(location='New Del'),
+            'location : ("new"* AND "del"*)'
+        )
+        self.assertEqual(build_match_expression(location='  ', unknown='x'), '')
+
+    def test_index_follows_save_and_delete(self):
+        job = make_job(self.consultant, location='Bangalore')
+        self.assertEqual(self.search(location='banga'), [job])
+
+        job.location = 'Mumbai'
+        job.save()
+        self.assertEqual(self.search(location='banga'), [])
+        self.assertEqual(self.search(location='mumbai'), [job])
+
+        job.delete()
+        self.assertEqual(self.search(location='mumbai'), [])
+
+    def test_results_are_ranked_by_relevance(self):
+        weak = make_job(self.consultant, skills='java, spring, python')
+        strong = make_job(self.consultant, skills='python, python scripting')
+        self.assertEqual(self.search(skills='python'), [strong, weak])
+
+    def test_jobs_list_uses_text_filters(self):
+        chennai = make_job(self.consultant, location='Chennai')
+        make_job(self.consultant, location='Pune')
+
+        self.client.force_login(self.candidate)
+        response = self.client.get(reverse('jobs:jobs_list'), {'location': 'chen'})
+        self.assertEqual(list(response.context['page_obj']), [chennai])
+
+    def test_rebuild_command_restores_index(self):
+        jobs = [make_job(self.consultant, location=f'City {i}') for i in range(5)]
+        clear_index()
+        self.assertEqual(self.search(location='city'), [])
+
+        call_command('rebuild_job_index', batch_size=2, stdout=StringIO())
+        self.assertCountEqual(self.search(location='city'), jobs)
+
+
+class SkillTaxonomyTests(TestCase):
+    def setUp(self):
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.candidate = User.objects.create_user(
+            email='candidate@example.com', password='pass12345', role='CANDIDATE'
+        )
+
+    def test_aliases_resolve_to_canonical_names(self):
+        SkillAlias.objects.create(alias='dj', skill=Skill.objects.create(name='django'))
+        names = normalize_skills(split_skills(' JS, javascript ,Py,  DJ,  Machine   Learning'))
+        self.assertEqual(names, ['javascript', 'python', 'django', 'machine learning'])
+
+    def test_links_follow_skills_text(self):
+        job = make_job(self.consultant, skills='JS, Python')
+        self.assertCountEqual(
+            job.normalized_skills.values_list('name', flat=True), ['javascript', 'python']
+        )
+
+        job.skills = 'python, k8s'
+        job.save()
+        self.assertCountEqual(
+            job.normalized_skills.values_list('name', flat=True), ['python', 'kubernetes']
+        )
+
+        profile = self.candidate.profile
+        profile.skills = 'py'
+        profile.save()
+        self.assertEqual(list(profile.normalized_skills.values_list('name', flat=True)), ['python'])
+
+    def test_jobs_list_filters_skills_by_join(self):
+        react = make_job(self.consultant, skills='ReactJS, CSS')
+        make_job(self.consultant, skills='Java')
+
+        self.client.force_login(self.candidate)
+        url = reverse('jobs:jobs_list')
+        self.assertEqual(list(self.client.get(url, {'skills': 'react'}).context['page_obj']), [react])
+        self.assertEqual(list(self.client.get(url, {'skills': 'react, cobol'}).context['page_obj']), [])
+
+    def test_backfill_command_relinks_rows(self):
+        job = make_job(self.consultant, skills='Go, Docker')
+        job.normalized_skills.clear()
+
+        call_command('backfill_skills', batch_size=1, stdout=StringIO())
+        self.assertCountEqual(job.normalized_skills.values_list('name', flat=True), ['go', 'docker'])
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        recommendations._recommender = None
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.candidate = User.objects.create_user(
+            email='candidate@example.com', password='pass12345', role='CANDIDATE'
+        )
+        self.profile = self.candidate.profile
+        self.profile.skills = 'Python, Django'
+        self.profile.save()
+
+    def recommend(self, **kwargs):
+        return recommendations.recommend_job_ids(self.profile, **kwargs)
+
+    def test_ranks_jobs_by_relevance(self):
+        both = make_job(self.consultant, title='Django Developer', skills='python, django')
+        one = make_job(self.consultant, title='Data Analyst', skills='python, sql', description='Reports.')
+        make_job(self.consultant, title='Java Developer', skills='java', description='Spring.')
+
+        self.assertEqual(self.recommend(), [both.id, one.id])
+        self.assertEqual(self.recommend(limit=1), [both.id])
+        self.assertEqual(self.recommend(exclude={both.id}), [one.id])
+
+    def test_index_updates_incrementally(self):
+        job = make_job(self.consultant, title='Java Developer', skills='java', description='Spring.')
+        self.assertEqual(self.recommend(), [])
+        recommender = recommendations.get_recommender()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job.skills = 'java, python'
+            job.save()
+            new_job = make_job(self.consultant, skills='django')
+        self.assertIs(recommendations.get_recommender(), recommender)
+        self.assertCountEqual(self.recommend(), [job.id, new_job.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job.is_active = False
+            job.save()
+            new_job.delete()
+        self.assertIs(recommendations.get_recommender(), recommender)
+        self.assertEqual(self.recommend(), [])
+
+    def test_rebuilds_after_invalidation_in_other_process(self):
+        job = make_job(self.consultant, skills='python')
+        recommender = recommendations.get_recommender()
+        self.assertIs(recommendations.get_recommender(), recommender)
+
+        in_other_process(
+            "from jobs.recommendations import invalidate_recommender\n"
+            "invalidate_recommender()"
+        )
+        self.assertIsNot(recommendations.get_recommender(), recommender)
+        self.assertEqual(self.recommend(), [job.id])
+
+    def test_not_patched_after_a_change_in_other_process(self):
+        job = make_job(self.consultant, title='Java Developer', skills='java', description='Spring.')
+        recommender = recommendations.get_recommender()
+
+        # Another worker's change: its job isn't in this index
+        bump_version(recommendations.VERSION_CACHE_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            job.skills = 'java, python'
+            job.save()
+        self.assertIsNot(recommendations.get_recommender(), recommender)
+        self.assertEqual(self.recommend(), [job.id])
+
+    def test_view_hides_applied_jobs(self):
+        applied = make_job(self.consultant, skills='python, django')
+        other = make_job(self.consultant, skills='python')
+        Application.objects.create(user=self.candidate, job=applied, resume='applications/resumes/cv.pdf')
+
+        self.client.force_login(self.candidate)
+        response = self.client.get(reverse('jobs:recommended_jobs'))
+        self.assertEqual(list(response.context['page_obj']), [other])
+
+
+class RecommendationCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        recommendations._recommender = None
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.candidate = User.objects.create_user(
+            email='candidate@example.com', password='pass12345', role='CANDIDATE'
+        )
+        self.other = User.objects.create_user(
+            email='other@example.com', password='pass12345', role='CANDIDATE'
+        )
+        for user, skills in ((self.candidate, 'Python'), (self.other, 'Java')):
+            user.profile.skills = skills
+            user.profile.save()
+        self.job = make_job(self.consultant, title='Backend Developer', skills='python')
+
+    def recommended(self, user):
+        self.client.force_login(user)
+        return [job.id for job in self.client.get(reverse('jobs:recommended_jobs')).context['page_obj']]
+
+    def stats(self):
+        return recommendations.recommendation_cache_stats()
+
+    def test_second_visit_is_a_hit(self):
+        self.assertEqual(self.recommended(self.candidate), [self.job.id])
+        self.assertEqual(self.recommended(self.candidate), [self.job.id])
+        self.assertEqual((self.stats()['hits'], self.stats()['misses']), (1, 1))
+
+    def test_stats_and_invalidation_are_shared_between_processes(self):
+        self.recommended(self.candidate)
+        self.recommended(self.candidate)
+
+        out = in_other_process(
+            "from django.core.management import call_command\n"
+            "call_command('recommendation_cache_stats')\n"
+            "from jobs.recommendations import invalidate_recommendations\n"
+            f"invalidate_recommendations([{self.candidate.id}])"
+        )
+        self.assertIn('hits: 1  misses: 1', out)
+        self.assertIsNone(cache.get(recommendations.recommendation_cache_key(self.candidate.id)))
+
+    def test_counts_not_lost_between_concurrent_processes(self):
+        code = (
+            "from jobs.recommendations import CACHE_HITS_KEY, _count\n"
+            "for _ in range(100):\n"
+            "    _count(CACHE_HITS_KEY)"
+        )
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(in_other_process, [code] * 3))
+        self.assertEqual(self.stats()['hits'], 300)
+
+    def test_profile_change_invalidates(self):
+        self.recommended(self.candidate)
+        profile = self.candidate.profile
+        profile.experience_years = 3
+        profile.save()
+
+        self.recommended(self.candidate)
+        self.assertEqual(self.stats()['misses'], 2)
+
+    def test_job_change_only_invalidates_affected_candidates(self):
+        self.recommended(self.candidate)
+        self.recommended(self.other)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            new_job = make_job(self.consultant, title='Python Engineer', skills='python')
+
+        key = recommendations.recommendation_cache_key
+        self.assertIsNone(cache.get(key(self.candidate.id)))
+        self.assertIsNotNone(cache.get(key(self.other.id)))
+        self.assertEqual(self.recommended(self.candidate)[0:2], [new_job.id, self.job.id])
+
+    def test_affected_candidates_found_by_skill_words(self):
+        self.other.profile.skills = 'Java, Machine Learning'
+        self.other.profile.save()
+        affected = recommendations.candidates_affected_by
+
+        with self.assertNumQueries(1):
+            self.assertEqual(affected({'learning', 'spring'}), [self.other.id])
+        self.assertCountEqual(affected({'machine', 'python'}), [self.candidate.id, self.other.id])
+        self.assertEqual(affected({'go'}), [])
+
+        skill = Skill.objects.get(name='machine learning')
+        skill.name = 'deep learning'
+        skill.save()
+        self.assertEqual(affected({'machine'}), [])
+        self.assertEqual(affected({'deep'}), [self.other.id])
+
+    def test_applying_invalidates(self):
+        self.recommended(self.candidate)
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.create(user=self.candidate, job=self.job, resume='applications/resumes/cv.pdf')
+        self.assertEqual(self.recommended(self.candidate), [])
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.jobs = [make_job(self.consultant, title=f'Job {i}') for i in range(7)]
+        self.newest_first = self.jobs[::-1]
+
+    def test_walks_forward_and_back(self):
+        paginator = CursorPaginator(Job.objects.all(), 3)
+
+        first = paginator.get_page()
+        self.assertEqual(list(first), self.newest_first[:3])
+        self.assertFalse(first.has_previous())
+
+        second = paginator.get_page(first.next_cursor)
+        third = paginator.get_page(second.next_cursor)
+        self.assertEqual(list(second), self.newest_first[3:6])
+        self.assertEqual(list(third), self.newest_first[6:])
+        self.assertFalse(third.has_next())
+
+        back = paginator.get_page(third.previous_cursor)
+        self.assertEqual(list(back), self.newest_first[3:6])
+        self.assertEqual(list(paginator.get_page(back.previous_cursor)), self.newest_first[:3])
+
+    def test_bad_cursor_falls_back_to_first_page(self):
+        page = CursorPaginator(Job.objects.all(), 3).get_page('not-a-cursor')
+        self.assertEqual(list(page), self.newest_first[:3])
+
+    def test_count_is_cached(self):
+        paginator = CursorPaginator(Job.objects.all(), 3)
+        self.assertEqual(paginator.count, 7)
+
+        make_job(self.consultant)
+        with self.assertNumQueries(0):
+            self.assertEqual(CursorPaginator(Job.objects.all(), 3).count, 7)
+
+    def test_jobs_list_links_keep_filters(self):
+        candidate = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.client.force_login(candidate)
+
+        response = self.client.get(reverse('jobs:jobs_list'), {'job_type': 'FT'})
+        page = response.context['page_obj']
+        self.assertEqual(list(page), self.newest_first[:6])
+        self.assertContains(response, f'?job_type=FT&amp;cursor={page.next_cursor}')
+
+        response = self.client.get(reverse('jobs:jobs_list'), {'job_type': 'FT', 'cursor': page.next_cursor})
+        self.assertEqual(list(response.context['page_obj']), self.newest_first[6:])
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.candidate = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        make_job(self.consultant, job_type='FT', location='Chennai', domain='Web', experience=1)
+        make_job(self.consultant, job_type='FT', location='chennai ', domain='Data', experience=3)
+        make_job(self.consultant, job_type='RM', location='Pune', domain='Web', experience=5)
+
+    def test_normalize_filters(self):
+        self.assertEqual(
+            normalize_filters({'location': '  New   DELHI', 'job_type': 'ft', 'experience': 'x', 'domain': ''}),
+            {'location': 'new delhi', 'job_type': 'FT'}
+        )
+
+    def test_counts_from_one_query(self):
+        with self.assertNumQueries(1):
+            facets = compute_facets(Job.objects.all())
+
+        self.assertEqual([(f['value'], f['count']) for f in facets['job_type']], [('FT', 2), ('RM', 1)])
+        self.assertEqual([(f['value'], f['count']) for f in facets['location']], [('Chennai', 2), ('Pune', 1)])
+        self.assertEqual([(f['value'], f['count']) for f in facets['experience']], [(1, 1), (3, 2), (5, 3)])
+
+    def test_jobs_list_facets_follow_filters_and_job_changes(self):
+        self.client.force_login(self.candidate)
+        url = reverse('jobs:jobs_list')
+
+        facets = self.client.get(url, {'location': 'chennai'}).context['facets']
+        self.assertEqual([(f['value'], f['count']) for f in facets['domain']], [('Data', 1), ('Web', 1)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.consultant, location='Chennai', domain='Web')
+        response = self.client.get(url, {'location': 'Chennai'})
+        self.assertEqual([(f['value'], f['count']) for f in response.context['facets']['domain']], [('Web', 2), ('Data', 1)])
+        self.assertContains(response, '3 jobs found')
+        self.assertNotContains(response, '~3 jobs found')
+
+    def test_jobs_list_total_from_facets_without_count_query(self):
+        self.client.force_login(self.candidate)
+        url = reverse('jobs:jobs_list')
+        # Newest first (cursor) and relevance ranked (page numbers)
+        for params in ({}, {'location': 'chennai'}):
+            self.client.get(url, params)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+            self.assertFalse([q['sql'] for q in queries if 'COUNT(' in q['sql']], params)
+            self.assertContains(response, f"{2 if params else 3} jobs found")
+            self.assertNotContains(response, '~')
+
+    def test_invalidation_in_other_process(self):
+        get_facets(Job.objects.all(), {})
+        with self.assertNumQueries(0):
+            get_facets(Job.objects.all(), {})
+
+        in_other_process("from jobs.facets import invalidate_facets\ninvalidate_facets()")
+        with self.assertNumQueries(1):
+            get_facets(Job.objects.all(), {})
+
+
+class SeedPerfDataTests(TestCase):
+    def seed(self, **options):
+        counts = {
+            'candidates': 20, 'consultants': 3, 'jobs': 30, 'applications': 100, 'saved_jobs': 40,
+            'queries': 25, 'replies': 30, 'courses': 5, 'enrollments': 30, 'faqs': 10,
+        }
+        counts.update(options)
+        call_command('seed_perf_data', workers=1, stdout=StringIO(), **counts)
+
+    def test_generates_requested_volumes_without_signals(self):
+        self.seed()
+
+        self.assertEqual(User.objects.count(), 23)
+        # One profile per user and one subscription per candidate, not doubled by signals
+        self.assertEqual(CandidateProfile.objects.count(), 23)
+        self.assertEqual(Subscription.objects.count(), 20)
+        self.assertEqual(Job.objects.count(), 30)
+        self.assertEqual(Application.objects.count(), 100)
+        self.assertEqual(SavedJob.objects.count(), 40)
+        self.assertEqual(JobQuery.objects.count(), 25)
+        self.assertEqual(JobQueryReply.objects.count(), 30)
+        self.assertEqual(Enrollment.objects.count(), 30)
+        self.assertEqual(ChatbotFAQ.objects.count(), 10)
+
+        # Generated dates are kept, and derived data is rebuilt
+        self.assertGreater(Job.objects.dates('posted_on', 'month').count(), 1)
+        self.assertTrue(Job.normalized_skills.through.objects.exists())
+        location = Job.objects.values_list('location', flat=True).first()
+        self.assertTrue(search_jobs(Job.objects.all(), location=location).exists())
+        self.assertEqual(Job.objects.aggregate(total=Sum('applications_count'))['total'], 100)
+
+    def test_same_seed_same_data(self):
+        self.seed()
+        first = list(Job.objects.order_by('id').values_list('title', 'skills', 'location'))
+        Job.objects.all().delete()
+
+        self.seed(applications=0, saved_jobs=0, queries=0, replies=0, enrollments=0)
+        second = list(Job.objects.order_by('id').values_list('title', 'skills', 'location'))
+        self.assertEqual(first, second)
+
+    def test_running_servers_drop_what_they_built(self):
+        faq_matcher = matcher.get_matcher()
+        recommender = recommendations.get_recommender()
+        facets_version = current_version(FACETS_VERSION_KEY)
+
+        self.seed()
+        self.assertIsNot(matcher.get_matcher(), faq_matcher)
+        self.assertIsNot(recommendations.get_recommender(), recommender)
+        self.assertNotEqual(current_version(FACETS_VERSION_KEY), facets_version)
+
+    def test_workers_get_a_bounded_window_of_chunks(self):
+        submitted = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args):
+                submitted.append(args[0])
+                return super().submit(fn, *args)
+
+        with RecordingExecutor(max_workers=2) as executor:
+            results = bounded_map(executor, str, range(10), window=3)
+            self.assertEqual(next(results), '0')
+            self.assertEqual(submitted, [0, 1, 2])
+            self.assertEqual(list(results), [str(i) for i in range(1, 10)])
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        recommendations._recommender = None
+        call_command(
+            'seed_perf_data', workers=1, stdout=StringIO(), candidates=10, consultants=2, jobs=20,
+            applications=30, saved_jobs=10, queries=10, replies=10, courses=2, enrollments=5, faqs=8,
+        )
+
+    def test_reports_every_endpoint_of_the_mix(self):
+        results = benchmark.run(requests=60, warmup=1, users=3)
+
+        self.assertEqual(set(results['endpoints']), set(benchmark.DEFAULT_MIX))
+        for stats in results['endpoints'].values():
+            self.assertLessEqual(stats['p50_ms'], stats['p95_ms'])
+            self.assertLessEqual(stats['p95_ms'], stats['p99_ms'])
+            self.assertGreater(stats['mean_queries'], 0)
+        # Requests are rolled back
+        self.assertEqual(Application.objects.count(), 30)
+
+    def test_fails_on_regression_against_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('run_benchmark', '--mix=jobs_list', requests=20, warmup=0, output=path, stdout=StringIO())
+            with open(path) as handle:
+                baseline = json.load(handle)
+
+            baseline['endpoints']['jobs_list']['p50_ms'] /= 10
+            with open(path, 'w') as handle:
+                json.dump(baseline, handle)
+
+            with self.assertRaisesMessage(CommandError, 'jobs_list: p50'):
+                call_command('run_benchmark', '--mix=jobs_list', requests=20, warmup=0, baseline=path, stdout=StringIO())
+
+    def test_compare_ignores_tiny_slowdowns(self):
+        endpoint = {'p50_ms': 1.0, 'p95_ms': 2.0, 'p99_ms': 3.0, 'max_queries': 5}
+        results = {'endpoints': {'jobs_list': dict(endpoint, p50_ms=1.5)}}
+        self.assertEqual(benchmark.compare(results, {'endpoints': {'jobs_list': endpoint}}), [])
+
+        results = {'endpoints': {'jobs_list': dict(endpoint, p50_ms=2.5)}}
+        self.assertEqual(len(benchmark.compare(results, {'endpoints': {'jobs_list': endpoint}})), 1)
+
+
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        self.candidate = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.client.force_login(self.candidate)
+
+    def test_server_timing_header_counts_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('jobs:jobs_list'))
+
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(captured)} queries"', timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, total;dur=[\d.]+')
+
+    @override_settings(PERFORMANCE_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_url_name(self):
+        with self.assertLogs('performance', 'WARNING') as logs:
+            self.client.get(reverse('jobs:jobs_list'))
+
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry['event'], 'slow_request')
+        self.assertEqual(entry['url_name'], 'jobs:jobs_list')
+        self.assertEqual(entry['status'], 200)
+        self.assertGreater(entry['queries'], 0)
+        self.assertGreater(entry['template_ms'], 0)
+
+    def test_template_time_without_patching_django(self):
+        from django.template.backends import django as django_backend
+
+        response = self.client.get(reverse('jobs:jobs_list'))
+
+        self.assertEqual(django_backend.Template.render.__module__, django_backend.__name__)
+        template_ms = float(response['Server-Timing'].split('tpl;dur=')[1].split(',')[0])
+        self.assertGreater(template_ms, 0)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_measured(self):
+        response = self.client.get(reverse('jobs:jobs_list'))
+        self.assertNotIn('Server-Timing', response)
+
+
+class QueryPlanTests(TestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on every query the hot views issue against
+    seeded data and fails on any full scan of a jobs table.
+    """
+    HOT_TABLES = {'jobs_job', 'jobs_application', 'jobs_jobquery', 'jobs_jobqueryreply', 'jobs_savedjob'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        other_consultant = User.objects.create_user(
+            email='other@example.com', password='pass12345', role='CONSULTANT'
+        )
+        cls.candidate = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        applicants = [
+            User.objects.create_user(email=f'applicant{i}@example.com', password='pass12345')
+            for i in range(6)
+        ]
+
+        Job.objects.bulk_create([
+            Job(
+                posted_by=cls.consultant if i % 4 == 0 else other_consultant,
+                title=f'Job {i}', company='Vetri', location=['Chennai', 'Pune', 'Delhi'][i % 3],
+                experience=i % 8, job_type=['FT', 'PT', 'RM'][i % 3], domain=['Web', 'Data'][i % 2],
+                skills='python', description='Build things.',
+                is_active=i % 10 != 0,
+            )
+            for i in range(400)
+        ])
+        jobs = list(Job.objects.all())
+        cls.job = next(job for job in jobs if job.posted_by_id == cls.consultant.id and job.is_active)
+
+        Application.objects.bulk_create([
+            Application(
+                user=user, job=job, resume='applications/resumes/cv.pdf',
+                status='SHORTLISTED' if job.id % 3 == 0 else 'PENDING',
+            )
+            for user in applicants + [cls.candidate] for job in jobs[:150]
+        ])
+        SavedJob.objects.bulk_create([
+            SavedJob(user=user, job=job) for user in applicants + [cls.candidate] for job in jobs[:50]
+        ])
+        JobQuery.objects.bulk_create([
+            JobQuery(job=job, user=user, question='When does it start?', is_resolved=job.id % 2 == 0)
+            for user in applicants for job in jobs[:150]
+        ])
+        JobQueryReply.objects.bulk_create([
+            JobQueryReply(query=query, user=cls.consultant, message='Soon.')
+            for query in JobQuery.objects.all()[:200]
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def full_scans(self, user, url, data=None):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, data)
+        self.assertLess(response.status_code, 400, url)
+
+        scans = []
+        with connection.cursor() as cursor:
+            for query in captured.captured_queries:
+                sql = query['sql']
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    words = detail.split()
+                    if words[0] != 'SCAN' or words[1] not in self.HOT_TABLES:
+                        continue
+                    # Allowed: covering index scans, and ordered index walks cut short by LIMIT
+                    if 'COVERING INDEX' in detail or ('USING INDEX' in detail and ' LIMIT ' in sql):
+                        continue
+                    scans.append(f'{detail}\n    in: {sql}')
+        return scans
+
+    def assertNoFullScans(self, user, url, data=None):
+        scans = self.full_scans(user, url, data)
+        self.assertFalse(scans, f'Full table scans for {url}:\n' + '\n'.join(scans))
+
+    def test_candidate_views(self):
+        for name, args, data in (
+            ('jobs:jobs_list', [], None),
+            ('jobs:jobs_list', [], {'job_type': 'FT', 'experience': '3'}),
+            ('jobs:jobs_list', [], {'location': 'chennai'}),
+            ('jobs:job_detail', [self.job.id], None),
+            ('jobs:saved_jobs', [], None),
+            ('jobs:candidate_applied_jobs', [], None),
+            ('jobs:job_queries', [self.job.id], None),
+        ):
+            with self.subTest(name=name, data=data):
+                self.assertNoFullScans(self.candidate, reverse(name, args=args), data)
+
+    def test_consultant_views(self):
+        for name, args in (
+            ('jobs:jobs_list', []),
+            ('jobs:posted_jobs', []),
+            ('jobs:job_detail', [self.job.id]),
+            ('jobs:applicants_list', [self.job.id]),
+            ('jobs:shortlisted_applicants', []),
+            ('jobs:query_queue', []),
+            ('jobs:job_queries', [self.job.id]),
+        ):
+            with self.subTest(name=name):
+                self.assertNoFullScans(self.consultant, reverse(name, args=args))
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Requests every named route of the main apps as each role, first with
+    10 related rows of everything and then with 1,000, and holds each one
+    to a fixed query budget that must not grow with the data.
+    """
+    NAMESPACES = ('jobs', 'accounts', 'training', 'subscriptions', 'chatbot')
+    ROLES = ('CANDIDATE', 'CONSULTANT', 'ADMIN')
+
+    # Most queries any role may run per route
+    BUDGETS = {
+        'accounts:home': 4,
+        'accounts:login': 4,
+        'accounts:logout': 0,
+        'accounts:signup': 4,
+        'accounts:dashboard': 6,
+        'accounts:candidate_profile': 5,
+        'jobs:jobs_list': 8,
+        'jobs:saved_jobs': 5,
+        'jobs:post_job': 3,
+        'jobs:posted_jobs': 4,
+        'jobs:save_job': 8,
+        'jobs:unsave_job': 3,
+        'jobs:apply_job': 5,
+        'jobs:edit_job': 5,
+        'jobs:delete_job': 17,
+        'jobs:job_detail': 8,
+        'jobs:applicants_list': 6,
+        'jobs:applicants_bulk_action': 2,
+        'jobs:applicants_export': 3,
+        'jobs:import_jobs': 2,
+        'jobs:all_applicants_export': 2,
+        'jobs:resume_search': 2,
+        'jobs:applicant_detail': 7,
+        'jobs:shortlisted_applicants': 4,
+        'jobs:candidate_applied_jobs': 5,
+        'jobs:job_queries': 7,
+        'jobs:query_queue': 4,
+        'jobs:resolve_query': 9,
+        'jobs:query_replies': 4,
+        'jobs:jobs_list_json': 5,
+        'jobs:jobs_list_json_async': 5,
+        'jobs:job_events': 2,
+        'jobs:recommended_jobs': 9,
+        'training:course_list': 5,
+        'training:course_detail': 7,
+        'training:enroll_course': 3,
+        'training:my_courses': 5,
+        'training:my_course_detail': 6,
+        'subscriptions:plans': 7,
+        'subscriptions:subscribe_pro': 6,
+        'subscriptions:payment': 7,
+        'chatbot:reply': 1,
+        'chatbot:ask': 3,
+        'chatbot:greeting': 5,
+        'chatbot:reply_async': 1,
+        'chatbot:ask_async': 3,
+        'chatbot:greeting_async': 2,
+    }
+
+    # Deleting a job cascades to its applications in batches sized by the
+    # database's parameter limit, so only its small-data count is budgeted
+    GROWS_WITH_DATA = {'jobs:delete_job'}
+
+    # Routes that are only meaningful as a POST
+    POST_DATA = {
+        'chatbot:reply': {'message': 'how do I apply for a job?'},
+        'chatbot:ask': {'message': 'how do I apply for a job?'},
+        'chatbot:reply_async': {'message': 'how do I apply for a job?'},
+        'chatbot:ask_async': {'message': 'how do I apply for a job?'},
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            role: User.objects.create_user(
+                email=f'{role.lower()}@example.com', password='pass12345', role=role
+            )
+            for role in cls.ROLES
+        }
+        cls.candidate = cls.users['CANDIDATE']
+        cls.consultant = cls.users['CONSULTANT']
+
+        profile = cls.candidate.profile
+        profile.skills = 'python, django'
+        profile.save()
+
+        cls.job = make_job(cls.consultant)
+        cls.application = Application.objects.create(
+            user=cls.candidate, job=cls.job, resume='applications/resumes/cv.pdf', status='SHORTLISTED'
+        )
+        cls.query = JobQuery.objects.create(job=cls.job, user=cls.candidate, question='When does it start?')
+        cls.course = Course.objects.create(title='Django', description='Web apps with Django.')
+        Enrollment.objects.create(candidate=profile, course=cls.course)
+        cls.seeded = 0
+
+    def seed(self, total):
+        """
+        Top every kind of related row up to `total`, around the same job,
+        query, candidate and consultant the routes are requested for.
+        """
+        start, count = self.seeded, total - self.seeded
+        self.seeded = total
+        numbers = range(start, start + count)
+
+        applicants = User.objects.bulk_create([
+            User(email=f'applicant{i}@example.com', password='!', role='CANDIDATE') for i in numbers
+        ])
+        CandidateProfile.objects.bulk_create([
+            CandidateProfile(user=user, first_name=f'Applicant {i}') for i, user in zip(numbers, applicants)
+        ])
+        jobs = Job.objects.bulk_create([
+            Job(
+                posted_by=self.consultant, title=f'Python Job {i}', company='Vetri', location='Chennai',
+                experience=i % 8, job_type='FT', domain='Web', skills='python, django',
+                description='Build things.',
+            )
+            for i in numbers
+        ])
+        Application.objects.bulk_create(
+            [
+                Application(
+                    user=user, job=self.job, resume='applications/resumes/cv.pdf',
+                    status='SHORTLISTED' if i % 2 else 'PENDING',
+                )
+                for i, user in zip(numbers, applicants)
+            ] + [Application(user=self.candidate, job=job, resume='applications/resumes/cv.pdf') for job in jobs]
+        )
+        SavedJob.objects.bulk_create([SavedJob(user=self.candidate, job=job) for job in jobs])
+        queries = JobQuery.objects.bulk_create([
+            JobQuery(job=self.job, user=user, question='Is it remote?') for user in applicants
+        ])
+        JobQueryReply.objects.bulk_create(
+            [JobQueryReply(query=query, user=self.consultant, message='No.') for query in queries]
+            + [JobQueryReply(query=self.query, user=user, message='Me too.') for user in applicants]
+        )
+        courses = Course.objects.bulk_create([
+            Course(title=f'Course {i}', description='Learn things.') for i in numbers
+        ])
+        Enrollment.objects.bulk_create([
+            Enrollment(candidate=self.candidate.profile, course=course) for course in courses
+        ])
+        ChatbotFAQ.objects.bulk_create([
+            ChatbotFAQ(question=f'Question {i}', answer='Answer.', keywords=f'keyword{i}') for i in numbers
+        ])
+
+    def routes(self):
+        """
+        (name, kwargs) for every named route in NAMESPACES.
+        """
+        values = {
+            'job_id': self.job.id,
+            'application_id': self.application.id,
+            'query_id': self.query.id,
+            'course_id': self.course.id,
+        }
+        for resolver in get_resolver().url_patterns:
+            if getattr(resolver, 'namespace', None) not in self.NAMESPACES:
+                continue
+            for pattern in resolver.url_patterns:
+                kwargs = {name: values[name] for name in pattern.pattern.converters}
+                yield f'{resolver.namespace}:{pattern.name}', kwargs
+
+    def count_queries(self, user, name, kwargs):
+        # Cold caches, so every request does its full amount of work
+        cache.clear()
+        recommendations._recommender = None
+        matcher._matcher = None
+        self.client.force_login(user)
+
+        url = reverse(name, kwargs=kwargs)
+        savepoint = transaction.savepoint()
+        reset_queries()
+        try:
+            with CaptureQueriesContext(connection) as captured:
+                if name in self.POST_DATA:
+                    response = self.client.post(url, self.POST_DATA[name], content_type='application/json')
+                else:
+                    response = self.client.get(url)
+        finally:
+            # Undo whatever the route changed (saved, deleted, enrolled...)
+            transaction.savepoint_rollback(savepoint)
+        self.assertLess(response.status_code, 500, url)
+        return len(captured)
+
+    def measure(self):
+        return {
+            (name, role): self.count_queries(user, name, kwargs)
+            for name, kwargs in self.routes()
+            for role, user in self.users.items()
+        }
+
+    def test_budgets_do_not_grow_with_data(self):
+        self.seed(10)
+        small = self.measure()
+        self.seed(1000)
+        large = self.measure()
+
+        self.assertEqual(
+            {name for name, role in small},
+            set(self.BUDGETS),
+            'every named route needs a budget',
+        )
+        for (name, role), queries in small.items():
+            with self.subTest(route=name, role=role):
+                self.assertLessEqual(queries, self.BUDGETS[name])
+                if name not in self.GROWS_WITH_DATA:
+                    self.assertEqual(large[name, role], queries, 'query count grows with related rows')
+
+
+class JobCounterTests(TestCase):
+    def setUp(self):
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.candidate = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.job = make_job(self.consultant)
+
+    def counters(self, job=None):
+        return Job.objects.values_list(*Job.COUNTER_FIELDS).get(pk=(job or self.job).pk)
+
+    def test_rows_added_and_removed(self):
+        application = Application.objects.create(user=self.candidate, job=self.job, resume='r.pdf')
+        saved = SavedJob.objects.create(user=self.candidate, job=self.job)
+        query = JobQuery.objects.create(job=self.job, user=self.candidate, question='Remote?')
+        JobQuery.objects.create(job=self.job, user=self.candidate, question='Salary?', is_resolved=True)
+        self.assertEqual(self.counters(), (1, 1, 1))
+
+        application.delete()
+        saved.delete()
+        query.delete()
+        self.assertEqual(self.counters(), (0, 0, 0))
+
+    def test_query_state_changes(self):
+        query = JobQuery.objects.create(job=self.job, user=self.candidate, question='Remote?')
+
+        query.is_resolved = True
+        query.save()
+        self.assertEqual(self.counters(), (0, 0, 0))
+
+        self.assertTrue(set_query_resolved(query, False))
+        self.assertFalse(set_query_resolved(query, False))
+        self.assertEqual(self.counters(), (0, 0, 1))
+
+        self.client.force_login(self.consultant)
+        self.client.get(reverse('jobs:resolve_query', args=[query.id]))
+        self.assertEqual(self.counters(), (0, 0, 0))
+
+    def test_cascades(self):
+        other = User.objects.create_user(email='other@example.com', password='pass12345')
+        for user in (self.candidate, other):
+            Application.objects.create(user=user, job=self.job, resume='r.pdf')
+            SavedJob.objects.create(user=user, job=self.job)
+
+        other.delete()
+        self.assertEqual(self.counters(), (1, 1, 0))
+
+        # Rows going with their job don't update it one by one (the two
+        # extra queries queue its applicants for the resume index at once)
+        with self.assertNumQueries(12):
+            self.job.delete()
+
+    def test_stale_job_save_keeps_counters(self):
+        stale = Job.objects.get(pk=self.job.pk)
+        Application.objects.create(user=self.candidate, job=self.job, resume='r.pdf')
+
+        stale.title = 'Senior Python Developer'
+        stale.save()
+
+        self.assertEqual(self.counters(), (1, 0, 0))
+        self.assertEqual(Job.objects.get(pk=self.job.pk).title, 'Senior Python Developer')
+
+    def test_pages_read_counters(self):
+        Application.objects.create(user=self.candidate, job=self.job, resume='r.pdf')
+        JobQuery.objects.create(job=self.job, user=self.candidate, question='Remote?')
+        self.client.force_login(self.consultant)
+
+        response = self.client.get(reverse('jobs:job_detail', args=[self.job.id]))
+        self.assertEqual(response.context['applicants_count'], 1)
+        response = self.client.get(reverse('accounts:dashboard'))
+        self.assertEqual(response.context['unread_queries_count'], 1)
+        self.assertContains(self.client.get(reverse('jobs:posted_jobs')), '1 applicant\n')
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        other_job = make_job(self.consultant)
+        Application.objects.create(user=self.candidate, job=self.job, resume='r.pdf')
+        # Writes that bypass the signals
+        Application.objects.bulk_create([Application(user=self.consultant, job=other_job, resume='r.pdf')])
+        Job.objects.filter(pk=self.job.pk).update(saved_count=5)
+
+        drift = reconcile_counters(fix=False)
+        self.assertEqual(drift['applications_count'], [(other_job.pk, 0, 1)])
+        self.assertEqual(drift['saved_count'], [(self.job.pk, 5, 0)])
+        self.assertEqual(drift['open_queries_count'], [])
+
+        out = StringIO()
+        call_command('reconcile_job_counters', stdout=out)
+        self.assertIn('saved_count: 1 jobs drifted, off by 5 in total', out.getvalue())
+        self.assertEqual(self.counters(), (1, 0, 0))
+        self.assertEqual(self.counters(other_job), (1, 0, 0))
+
+        out = StringIO()
+        call_command('reconcile_job_counters', '--dry-run', stdout=out)
+        self.assertIn('All job counters are exact.', out.getvalue())
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.other = User.objects.create_user(email='other@example.com', password='pass12345', role='CONSULTANT')
+        self.candidates = [
+            User.objects.create_user(email=f'candidate{i}@example.com', password='pass12345') for i in range(3)
+        ]
+        self.job = make_job(self.consultant, title='Backend')
+        self.closed = make_job(self.consultant, title='Frontend', is_active=False)
+        make_job(self.other)
+
+        statuses = [('SHORTLISTED', 'SCHEDULED'), ('SHORTLISTED', 'COMPLETED'), ('REJECTED', 'NOT_SCHEDULED')]
+        for candidate, (status, meeting) in zip(self.candidates, statuses):
+            Application.objects.create(
+                user=candidate, job=self.job, resume='r.pdf', status=status, meeting_status=meeting
+            )
+        JobQuery.objects.create(job=self.job, user=self.candidates[0], question='Remote?')
+
+    def test_all_numbers_from_one_query(self):
+        with self.assertNumQueries(1):
+            stats = compute_dashboard_stats(self.consultant)
+
+        self.assertEqual(stats['jobs'], {'total': 2, 'active': 1, 'inactive': 1})
+        self.assertEqual(stats['applications'], {'total': 3, 'PENDING': 0, 'SHORTLISTED': 2, 'REJECTED': 1})
+        self.assertEqual(stats['meetings']['SCHEDULED'], 1)
+        self.assertEqual(stats['meetings']['COMPLETED'], 1)
+        self.assertEqual(stats['open_queries'], 1)
+
+        frontend, backend = stats['per_job']
+        self.assertEqual((frontend['title'], frontend['applications'], frontend['is_active']), ('Frontend', 0, False))
+        self.assertEqual(backend['statuses']['SHORTLISTED'], 2)
+        self.assertEqual(backend['open_queries'], 1)
+
+    def test_cached_until_own_jobs_change(self):
+        get_dashboard_stats(self.consultant)
+        get_dashboard_stats(self.other)
+        with self.assertNumQueries(0):
+            get_dashboard_stats(self.consultant)
+
+        application = Application.objects.get(user=self.candidates[2])
+        with self.captureOnCommitCallbacks(execute=True):
+            application.status = 'SHORTLISTED'
+            application.save()
+        self.assertEqual(get_dashboard_stats(self.consultant)['applications']['SHORTLISTED'], 3)
+        with self.assertNumQueries(0):
+            get_dashboard_stats(self.other)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            set_query_resolved(JobQuery.objects.get(), True)
+        self.assertEqual(get_dashboard_stats(self.consultant)['open_queries'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.closed.delete()
+        self.assertEqual(get_dashboard_stats(self.consultant)['jobs']['total'], 1)
+
+    def test_invalidation_in_other_process(self):
+        get_dashboard_stats(self.consultant)
+
+        in_other_process(
+            "from jobs.dashboard import invalidate_dashboard\n"
+            f"invalidate_dashboard([{self.consultant.pk}])"
+        )
+        with self.assertNumQueries(1):
+            get_dashboard_stats(self.consultant)
+
+    def test_dashboard_queries_dont_grow_with_jobs(self):
+        self.client.force_login(self.consultant)
+
+        def dashboard_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(reverse('accounts:dashboard'))
+            self.assertEqual(response.context['unread_queries_count'], 1)
+            return len(captured)
+
+        before = dashboard_queries()
+        for i in range(10):
+            job = make_job(self.consultant, title=f'Job {i}')
+            Application.objects.create(user=self.candidates[0], job=job, resume='r.pdf')
+        self.assertEqual(dashboard_queries(), before)
+
+
+class QueryThreadTests(TestCase):
+    def setUp(self):
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.candidate = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.job = make_job(self.consultant)
+        self.query = JobQuery.objects.create(job=self.job, user=self.candidate, question='Is it remote?')
+
+    def add_replies(self, count):
+        JobQueryReply.objects.bulk_create([
+            JobQueryReply(query=self.query, user=self.consultant, message=f'Reply {i}') for i in range(count)
+        ])
+
+    def get_thread(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('jobs:job_queries', args=[self.job.id]))
+        return response, len(captured)
+
+    def test_query_count_constant_and_replies_capped(self):
+        self.client.force_login(self.consultant)
+        self.add_replies(2)
+        _, short_thread = self.get_thread()
+
+        self.add_replies(200)
+        for i in range(30):
+            JobQuery.objects.create(job=self.job, user=self.candidate, question=f'Question {i}')
+        response, long_thread = self.get_thread()
+
+        self.assertEqual(long_thread, short_thread)
+        page = response.context['queries']
+        self.assertEqual(len(page), 10)
+        self.assertTrue(page.has_next())
+
+        # Newest threads first: bring the long one to the top
+        JobQuery.objects.filter(pk=self.query.pk).update(created_at=timezone.now() + timedelta(hours=1))
+        response, _ = self.get_thread()
+        thread = response.context['queries'].object_list[0]
+        self.assertEqual(thread.pk, self.query.pk)
+        self.assertEqual([reply.message for reply in thread.shown_replies], ['Reply 0', 'Reply 1'] + [
+            f'Reply {i}' for i in range(3)
+        ])
+        self.assertIsNotNone(thread.more_replies_cursor)
+        self.assertContains(response, 'Load more replies')
+
+    def test_load_more_fragment(self):
+        self.add_replies(30)
+        self.client.force_login(self.candidate)
+        url = reverse('jobs:query_replies', args=[self.query.id])
+
+        response = self.client.get(url)
+        self.assertEqual(len(response.context['replies']), 20)
+        response = self.client.get(url, {'after': response.context['more_cursor']})
+        self.assertEqual([reply.message for reply in response.context['replies']], [
+            f'Reply {i}' for i in range(20, 30)
+        ])
+        self.assertIsNone(response.context['more_cursor'])
+        self.assertNotContains(response, 'Load more replies')
+
+        other = User.objects.create_user(email='other@example.com', password='pass12345')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_candidate_asks_and_replies_only_on_own_threads(self):
+        other = User.objects.create_user(email='other@example.com', password='pass12345')
+        other_query = JobQuery.objects.create(job=self.job, user=other, question='Salary?')
+        self.client.force_login(self.candidate)
+        url = reverse('jobs:job_queries', args=[self.job.id])
+
+        self.client.post(url, {'question': 'Can I work part time?'})
+        self.assertTrue(JobQuery.objects.filter(user=self.candidate, question='Can I work part time?').exists())
+
+        self.assertEqual(self.client.post(url, {'query_id': other_query.id, 'message': 'Hi'}).status_code, 404)
+        self.client.post(url, {'query_id': self.query.id, 'message': 'Any update?'})
+        self.assertEqual(self.query.replies.get().message, 'Any update?')
+
+
+@override_settings(JOB_EVENTS_POLL_INTERVAL=0.01)
+class LiveThreadTests(TestCase):
+    def setUp(self):
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.candidate = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.other = User.objects.create_user(email='other@example.com', password='pass12345')
+        self.job = make_job(self.consultant)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.query = JobQuery.objects.create(job=self.job, user=self.candidate, question='Is it remote?')
+            self.other_query = JobQuery.objects.create(job=self.job, user=self.other, question='Salary?')
+        self.url = reverse('jobs:job_events', args=[self.job.id])
+
+    def reply(self, query, user, message):
+        with self.captureOnCommitCallbacks(execute=True):
+            JobQueryReply.objects.create(query=query, user=user, message=message)
+
+    async def open_stream(self, user, **headers):
+        await self.async_client.aforce_login(user)
+        after = await sync_to_async(live.latest_event_id)()
+        response = await self.async_client.get(self.url, {'after': after}, headers=headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b'retry: '))
+        return stream
+
+    async def next_event(self, stream):
+        return (await asyncio.wait_for(anext(stream), 5)).decode()
+
+    def test_events_recorded_on_commit(self):
+        self.reply(self.query, self.consultant, 'Yes')
+        with self.captureOnCommitCallbacks(execute=True):
+            set_query_resolved(self.query, True)
+
+        events = list(ThreadEvent.objects.filter(query=self.query).order_by('id'))
+        self.assertEqual([event.kind for event in events], ['query', 'reply', 'resolved'])
+        self.assertEqual(events[1].data['message'], 'Yes')
+        self.assertEqual(events[1].data['query_user'], self.candidate.id)
+
+    def test_old_events_pruned_without_streams(self):
+        old = ThreadEvent.objects.get(query=self.query)
+        ThreadEvent.objects.filter(pk=old.pk).update(created_at=timezone.now() - live.RETENTION - timedelta(minutes=1))
+
+        with mock.patch.object(live, '_last_prune', 0.0):
+            self.reply(self.query, self.consultant, 'Yes')
+        self.assertFalse(ThreadEvent.objects.filter(pk=old.pk).exists())
+        self.assertEqual(ThreadEvent.objects.filter(query=self.query).get().kind, 'reply')
+
+    def test_not_streamed_under_wsgi(self):
+        self.client.force_login(self.consultant)
+        self.assertEqual(self.client.get(self.url).status_code, 204)
+
+    async def test_reply_streamed_to_job_owner(self):
+        stream = await self.open_stream(self.consultant)
+        await sync_to_async(self.reply)(self.other_query, self.other, 'Any news?')
+
+        event = await self.next_event(stream)
+        self.assertIn('event: reply\n', event)
+        self.assertEqual(json.loads(event.split('data: ')[1])['message'], 'Any news?')
+
+        # A client disconnecting cancels the pending read (as the ASGI
+        # handler does), which leaves nothing behind
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(live.get_hub().stream_count, 0)
+
+    async def test_candidate_only_sees_own_threads(self):
+        stream = await self.open_stream(self.candidate)
+        await sync_to_async(self.reply)(self.other_query, self.consultant, 'For someone else')
+        await sync_to_async(self.reply)(self.query, self.consultant, 'For you')
+
+        event = await self.next_event(stream)
+        self.assertIn('For you', event)
+        await stream.aclose()
+
+    async def test_missed_events_replayed_on_reconnect(self):
+        after = await sync_to_async(live.latest_event_id)()
+        await sync_to_async(self.reply)(self.query, self.consultant, 'While you were away')
+
+        stream = await self.open_stream(self.candidate, **{'Last-Event-ID': str(after)})
+        event = await self.next_event(stream)
+        self.assertIn('While you were away', event)
+        self.assertIn(f'id: {after + 1}\n', event)
+        await stream.aclose()
+
+    async def test_other_consultant_forbidden(self):
+        outsider = await sync_to_async(User.objects.create_user)(
+            email='outsider@example.com', password='pass12345', role='CONSULTANT'
+        )
+        await self.async_client.aforce_login(outsider)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+
+class JobsJsonTests(TestCase):
+    def setUp(self):
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.candidate = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.jobs = [
+            make_job(self.consultant, title=f'Job {i}', job_type='FT' if i % 2 else 'PT',
+                     skills='python, django' if i % 3 else 'java')
+            for i in range(45)
+        ]
+        make_job(self.consultant, title='Closed', is_active=False)
+        SavedJob.objects.create(user=self.candidate, job=self.jobs[-1])
+        Application.objects.create(user=self.candidate, job=self.jobs[-2], resume='r.pdf')
+
+    def pages(self, name, **params):
+        results, cursor = [], None
+        while True:
+            data = self.client.get(reverse(name), dict(params, **({'cursor': cursor} if cursor else {}))).json()
+            results.extend(data['results'])
+            cursor = data['next_cursor']
+            if not cursor:
+                return results
+
+    def test_async_variant_lists_the_same_jobs(self):
+        self.client.force_login(self.candidate)
+        for params in ({}, {'job_type': 'ft'}, {'skills': 'Python', 'job_type': 'FT'}):
+            with self.subTest(**params):
+                listed = self.pages('jobs:jobs_list_json', **params)
+                self.assertEqual(self.pages('jobs:jobs_list_json_async', **params), listed)
+
+        listed = self.pages('jobs:jobs_list_json_async')
+        self.assertEqual([job['id'] for job in listed], [job.id for job in reversed(self.jobs)])
+        self.assertEqual([job['saved'] for job in listed[:2]], [True, False])
+        self.assertEqual([job['applied'] for job in listed[:2]], [False, True])
+
+    def test_consultants_list_their_own_jobs(self):
+        other = User.objects.create_user(email='other@example.com', password='pass12345', role='CONSULTANT')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(reverse('jobs:jobs_list_json_async')).json()['results'], [])
+
+
+class ServerBenchmarkTests(TransactionTestCase):
+    # Requests are served from other threads, which only see committed rows
+
+    def setUp(self):
+        cache.clear()
+        call_command(
+            'seed_perf_data', workers=1, stdout=StringIO(), candidates=5, consultants=2, jobs=20,
+            applications=10, saved_jobs=5, queries=0, replies=0, courses=0, enrollments=0, faqs=8,
+        )
+
+    def test_both_servers_serve_the_same_load(self):
+        from django.contrib.sessions.models import Session
+
+        results = server_benchmark.run(requests=24, concurrency=4, users=2, warmup=1)
+
+        self.assertEqual(set(results['servers']), {'wsgi', 'asgi'})
+        for stats in results['servers'].values():
+            self.assertEqual(stats['requests'], 24)
+            self.assertLessEqual(stats['p50_ms'], stats['p95_ms'])
+            self.assertGreater(stats['peak_threads'], 1)
+            self.assertGreater(stats['peak_memory_kb'], 0)
+        self.assertFalse(Session.objects.exists())
+
+
+class BulkTriageTests(TestCase):
+    def setUp(self):
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.job = make_job(self.consultant)
+        self.other_job = make_job(self.consultant, title='Other')
+        candidates = User.objects.bulk_create([
+            User(email=f'candidate{i}@example.com', password='!') for i in range(MAX_SELECTED + 10)
+        ])
+        self.applications = Application.objects.bulk_create([
+            Application(user=user, job=self.job, resume='r.pdf') for user in candidates
+        ])
+        self.elsewhere = Application.objects.create(user=candidates[0], job=self.other_job, resume='r.pdf')
+        self.url = reverse('jobs:applicants_bulk_action', args=[self.job.id])
+        self.client.force_login(self.consultant)
+
+    def post(self, action, applications, **data):
+        # As the page sends them: one comma separated field
+        ids = ','.join(str(application.id) for application in applications)
+        return self.client.post(self.url, {'action': action, 'application_ids': ids, **data})
+
+    def statuses(self):
+        return dict(Application.objects.values_list('status').annotate(n=Count('id')).order_by())
+
+    def test_shortlist_reports_summary(self):
+        self.post('reject', self.applications[:2])
+        response = self.post('shortlist', self.applications[:5] + [self.elsewhere])
+
+        self.assertEqual(response.json(), {
+            'action': 'shortlist', 'selected': 6, 'updated': 5, 'unchanged': 0, 'not_found': [self.elsewhere.id],
+        })
+        self.assertEqual(self.statuses(), {'SHORTLISTED': 5, 'PENDING': len(self.applications) - 4})
+
+        response = self.post('shortlist', self.applications[:7])
+        self.assertEqual((response.json()['updated'], response.json()['unchanged']), (2, 5))
+
+    def test_query_count_does_not_grow_with_selection(self):
+        def count(applications):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.post('reject', applications)
+            self.assertEqual(response.json()['updated'], len(applications))
+            return len(captured)
+
+        self.assertEqual(count(self.applications[:10]), count(self.applications[10:10 + MAX_SELECTED]))
+
+    def test_meetings(self):
+        selected = self.applications[:3]
+        self.assertEqual(self.post('schedule_meeting', selected).status_code, 400)
+
+        response = self.post('schedule_meeting', selected, meeting_datetime='2026-11-02T10:30')
+        self.assertEqual(response.json()['updated'], 3)
+        application = Application.objects.get(pk=selected[0].pk)
+        self.assertEqual(application.meeting_status, 'SCHEDULED')
+        self.assertEqual(timezone.localtime(application.meeting_datetime).hour, 10)
+
+        # Same time again: nothing to change; new time: all rescheduled
+        self.assertEqual(self.post('schedule_meeting', selected, meeting_datetime='2026-11-02T10:30').json()['updated'], 0)
+        self.assertEqual(self.post('schedule_meeting', selected, meeting_datetime='2026-11-03T09:00').json()['updated'], 3)
+
+        self.assertEqual(self.post('cancel_meeting', self.applications[:4]).json()['updated'], 3)
+        application.refresh_from_db()
+        self.assertEqual((application.meeting_status, application.meeting_datetime), ('NOT_SCHEDULED', None))
+
+    def test_invalid_requests_change_nothing(self):
+        self.assertEqual(self.post('hire', self.applications[:2]).status_code, 400)
+        self.assertEqual(self.post('shortlist', []).status_code, 400)
+        self.assertEqual(
+            self.client.post(self.url, {'action': 'shortlist', 'application_ids': ['x']}).status_code, 400
+        )
+        self.assertEqual(self.post('shortlist', self.applications[:MAX_SELECTED + 1]).status_code, 400)
+
+        # Repeated fields work too
+        ids = [application.id for application in self.applications[:3]]
+        response = self.client.post(self.url, {'action': 'reject', 'application_ids': ids})
+        self.assertEqual(response.json()['updated'], 3)
+        Application.objects.update(status='PENDING')
+
+        outsider = User.objects.create_user(email='outsider@example.com', password='pass12345', role='CONSULTANT')
+        self.client.force_login(outsider)
+        self.assertEqual(self.post('shortlist', self.applications[:2]).status_code, 403)
+        self.assertEqual(self.statuses(), {'PENDING': len(self.applications) + 1})
+
+    def test_dashboard_stats_follow_bulk_changes(self):
+        get_dashboard_stats(self.consultant)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post('shortlist', self.applications[:4])
+        self.assertEqual(get_dashboard_stats(self.consultant)['applications']['SHORTLISTED'], 4)
+
+
+class ApplicantExportTests(TestCase):
+    def setUp(self):
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.job = make_job(self.consultant)
+        self.other_job = make_job(self.consultant, title='Data Engineer')
+        self.candidates = []
+        for i, name in enumerate(['Asha', '=HYPERLINK("x")', 'Ravi']):
+            user = User.objects.create_user(email=f'candidate{i}@example.com', password='pass12345')
+            user.profile.first_name = name
+            user.profile.skills = 'python, django'
+            user.profile.save()
+            self.candidates.append(user)
+        for user in self.candidates:
+            Application.objects.create(user=user, job=self.job, resume='applications/resumes/cv.pdf')
+        Application.objects.create(user=self.candidates[0], job=self.other_job, resume='', status='SHORTLISTED')
+        self.client.force_login(self.consultant)
+
+    def export(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_export_of_a_job(self):
+        response, content = self.export(reverse('jobs:applicants_export', args=[self.job.id]))
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn(f'applicants-job-{self.job.id}.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual([row['first_name'] for row in rows], ['Ravi', '\'=HYPERLINK("x")', 'Asha'])
+        self.assertEqual(rows[0]['skills'], 'python, django')
+        self.assertEqual(rows[0]['resume'], '/media/applications/resumes/cv.pdf')
+        self.assertEqual(rows[0]['meeting_datetime'], '')
+
+    def test_ndjson_export_of_all_jobs(self):
+        response, content = self.export(reverse('jobs:all_applicants_export'), format='ndjson', status='shortlisted')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]['job_title'], rows[0]['email']), ('Data Engineer', 'candidate0@example.com'))
+        self.assertEqual(set(rows[0]), set(export.HEADER))
+
+        _, content = self.export(reverse('jobs:all_applicants_export'), format='ndjson')
+        self.assertEqual(len(content.splitlines()), 4)
+
+    def test_rows_streamed_in_blocks_from_one_query(self):
+        with CaptureQueriesContext(connection) as captured:
+            blocks = list(export.export_applicants(Application.objects.all(), 'csv'))
+        self.assertEqual(len(captured), 1)
+
+        with mock.patch.object(export, 'ROWS_PER_BLOCK', 2):
+            blocks = list(export.export_applicants(Application.objects.all(), 'csv'))
+        # Header and 4 rows, two lines per block
+        self.assertEqual(len(blocks), 3)
+
+    def test_only_the_owner_exports(self):
+        outsider = User.objects.create_user(email='outsider@example.com', password='pass12345', role='CONSULTANT')
+        self.client.force_login(outsider)
+        self.assertEqual(self.client.get(reverse('jobs:applicants_export', args=[self.job.id])).status_code, 403)
+        _, content = self.export(reverse('jobs:all_applicants_export'))
+        self.assertEqual(content.splitlines(), [','.join(export.HEADER)])
+
+        self.client.force_login(self.candidates[0])
+        self.assertEqual(self.client.get(reverse('jobs:all_applicants_export')).status_code, 403)
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('jobs:applicants_export', args=[self.job.id]), {'format': 'xlsx'})
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkImportTests(TestCase):
+    CSV = (
+        'title,company,location,experience,job_type,domain,skills,description,is_active\n'
+        'Go Developer,Vetri,Chennai,3,FT,Backend,"golang, k8s",Build services.,\n'
+        'Data Analyst,Vetri,Pune,two,PT,Data,sql,Analyse data.,yes\n'
+        'ML Engineer,Vetri,Remote,4,Remote,AI,"py, ml",Train models.,no\n'
+    )
+
+    def setUp(self):
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+
+    def job_rows(self, count):
+        return [
+            {
+                'title': f'Role {i}', 'company': 'Vetri', 'location': 'Chennai', 'experience': i % 5,
+                'job_type': 'FT', 'domain': 'Web', 'skills': 'python, django', 'description': 'Build things.',
+            }
+            for i in range(count)
+        ]
+
+    def test_upload_csv(self):
+        self.client.force_login(self.consultant)
+        upload = SimpleUploadedFile('jobs.csv', self.CSV.encode('utf-8-sig'), content_type='text/csv')
+
+        with mock.patch.object(bulk_import, 'invalidate_dashboard') as invalidate_dashboard:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('jobs:import_jobs'), {'file': upload})
+
+        report = response.context['report']
+        self.assertEqual((report['rows'], report['created'], report['invalid']), (3, 2, 1))
+        self.assertEqual(report['errors'], [{'row': 2, 'errors': {'experience': ['Enter a whole number.']}}])
+        invalidate_dashboard.assert_called_once_with([self.consultant.pk])
+
+        go, ml = Job.objects.filter(posted_by=self.consultant).order_by('id')
+        self.assertEqual((go.job_type, go.is_active, ml.job_type, ml.is_active), ('FT', True, 'RM', False))
+        self.assertEqual(set(go.normalized_skills.values_list('name', flat=True)), {'go', 'kubernetes'})
+        self.assertEqual(list(search_jobs(Job.objects.all(), skills='golang')), [go])
+
+    def test_json_array_and_lines_in_batches(self):
+        rows = self.job_rows(25)
+        rows[7]['job_type'] = 'XX'
+        lines = '\n'.join(json.dumps(row) for row in rows)
+
+        # Small reads split objects across chunks
+        with mock.patch.object(bulk_import, 'READ_SIZE', 50):
+            for text in (json.dumps(rows, indent=2), lines):
+                Job.objects.all().delete()
+                report = bulk_import.import_jobs(StringIO(text), 'json', self.consultant, batch_size=10)
+                self.assertEqual((report['rows'], report['created'], report['invalid']), (25, 24, 1))
+                self.assertEqual(report['errors'][0]['row'], 8)
+                self.assertEqual(Job.objects.count(), 24)
+
+        def queries(count):
+            with CaptureQueriesContext(connection) as captured:
+                bulk_import.import_jobs(StringIO(json.dumps(self.job_rows(count))), 'json', self.consultant)
+            return len(captured)
+
+        # Queries per batch, none per row
+        self.assertEqual(queries(10), queries(60))
+
+    def test_unreadable_file_imports_nothing(self):
+        text = json.dumps(self.job_rows(3))[:-40]
+        with self.assertRaisesMessage(bulk_import.ImportFormatError, 'Invalid JSON'):
+            bulk_import.import_jobs(StringIO(text), 'json', self.consultant, batch_size=1)
+        self.assertFalse(Job.objects.exists())
+
+        with self.assertRaisesMessage(bulk_import.ImportFormatError, 'Missing columns: description, domain'):
+            bulk_import.import_jobs(StringIO('title,company,location,experience,job_type,skills\n'), 'csv', self.consultant)
+
+        self.client.force_login(self.consultant)
+        upload = SimpleUploadedFile('jobs.xlsx', b'data')
+        response = self.client.post(reverse('jobs:import_jobs'), {'file': upload})
+        self.assertEqual(response.context['error'], 'Upload a .csv or .json file.')
+
+    def test_dry_run(self):
+        report = bulk_import.import_jobs(StringIO(self.CSV), 'csv', self.consultant, dry_run=True)
+        self.assertEqual((report['created'], report['invalid']), (2, 1))
+        self.assertFalse(Job.objects.exists())
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'jobs.ndjson')
+            report_path = os.path.join(directory, 'report.json')
+            with open(path, 'w') as handle:
+                handle.write('\n'.join(json.dumps(row) for row in self.job_rows(3)) + '\n[1]\n')
+            out = StringIO()
+            call_command('import_jobs', path, consultant='consultant@example.com', report=report_path, stdout=out)
+            with open(report_path) as handle:
+                report = json.load(handle)
+
+        self.assertIn('4 rows read: 3 jobs imported, 1 invalid.', out.getvalue())
+        self.assertEqual(report['errors'][0]['row'], 4)
+        self.assertEqual(Job.objects.filter(posted_by=self.consultant).count(), 3)
+
+        with self.assertRaisesMessage(CommandError, 'No consultant'):
+            call_command('import_jobs', path, consultant='nobody@example.com', stdout=out)
+
+    def test_candidates_cannot_import(self):
+        candidate = User.objects.create_user(email='candidate@example.com', password='pass12345')
+        self.client.force_login(candidate)
+        response = self.client.post(reverse('jobs:import_jobs'), {'file': SimpleUploadedFile('jobs.csv', self.CSV.encode())})
+        self.assertRedirects(response, reverse('jobs:jobs_list'))
+        self.assertFalse(Job.objects.exists())
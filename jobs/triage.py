@@ -0,0 +1,83 @@
+# jobs/triage.py
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .dashboard import invalidate_dashboard
+from .models import Application
+
+# Most applications changed by one bulk action
+MAX_SELECTED = 1000
+
+# Bulk action -> fields it sets (the meeting time is filled in from the request)
+ACTIONS = {
+    'shortlist': {'status': 'SHORTLISTED'},
+    'reject': {'status': 'REJECTED'},
+    'schedule_meeting': {'meeting_status': 'SCHEDULED'},
+    'cancel_meeting': {'meeting_status': 'NOT_SCHEDULED', 'meeting_datetime': None},
+}
+
+
+class TriageError(ValueError):
+    pass
+
+
+def parse_meeting_datetime(value):
+    meeting = parse_datetime(value or '')
+    if meeting is None:
+        raise TriageError("A valid meeting date and time is required.")
+    if timezone.is_naive(meeting):
+        meeting = timezone.make_aware(meeting)
+    return meeting
+
+
+def parse_application_ids(values):
+    """
+    Ids from repeated values and/or comma separated lists ("1,2,3"): one
+    field each would hit DATA_UPLOAD_MAX_NUMBER_FIELDS for large selections.
+    """
+    try:
+        ids = {int(value) for item in values for value in str(item).split(',') if value.strip()}
+    except (TypeError, ValueError):
+        raise TriageError("Application ids must be numbers.")
+    if not ids:
+        raise TriageError("Select at least one application.")
+    if len(ids) > MAX_SELECTED:
+        raise TriageError(f"Select at most {MAX_SELECTED} applications at a time.")
+    return ids
+
+
+def triage_applications(job, application_ids, action, meeting_datetime=None):
+    """
+    Apply a bulk action to applications of `job` in one transaction: one
+    SELECT of the selected ids and one UPDATE of those not already in the
+    target state, however many are selected. Ids of other jobs are left
+    alone and reported as not found.
+
+    The caller checks that the user may manage `job`. Returns a summary
+    of what changed.
+    """
+    if action not in ACTIONS:
+        raise TriageError(f"Unknown action: {action}.")
+    changes = dict(ACTIONS[action])
+    if action == 'schedule_meeting':
+        changes['meeting_datetime'] = parse_meeting_datetime(meeting_datetime)
+    ids = parse_application_ids(application_ids)
+
+    with transaction.atomic():
+        selected = Application.objects.filter(job=job, id__in=ids)
+        found = set(selected.values_list('id', flat=True))
+        # Rows already in the target state are not rewritten
+        updated = selected.exclude(**changes).update(**changes) if found else 0
+        if updated:
+            # The UPDATE bypasses the save signals that keep these fresh
+            owner_id = job.posted_by_id
+            transaction.on_commit(lambda: invalidate_dashboard([owner_id]))
+
+    return {
+        'action': action,
+        'selected': len(ids),
+        'updated': updated,
+        'unchanged': len(found) - updated,
+        'not_found': sorted(ids - found),
+    }
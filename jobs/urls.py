@@ -1,20 +1,29 @@
 from django.urls import path
 from .views import (
     jobs_list_view,
+    jobs_list_json_view,
+    jobs_list_json_async_view,
     job_detail_view,
     save_job_view,
     unsave_job_view,
     apply_job_view,
     saved_jobs_list_view,
     post_job_view,
+    import_jobs_view,
     posted_jobs_view,
     edit_job_view,
     delete_posted_job_view,
     applicants_list_view,
+    applicants_bulk_action_view,
+    applicants_export_view,
+    all_applicants_export_view,
+    resume_search_view,
     applicant_detail_view,
     shortlisted_applicants_view,
     candidate_applied_jobs_view,
     job_queries_view,
+    query_replies_view,
+    job_events_view,
     recommended_jobs_view,
     query_queue_view,  # ✅ Consultant Query Queue
     resolve_query_view     
@@ -30,6 +39,11 @@ urlpatterns = [
     path('', jobs_list_view, name='jobs_list'),
     path('saved/', saved_jobs_list_view, name='saved_jobs'),
     path('post/', post_job_view, name='post_job'),
+    path('import/', import_jobs_view, name='import_jobs'),
+
+    # JSON list (the async variant is for ASGI deployments)
+    path('api/', jobs_list_json_view, name='jobs_list_json'),
+    path('api/async/', jobs_list_json_async_view, name='jobs_list_json_async'),
     path('posted/', posted_jobs_view, name='posted_jobs'),
 
     # ============================
@@ -50,6 +64,10 @@ urlpatterns = [
     # APPLICANTS
     # ============================
     path('<int:job_id>/applicants/', applicants_list_view, name='applicants_list'),
+    path('<int:job_id>/applicants/bulk/', applicants_bulk_action_view, name='applicants_bulk_action'),
+    path('<int:job_id>/applicants/export/', applicants_export_view, name='applicants_export'),
+    path('applicants/export/', all_applicants_export_view, name='all_applicants_export'),
+    path('applicants/search/', resume_search_view, name='resume_search'),
     path('applicant/<int:application_id>/', applicant_detail_view, name='applicant_detail'),
     path('shortlisted/', shortlisted_applicants_view, name='shortlisted_applicants'),
     path('my-applications/', candidate_applied_jobs_view, name='candidate_applied_jobs'),
@@ -60,6 +78,8 @@ urlpatterns = [
     path('<int:job_id>/queries/', job_queries_view, name='job_queries'),
     path('queries/queue/', query_queue_view, name='query_queue'),  # Consultant queue
     path('queries/<int:query_id>/resolve/', resolve_query_view, name='resolve_query'),
+    path('queries/<int:query_id>/replies/', query_replies_view, name='query_replies'),  # "Load more" fragment
+    path('<int:job_id>/queries/events/', job_events_view, name='job_events'),  # Live updates (SSE)
 
     # ============================
     # RECOMMENDED JOBS
@@ -1,12 +1,30 @@
+import io
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponseForbidden
+from django.views.decorators.http import require_POST
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Prefetch, Q
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse,
+)
 
 from .models import Job, SavedJob, Application
 from profiles.models import CandidateProfile
+from profiles.resume_index import fts_available as resume_search_available, search_resumes
+from .bulk_import import FIELDS as IMPORT_FIELDS, ImportFormatError, import_format, import_jobs
+from .counters import set_query_resolved
+from .export import FORMATS as EXPORT_FORMATS, export_applicants
+from .live import latest_event_id, parse_event_id, stream_job_events
+from .facets import get_facets, normalize_filters
 from .forms import JobForm
+from .pagination import CursorPaginator, decode_cursor, encode_cursor, paginate_jobs
+from .search import search_jobs
+from .skills import filter_by_skills
+from .triage import MAX_SELECTED, TriageError, triage_applications
 
 
 # ============================
@@ -17,7 +35,7 @@ def jobs_list_view(request):
     user = request.user
 
     # All active jobs
-    jobs = Job.objects.filter(is_active=True).order_by('-posted_on')
+    jobs = Job.objects.filter(is_active=True).order_by('-posted_on', '-id')
 
     # If consultant, show only their own jobs
     if user.role == 'CONSULTANT':
@@ -26,23 +44,23 @@ def jobs_list_view(request):
     # --------------------
     # Filters (for candidates)
     # --------------------
+    facets = None
     if user.role == 'CANDIDATE':
-        experience = request.GET.get('experience')
-        location = request.GET.get('location')
-        job_type = request.GET.get('job_type')
-        domain = request.GET.get('domain')
-        skills = request.GET.get('skills')
-
-        if experience:
-            jobs = jobs.filter(experience__lte=experience)
-        if location:
-            jobs = jobs.filter(location__icontains=location)
-        if job_type:
-            jobs = jobs.filter(job_type=job_type)
-        if domain:
-            jobs = jobs.filter(domain__icontains=domain)
-        if skills:
-            jobs = jobs.filter(skills__icontains=skills)
+        filters = normalize_filters(request.GET)
+
+        if 'experience' in filters:
+            jobs = jobs.filter(experience__lte=filters['experience'])
+        if 'job_type' in filters:
+            jobs = jobs.filter(job_type=filters['job_type'])
+
+        # Skills use the indexed skill taxonomy, free text goes through
+        # the full-text index (ranked by relevance)
+        if 'skills' in filters:
+            jobs = filter_by_skills(jobs, filters['skills'])
+        jobs = search_jobs(jobs, location=filters.get('location'), domain=filters.get('domain'))
+
+        # Result counts per job type / location / domain / experience
+        facets = get_facets(jobs, filters)
 
     # --------------------
     # Saved & Applied jobs (⭐ only for candidates)
@@ -54,20 +72,119 @@ def jobs_list_view(request):
         applied_job_ids = set(Application.objects.filter(user=user).values_list('job_id', flat=True))
 
     # --------------------
-    # Pagination
+    # Pagination (cursor based unless results are ranked by relevance)
     # --------------------
-    paginator = Paginator(jobs, 6)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # The facet groups already hold the exact total, no COUNT needed
+    count = sum(value['count'] for value in facets['job_type']) if facets is not None else None
+    page_obj = paginate_jobs(request, jobs, 6, count=count)
 
     return render(request, 'jobs/jobs_list.html', {
         'page_obj': page_obj,
         'filters': request.GET,
         'saved_job_ids': saved_job_ids,
         'applied_job_ids': applied_job_ids,
+        'facets': facets,
     })
 
 
+# ============================
+# JOB LIST (JSON)
+# ============================
+JSON_JOBS_PER_PAGE = 20
+JSON_JOB_FIELDS = (
+    'id', 'title', 'company', 'location', 'experience', 'job_type', 'domain', 'skills', 'posted_on',
+    'applications_count',
+)
+
+
+def json_jobs_queryset(user, filters):
+    """
+    Jobs of the JSON list, newest first, with the jobs list filters
+    except skills (which needs a query to resolve, see the views).
+    """
+    jobs = Job.objects.filter(is_active=True).only(*JSON_JOB_FIELDS)
+    if user.role == 'CONSULTANT':
+        return jobs.filter(posted_by=user)
+    if 'experience' in filters:
+        jobs = jobs.filter(experience__lte=filters['experience'])
+    if 'job_type' in filters:
+        jobs = jobs.filter(job_type=filters['job_type'])
+    return search_jobs(jobs, location=filters.get('location'), domain=filters.get('domain'))
+
+
+def json_jobs_payload(page, saved_job_ids, applied_job_ids):
+    return {
+        'results': [
+            {
+                'id': job.id,
+                'title': job.title,
+                'company': job.company,
+                'location': job.location,
+                'experience': job.experience,
+                'job_type': job.job_type,
+                'domain': job.domain,
+                'skills': job.skills,
+                'posted_on': job.posted_on.isoformat(),
+                'applicants': job.applications_count,
+                'saved': job.id in saved_job_ids,
+                'applied': job.id in applied_job_ids,
+            }
+            for job in page
+        ],
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    }
+
+
+@login_required
+def jobs_list_json_view(request):
+    """
+    Active jobs as JSON, newest first, by cursor (?cursor=), with the
+    filters of the jobs list.
+    """
+    user = request.user
+    filters = normalize_filters(request.GET) if user.role == 'CANDIDATE' else {}
+    jobs = json_jobs_queryset(user, filters)
+    if 'skills' in filters:
+        jobs = filter_by_skills(jobs, filters['skills'])
+    page = CursorPaginator(jobs, JSON_JOBS_PER_PAGE).get_page(request.GET.get('cursor'))
+
+    saved_job_ids = applied_job_ids = set()
+    if user.role == 'CANDIDATE' and page.object_list:
+        ids = [job.id for job in page]
+        saved_job_ids = set(SavedJob.objects.filter(user=user, job_id__in=ids).values_list('job_id', flat=True))
+        applied_job_ids = set(Application.objects.filter(user=user, job_id__in=ids).values_list('job_id', flat=True))
+
+    return JsonResponse(json_jobs_payload(page, saved_job_ids, applied_job_ids))
+
+
+@login_required
+async def jobs_list_json_async_view(request):
+    """
+    jobs_list_json_view() with the async ORM, for ASGI deployments.
+    """
+    user = await request.auser()
+    filters = normalize_filters(request.GET) if user.role == 'CANDIDATE' else {}
+    jobs = json_jobs_queryset(user, filters)
+    if 'skills' in filters:
+        jobs = await sync_to_async(filter_by_skills)(jobs, filters['skills'])
+    page = await CursorPaginator(jobs, JSON_JOBS_PER_PAGE).aget_page(request.GET.get('cursor'))
+
+    saved_job_ids = applied_job_ids = set()
+    if user.role == 'CANDIDATE' and page.object_list:
+        ids = [job.id for job in page]
+        saved_job_ids = {
+            job_id async for job_id in
+            SavedJob.objects.filter(user=user, job_id__in=ids).values_list('job_id', flat=True)
+        }
+        applied_job_ids = {
+            job_id async for job_id in
+            Application.objects.filter(user=user, job_id__in=ids).values_list('job_id', flat=True)
+        }
+
+    return JsonResponse(json_jobs_payload(page, saved_job_ids, applied_job_ids))
+
+
 # ============================
 # JOB DETAIL
 # ============================
@@ -95,7 +212,7 @@ def job_detail_view(request, job_id):
     if user.role == 'CONSULTANT' and job.posted_by == user:
         is_owner = True
 
-    applicants_count = job.applications.count()  # Total applicants for this job
+    applicants_count = job.applications_count  # Total applicants for this job
 
     return render(request, 'jobs/job_detail.html', {
         'job': job,
@@ -220,6 +337,35 @@ def post_job_view(request):
     return render(request, 'jobs/post_job.html')
 
 
+# ============================
+# BULK JOB IMPORT (CONSULTANT)
+# ============================
+@login_required
+def import_jobs_view(request):
+    if request.user.role != 'CONSULTANT':
+        return redirect('jobs:jobs_list')
+
+    report = error = None
+    if request.method == 'POST':
+        upload = request.FILES.get('file')
+        if upload is None:
+            error = "Choose a file to import."
+        else:
+            try:
+                file_format = import_format(upload.name, request.POST.get('format'))
+                # Read as text without loading the upload into memory
+                stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+                report = import_jobs(stream, file_format, request.user, dry_run=bool(request.POST.get('dry_run')))
+            except ImportFormatError as exc:
+                error = str(exc)
+
+    return render(request, 'jobs/import_jobs.html', {
+        'report': report,
+        'error': error,
+        'fields': IMPORT_FIELDS,
+    })
+
+
 # ============================
 # POSTED JOBS LIST (CONSULTANT)
 # ============================
@@ -230,10 +376,10 @@ def posted_jobs_view(request):
 
     jobs = Job.objects.filter(
         posted_by=request.user
-    ).order_by('-posted_on')
+    ).order_by('-posted_on', '-id')
 
     return render(request, 'jobs/posted_jobs.html', {
-        'jobs': jobs
+        'jobs': paginate_jobs(request, jobs, 10)
     })
 
 
@@ -296,9 +442,102 @@ def applicants_list_view(request, job_id):
 
     return render(request, 'jobs/applicants_list.html', {
         'job': job,
-        'applications': applications
+        'applications': applications,
+        'max_selected': MAX_SELECTED,
+    })
+
+
+@login_required
+@require_POST
+def applicants_bulk_action_view(request, job_id):
+    """
+    Shortlist, reject or schedule/cancel meetings for many applicants of a
+    job at once. Answers with a JSON summary.
+    """
+    job = get_object_or_404(Job, id=job_id)
+    if request.user.role != 'CONSULTANT' or job.posted_by_id != request.user.id:
+        return JsonResponse({'error': "You are not allowed to manage applicants for this job."}, status=403)
+
+    try:
+        summary = triage_applications(
+            job,
+            request.POST.getlist('application_ids'),
+            request.POST.get('action'),
+            meeting_datetime=request.POST.get('meeting_datetime'),
+        )
+    except TriageError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse(summary)
+
+# ============================
+#  Applicants Export (CSV / NDJSON)
+# ============================
+def export_response(request, applications, filename):
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest(f"Unknown export format: {export_format}.")
+    status = request.GET.get('status')
+    if status:
+        applications = applications.filter(status=status.upper())
+
+    response = StreamingHttpResponse(
+        export_applicants(applications, export_format), content_type=EXPORT_FORMATS[export_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
+@login_required
+def applicants_export_view(request, job_id):
+    job = get_object_or_404(Job, id=job_id)
+    if request.user.role != 'CONSULTANT' or job.posted_by_id != request.user.id:
+        return HttpResponseForbidden("You are not allowed to export applicants for this job.")
+    return export_response(request, Application.objects.filter(job=job), f'applicants-job-{job.id}')
+
+
+@login_required
+def all_applicants_export_view(request):
+    # Applicants of every job the consultant posted
+    if request.user.role != 'CONSULTANT':
+        return HttpResponseForbidden("Only consultants can export applicants.")
+    applications = Application.objects.filter(job__in=Job.objects.filter(posted_by=request.user).values('id'))
+    return export_response(request, applications, 'applicants')
+
+
+# ============================
+#  Resume Search
+# ============================
+@login_required
+def resume_search_view(request):
+    """
+    The consultant's applicants whose resumes match the query, best match
+    first, each with their latest application and a matching excerpt.
+    """
+    if request.user.role != 'CONSULTANT':
+        return HttpResponseForbidden("Only consultants can search resumes.")
+
+    query = request.GET.get('q', '').strip()
+    results = []
+    if query:
+        applications = Application.objects.filter(job__in=Job.objects.filter(posted_by=request.user).values('id'))
+        matches = search_resumes(query, applications.values('user_id'))
+
+        latest = {}
+        matched = applications.filter(user_id__in=[user_id for user_id, _ in matches])
+        for application in matched.select_related('user', 'job').order_by('-applied_at'):
+            latest.setdefault(application.user_id, application)
+        results = [
+            {'application': latest[user_id], 'snippet': snippet}
+            for user_id, snippet in matches if user_id in latest
+        ]
+
+    return render(request, 'jobs/resume_search.html', {
+        'query': query,
+        'results': results,
+        'available': resume_search_available(),
     })
 
+
 # ============================
 #  Applicants Detail
 # ============================
@@ -365,10 +604,11 @@ def shortlisted_applicants_view(request):
         return redirect('jobs:jobs_list')
 
     # Get all applications where the consultant owns the job AND status is SHORTLISTED
+    # IN (consultant's jobs) lets the (job, status) index drive the lookup
     applications = Application.objects.filter(
-        job__posted_by=request.user,
+        job__in=Job.objects.filter(posted_by=request.user).values('id'),
         status='SHORTLISTED'
-    ).order_by('-applied_at')
+    ).select_related('user', 'job').order_by('-applied_at')
 
     return render(request, 'jobs/shortlisted_applicants.html', {
         'applications': applications
@@ -387,7 +627,7 @@ def candidate_applied_jobs_view(request):
     user = request.user
 
     # Get all applications of this candidate
-    applications = Application.objects.filter(user=user).order_by('-applied_at')
+    applications = Application.objects.filter(user=user).select_related('job').order_by('-applied_at')
 
     return render(request, 'jobs/candidate_applied_jobs.html', {
         'applications': applications
@@ -403,55 +643,16 @@ from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from .models import Job, JobQuery, JobQueryReply
 
-@login_required
-def job_queries_view(request, job_id):
-    job = get_object_or_404(Job, id=job_id)
-    user = request.user
-
-    # -----------------------------
-    # Permission check
-    # -----------------------------
-    if user.role == 'CANDIDATE':
-        queries = JobQuery.objects.filter(job=job, user=user).order_by('created_at')
-    elif user.role == 'CONSULTANT' and job.posted_by == user:
-        queries = JobQuery.objects.filter(job=job).order_by('created_at')
-    else:
-        return redirect('jobs:jobs_list')
-
-    # -----------------------------
-    # Candidate submits new query
-    # -----------------------------
-    if request.method == 'POST' and user.role == 'CANDIDATE':
-        question = request.POST.get('question')
-        if question:
-            JobQuery.objects.create(job=job, user=user, question=question)
-            return redirect('jobs:job_queries', job_id=job.id)
-
-    # -----------------------------
-    # Consultant replies to a query
-    # -----------------------------
-    if request.method == 'POST' and user.role == 'CONSULTANT':
-        query_id = request.POST.get('query_id')
-        message = request.POST.get('message')
-        if query_id and message:
-            query = get_object_or_404(JobQuery, id=query_id, job=job)
-            JobQueryReply.objects.create(query=query, user=user, message=message)
-            return redirect('jobs:job_queries', job_id=job.id)
-
-    return render(request, 'jobs/job_queries.html', {
-        'job': job,
-        'queries': queries,
-        'user': user
-    })
-
 # -----------------------------
 # Recomended Jobs
 # -----------------------------
-from django.db.models import Q
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
 from profiles.models import CandidateProfile
 from .models import Job, Application, SavedJob
+from .recommendations import cached_recommend_job_ids
+
+RECOMMENDED_JOBS_LIMIT = 90
 
 
 @login_required
@@ -463,29 +664,22 @@ def recommended_jobs_view(request):
 
     profile = getattr(user, 'profile', None)
 
-    if not profile or not profile.skills:
-        jobs = Job.objects.none()
-    else:
-        skills = [s.strip().lower() for s in profile.skills.split(',') if s.strip()]
-
-        query = Q()
-        for skill in skills:
-            query |= (
-                Q(title__icontains=skill) |
-                Q(domain__icontains=skill) |
-                Q(description__icontains=skill)
-            )
-
-        jobs = Job.objects.filter(query).distinct().order_by('-posted_on')
-
     # Applied & Saved jobs
-    applied_job_ids = Application.objects.filter(
+    applied_job_ids = set(Application.objects.filter(
         user=user
-    ).values_list('job_id', flat=True)
+    ).values_list('job_id', flat=True))
 
-    saved_job_ids = SavedJob.objects.filter(
+    saved_job_ids = set(SavedJob.objects.filter(
         user=user
-    ).values_list('job_id', flat=True)
+    ).values_list('job_id', flat=True))
+
+    if not profile or not profile.skills:
+        jobs = []
+    else:
+        # Ranked by relevance to the profile skills, applied jobs left out
+        job_ids = cached_recommend_job_ids(profile, exclude=applied_job_ids, limit=RECOMMENDED_JOBS_LIMIT)
+        jobs_by_id = Job.objects.in_bulk(job_ids)
+        jobs = [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
 
     paginator = Paginator(jobs, 9)
     page_number = request.GET.get('page')
@@ -529,8 +723,7 @@ def resolve_query_view(request, query_id):
     if request.user.role != 'CONSULTANT' or query.job.posted_by != request.user:
         return redirect('jobs:jobs_list')
 
-    query.is_resolved = not query.is_resolved
-    query.save()
+    set_query_resolved(query, not query.is_resolved)
 
     return redirect('jobs:job_queries', job_id=query.job.id)
 
@@ -556,6 +749,26 @@ def query_queue_view(request):
 
 
 
+QUERIES_PER_PAGE = 10
+REPLIES_PER_THREAD = 5
+REPLIES_PER_LOAD = 20
+
+
+def thread_replies():
+    # Replies in thread order, with their authors and profiles
+    return JobQueryReply.objects.select_related('user__profile').order_by('created_at', 'id')
+
+
+def replies_page(replies, limit):
+    """
+    First `limit` replies of a list fetched with one extra row, and the
+    cursor to load the rest from (None when there is no more).
+    """
+    shown = replies[:limit]
+    more_cursor = encode_cursor(shown[-1], 'next', 'created_at') if len(replies) > limit else None
+    return shown, more_cursor
+
+
 @login_required
 def job_queries_view(request, job_id):
     job = get_object_or_404(Job, id=job_id)
@@ -568,28 +781,101 @@ def job_queries_view(request, job_id):
     else:
         return redirect('jobs:jobs_list')
 
-    # Send message
     if request.method == 'POST':
-        if 'message' in request.POST:
-            query_id = request.POST.get('query_id')
-            message = request.POST.get('message')
+        # Candidate asks a new question
+        if user.role == 'CANDIDATE' and request.POST.get('question'):
+            JobQuery.objects.create(job=job, user=user, question=request.POST['question'])
+            return redirect('jobs:job_queries', job_id=job.id)
 
-            query = get_object_or_404(JobQuery, id=query_id)
+        # Send message
+        if request.POST.get('message'):
+            query = get_object_or_404(queries, id=request.POST.get('query_id'))
             JobQueryReply.objects.create(
                 query=query,
                 user=user,
-                message=message
+                message=request.POST['message']
             )
-
             return redirect('jobs:job_queries', job_id=job.id)
 
         # Mark resolved
         if 'resolve' in request.POST and user.role == 'CONSULTANT':
-            query_id = request.POST.get('query_id')
-            JobQuery.objects.filter(id=query_id).update(is_resolved=True)
+            query = JobQuery.objects.filter(id=request.POST.get('query_id'), job=job).first()
+            if query:
+                set_query_resolved(query, True)
             return redirect('jobs:job_queries', job_id=job.id)
 
+    # A page of threads with the first replies of each (authors and profiles
+    # included): the same three queries however long the threads are
+    queries = queries.select_related('user__profile').prefetch_related(
+        Prefetch('replies', queryset=thread_replies()[:REPLIES_PER_THREAD + 1], to_attr='first_replies')
+    )
+    page = CursorPaginator(queries, QUERIES_PER_PAGE, field='created_at').get_page(request.GET.get('cursor'))
+    for query in page:
+        query.shown_replies, query.more_replies_cursor = replies_page(query.first_replies, REPLIES_PER_THREAD)
+
     return render(request, 'jobs/job_queries.html', {
         'job': job,
-        'queries': queries
+        'queries': page,
+        # Live updates pick up from here
+        'last_event_id': latest_event_id(),
     })
+
+
+@login_required
+def query_replies_view(request, query_id):
+    """
+    "Load more" fragment: the next replies of a thread after a cursor.
+    """
+    query = get_object_or_404(JobQuery.objects.select_related('job'), id=query_id)
+    user = request.user
+    if not (
+        (user.role == 'CANDIDATE' and query.user_id == user.id)
+        or (user.role == 'CONSULTANT' and query.job.posted_by_id == user.id)
+    ):
+        return HttpResponseForbidden("You are not allowed to view this thread.")
+
+    replies = thread_replies().filter(query=query)
+    position = decode_cursor(request.GET.get('after'))
+    if position:
+        created_at, reply_id, _ = position
+        replies = replies.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=reply_id))
+    replies, more_cursor = replies_page(list(replies[:REPLIES_PER_LOAD + 1]), REPLIES_PER_LOAD)
+
+    return render(request, 'jobs/query_replies.html', {
+        'query': query,
+        'replies': replies,
+        'more_cursor': more_cursor,
+    })
+
+
+@login_required
+async def job_events_view(request, job_id):
+    """
+    Live updates of the query threads of a job, as Server-Sent Events.
+    Needs an ASGI server: a held-open stream would tie up a WSGI worker,
+    so there the browser is told not to reconnect (204) and the page
+    works as before, refreshed by reload.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    user = await request.auser()
+    posted_by_id = await Job.objects.filter(id=job_id).values_list('posted_by_id', flat=True).afirst()
+    if posted_by_id is None:
+        raise Http404("Job not found.")
+    if user.role == 'CANDIDATE':
+        only_user_id = user.id
+    elif user.role == 'CONSULTANT' and posted_by_id == user.id:
+        only_user_id = None
+    else:
+        return HttpResponseForbidden("You are not allowed to view these queries.")
+
+    # EventSource resends the last id it saw when it reconnects
+    after = parse_event_id(request.headers.get('Last-Event-ID', request.GET.get('after')))
+    response = StreamingHttpResponse(
+        stream_job_events(job_id, only_user_id, after),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: pass events through unbuffered
+    return response
@@ -1,9 +1,10 @@
 from django.contrib import admin
-from .models import CandidateProfile
+from .models import CandidateProfile, ResumeBlob, ResumeText
 
 class CandidateProfileAdmin(admin.ModelAdmin):
     # Replace 'full_name' with 'first_name' and 'last_name' or create a callable
     list_display = ('user', 'first_name', 'last_name', 'phone', 'location', 'experience_years')
+    exclude = ('normalized_skills',)  # derived from skills
 
     # Optional: if you want a single column showing full name
     # def full_name(self, obj):
@@ -12,3 +13,19 @@ class CandidateProfileAdmin(admin.ModelAdmin):
     # list_display = ('user', 'full_name', 'phone', 'location', 'experience_years')
 
 admin.site.register(CandidateProfile, CandidateProfileAdmin)
+
+
+@admin.register(ResumeBlob)
+class ResumeBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'ref_count', 'created_at')
+    search_fields = ('name',)
+    # Counted by signals (profiles/resumes.py)
+    readonly_fields = ('name', 'ref_count', 'created_at')
+
+
+@admin.register(ResumeText)
+class ResumeTextAdmin(admin.ModelAdmin):
+    list_display = ('digest', 'error', 'extracted_at')
+    search_fields = ('digest',)
+    # Written by `manage.py index_resumes` (profiles/resume_index.py)
+    readonly_fields = ('digest', 'text', 'error', 'extracted_at')
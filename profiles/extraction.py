@@ -0,0 +1,275 @@
+# profiles/extraction.py
+"""
+Plain-text extraction from resume files (PDF and DOCX). Everything here
+works on bytes and touches neither the database nor storage, so it can
+run in worker processes (see profiles/resume_index.py).
+
+Only the standard library is used: a DOCX is a zip of WordprocessingML,
+and for a PDF the text-showing operators of its content streams are read.
+That covers resumes written by word processors and PDF exporters; text
+drawn with embedded two-byte (CID) fonts, scans and legacy .doc files
+yield no text and are reported as such.
+"""
+import io
+import os
+import re
+import unicodedata
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+# Longest text kept per resume; a resume past this is not one
+MAX_TEXT_LENGTH = 100_000
+# Largest decompressed part read from a file (zip member or PDF stream)
+MAX_PART_SIZE = 20 * 1024 * 1024
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+CONTROL_RE = re.compile(r'[\x00-\x08\x0b-\x1f\x7f-\x9f\u200b-\u200f\ufeff]')
+SPACE_RE = re.compile(r'[^\S\n]+')
+
+
+class ExtractionError(ValueError):
+    pass
+
+
+def normalize_text(text):
+    """
+    NFKC-normalize, drop control characters, collapse runs of spaces and
+    blank lines, and cut to MAX_TEXT_LENGTH.
+    """
+    text = CONTROL_RE.sub('', unicodedata.normalize('NFKC', text))
+    lines = (SPACE_RE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)[:MAX_TEXT_LENGTH]
+
+
+def extract_text(data, filename):
+    """
+    Normalized text of a resume file. Returns (text, error): the error is
+    an empty string on success and a short reason otherwise.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    reader = READERS.get(extension)
+    if reader is None:
+        return '', f"Unsupported file type {extension or '(none)'}."
+    try:
+        text = normalize_text(reader(data))
+    except Exception as exc:
+        # A damaged upload can fail in zipfile, zlib or the readers in many
+        # ways (zlib.error, NotImplementedError, EOFError...): one bad file
+        # is reported, it must not stop the indexing of the others
+        return '', f"Unreadable {extension[1:].upper()}: {exc or type(exc).__name__}"[:200]
+    if not text:
+        return '', "No text found."
+    return text, ''
+
+
+# ----------------------------
+# DOCX
+# ----------------------------
+def docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        if archive.getinfo('word/document.xml').file_size > MAX_PART_SIZE:
+            raise ExtractionError("document too large.")
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+
+    paragraphs = []
+    for paragraph in root.iter(WORD_NS + 'p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == WORD_NS + 't':
+                parts.append(node.text or '')
+            elif node.tag == WORD_NS + 'tab':
+                parts.append(' ')
+            elif node.tag in (WORD_NS + 'br', WORD_NS + 'cr'):
+                parts.append('\n')
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs)
+
+
+# ----------------------------
+# PDF
+# ----------------------------
+STREAM_RE = re.compile(rb'stream\r?\n')
+DELIMITERS = b'()<>[]{}/%'
+WHITESPACE = b' \t\r\n\f\x00'
+LITERAL_ESCAPES = {
+    ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b', ord('f'): b'\f',
+    ord('('): b'(', ord(')'): b')', ord('\\'): b'\\',
+}
+# A TJ offset (thousandths of an em) wider than this separates words
+WORD_GAP = 200
+# Baselines closer than this (in text space units) are the same line
+LINE_TOLERANCE = 2
+
+
+def pdf_text(data):
+    if not data.startswith(b'%PDF'):
+        raise ExtractionError("not a PDF file.")
+
+    texts = []
+    position = 0
+    while True:
+        match = STREAM_RE.search(data, position)
+        if match is None:
+            break
+        end = data.find(b'endstream', match.end())
+        if end < 0:
+            break
+        content = _decoded_stream(data[match.end():end])
+        if content is not None and b'BT' in content:
+            texts.append(_content_text(content))
+        position = end + len(b'endstream')
+    return '\n'.join(texts)
+
+
+def _decoded_stream(raw):
+    """
+    FlateDecode data inflated, uncompressed data as is; None for anything
+    else (images, fonts in other encodings).
+    """
+    try:
+        return zlib.decompressobj().decompress(raw, MAX_PART_SIZE)
+    except zlib.error:
+        pass
+    return raw if b'BT' in raw and b'ET' in raw else None
+
+
+def _content_text(content):
+    parts = []
+    operands = []
+    # Baseline of the text position and of the last text shown; text moved
+    # to another baseline starts a new line, moved along it a new word
+    y, line_y, moved = 0.0, None, False
+    for kind, value in _tokens(content):
+        if kind != 'operator':
+            operands.append((kind, value))
+            continue
+
+        numbers = [item for kind, item in operands if kind == 'number']
+        if value in ('Tj', 'TJ', "'", '"'):
+            if value in ("'", '"'):
+                line_y = None
+            if moved or line_y is None:
+                if parts:
+                    parts.append('\n' if line_y is None or abs(y - line_y) > LINE_TOLERANCE else ' ')
+                line_y, moved = y, False
+            for kind, item in (operands if value == 'TJ' else operands[-1:]):
+                if kind == 'string':
+                    parts.append(_decode_string(item))
+                elif kind == 'number' and item < -WORD_GAP:
+                    parts.append(' ')
+        elif value == 'BT':
+            y, moved = 0.0, True
+        elif value == 'Tm' and len(numbers) == 6:
+            y, moved = numbers[5], True
+        elif value in ('Td', 'TD') and len(numbers) == 2:
+            y, moved = y + numbers[1], True
+        elif value == 'T*':
+            line_y = None
+        operands = []
+    return ''.join(parts)
+
+
+def _decode_string(raw):
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', 'ignore')
+    text = raw.decode('latin-1')
+    # Glyph ids of an embedded font rather than characters
+    if sum(char < ' ' for char in text) * 2 > len(text):
+        return ''
+    return text
+
+
+def _tokens(content):
+    """
+    ('string', bytes), ('number', float) and ('operator', str) tokens of a
+    content stream; names, arrays brackets and dictionaries are skipped.
+    """
+    index, length = 0, len(content)
+    while index < length:
+        char = content[index]
+        if char in WHITESPACE:
+            index += 1
+        elif char == ord('%'):
+            index = _line_end(content, index)
+        elif char == ord('('):
+            value, index = _literal_string(content, index + 1)
+            yield 'string', value
+        elif char == ord('<'):
+            if content[index + 1:index + 2] == b'<':
+                index += 2
+                continue
+            end = content.find(b'>', index)
+            end = length if end < 0 else end
+            digits = re.sub(rb'[^0-9A-Fa-f]', b'', content[index + 1:end])
+            yield 'string', bytes.fromhex((digits + b'0' * (len(digits) % 2)).decode())
+            index = end + 1
+        elif char in DELIMITERS:
+            # ')' '>' '[' ']' '{' '}' and names
+            start = index
+            index += 1
+            if char == ord('/'):
+                while index < length and content[index] not in WHITESPACE and content[index] not in DELIMITERS:
+                    index += 1
+            elif content[start:index + 1] == b'>>':
+                index += 1
+        else:
+            start = index
+            while index < length and content[index] not in WHITESPACE and content[index] not in DELIMITERS:
+                index += 1
+            word = content[start:index]
+            try:
+                yield 'number', float(word)
+            except ValueError:
+                if word == b'ID':
+                    # Inline image data runs up to EI
+                    end = content.find(b'EI', index)
+                    index = length if end < 0 else end + 2
+                else:
+                    yield 'operator', word.decode('latin-1')
+
+
+def _line_end(content, index):
+    while index < len(content) and content[index] not in b'\r\n':
+        index += 1
+    return index
+
+
+def _literal_string(content, index):
+    value = bytearray()
+    depth = 1
+    length = len(content)
+    while index < length:
+        char = content[index]
+        if char == ord('\\') and index + 1 < length:
+            escaped = content[index + 1]
+            if escaped in LITERAL_ESCAPES:
+                value += LITERAL_ESCAPES[escaped]
+                index += 2
+            elif ord('0') <= escaped <= ord('7'):
+                digits = re.match(rb'[0-7]{1,3}', content[index + 1:index + 4]).group()
+                value.append(int(digits, 8) & 0xFF)
+                index += 1 + len(digits)
+            elif escaped in b'\r\n':
+                # Line continuation
+                index += 3 if content[index + 1:index + 3] == b'\r\n' else 2
+            else:
+                value.append(escaped)
+                index += 2
+            continue
+        if char == ord('('):
+            depth += 1
+        elif char == ord(')'):
+            depth -= 1
+            if not depth:
+                return bytes(value), index + 1
+        value.append(char)
+        index += 1
+    return bytes(value), index
+
+
+READERS = {
+    '.pdf': pdf_text,
+    '.docx': docx_text,
+}
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from profiles.resumes import dedupe_resumes, reconcile_blobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Move resumes stored per upload (resumes/user_<id>/, applications/resumes/) to content-addressed "
+        "blobs, storing identical files once, and recompute the blob reference counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report what would be moved and freed",
+        )
+
+    def handle(self, *args, **options):
+        fix = not options['dry_run']
+        result = dedupe_resumes(fix=fix, stdout=self.stdout if options['verbosity'] > 1 else None)
+
+        for name in result['missing']:
+            self.stdout.write(self.style.WARNING(f"Missing from storage, left as is: {name}"))
+
+        if fix:
+            summary = (
+                f"{result['files']} files moved to {result['blobs']} blobs, {result['rows']} rows updated, "
+                f"{filesizeformat(result['bytes_freed'])} freed."
+            )
+        else:
+            drift = reconcile_blobs(fix=False)
+            summary = (
+                f"{result['files']} files would move to {result['blobs']} blobs, freeing "
+                f"{filesizeformat(result['bytes_freed'])}; {len(drift['drift'])} blob counts off, "
+                f"{len(drift['unreferenced'])} blobs unreferenced."
+            )
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,81 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from profiles.models import ResumeIndexQueue
+from profiles.resume_index import BATCH_SIZE, fts_available, index_queued, optimize_index, queue_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract the text of new resumes and update the resume search index for the candidates queued "
+        "since resumes were uploaded or deleted. Run it with --watch next to the web server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Queue every candidate first, e.g. to backfill")
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes extracting text (default: one per CPU)",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Number of candidates indexed per batch (default: {BATCH_SIZE})",
+        )
+        parser.add_argument('--watch', action='store_true', help="Keep running, working the queue as it fills")
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help="Seconds between queue checks with --watch (default: 5)",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many candidates are queued")
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING("Resume search needs SQLite FTS5; nothing to do."))
+            return
+
+        if options['all'] and not options['dry_run']:
+            self.stdout.write(f"{queue_all()} candidates queued.")
+        if options['dry_run']:
+            self.stdout.write(f"{ResumeIndexQueue.objects.count()} candidates queued.")
+            return
+
+        executor = None
+        if options['workers'] > 1:
+            executor = ProcessPoolExecutor(max_workers=options['workers'])
+        try:
+            while True:
+                self.work_queue(executor, options)
+                if not options['watch']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def work_queue(self, executor, options):
+        counts = index_queued(
+            batch_size=options['batch_size'],
+            executor=executor,
+            # Enough files in flight to keep every worker busy
+            window=2 * options['workers'],
+        )
+        if not counts['candidates'] and options['watch']:
+            return
+        if counts['indexed'] + counts['removed'] > 1000:
+            optimize_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['candidates']} candidates checked: {counts['extracted']} resumes extracted "
+            f"({counts['failed']} without text), {counts['indexed']} index rows written, "
+            f"{counts['removed']} removed."
+        ))
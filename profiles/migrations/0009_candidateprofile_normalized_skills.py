@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_skill_taxonomy'),
+        ('profiles', '0008_rename_location_consultantprofile_company_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='normalized_skills',
+            field=models.ManyToManyField(blank=True, related_name='candidates', to='jobs.skill'),
+        ),
+    ]
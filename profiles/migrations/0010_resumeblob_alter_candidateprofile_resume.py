@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:05
+
+import django.core.validators
+import profiles.models
+import profiles.resumes
+import profiles.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0009_candidateprofile_normalized_skills'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='candidateprofile',
+            name='resume',
+            field=models.FileField(blank=True, null=True, storage=profiles.resumes.get_resume_storage, upload_to=profiles.models.user_resume_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx']), profiles.validators.validate_file_size_5mb]),
+        ),
+    ]
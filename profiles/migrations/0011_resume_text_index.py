@@ -0,0 +1,63 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:14
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+
+# The index as this migration creates it (profiles.resume_index may change later)
+FTS_TABLE = 'profiles_resume_fts'
+
+
+def create_resume_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        # digests: the content hashes the row was built from
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "text, digests UNINDEXED, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+
+    # Queue every candidate with a resume, for `index_resumes` to index
+    ResumeIndexQueue = apps.get_model('profiles', 'ResumeIndexQueue')
+    user_ids = set()
+    for model in (apps.get_model('profiles', 'CandidateProfile'), apps.get_model('jobs', 'Application')):
+        user_ids.update(model.objects.exclude(resume='').exclude(resume=None).values_list('user_id', flat=True))
+    now = timezone.now()
+    ResumeIndexQueue.objects.bulk_create(
+        [ResumeIndexQueue(user_id=user_id, queued_at=now) for user_id in user_ids], batch_size=1000
+    )
+
+
+def drop_resume_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0010_resumeblob_alter_candidateprofile_resume'),
+        ('jobs', '0014_alter_application_resume'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeIndexQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.PositiveBigIntegerField(unique=True)),
+                ('queued_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('text', models.TextField(blank=True)),
+                ('error', models.CharField(blank=True, max_length=200)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_resume_index, drop_resume_index),
+    ]
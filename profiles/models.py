@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from django.core.validators import FileExtensionValidator
 from django.utils import timezone
+from .resumes import get_resume_storage
 from .validators import validate_file_size_5mb
 
 
@@ -31,9 +32,11 @@ class CandidateProfile(models.Model):
     )
 
     skills = models.TextField(blank=True, help_text="Comma-separated skills")
+    normalized_skills = models.ManyToManyField('jobs.Skill', blank=True, related_name='candidates')
 
     resume = models.FileField(
         upload_to=user_resume_path,
+        storage=get_resume_storage,
         validators=[
             FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx']),
             validate_file_size_5mb
@@ -78,6 +81,47 @@ class CandidateProfile(models.Model):
     def __str__(self):
         return self.user.email
 
+
+class ResumeBlob(models.Model):
+    """
+    A resume file stored once by content (profiles/resumes.py) and the
+    number of profiles and applications referring to it.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+
+class ResumeText(models.Model):
+    """
+    Text extracted from a resume, keyed by the SHA-256 of the file's
+    content so each distinct file is extracted once (profiles/resume_index.py).
+    """
+    digest = models.CharField(max_length=64, unique=True)
+    text = models.TextField(blank=True)
+    # Why no text could be extracted, empty on success
+    error = models.CharField(max_length=200, blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.digest
+
+
+class ResumeIndexQueue(models.Model):
+    """
+    A candidate whose resumes changed since their resume search index row
+    was written. A plain id rather than a foreign key: deleting a user
+    queues them too, so their row is removed from the index.
+    """
+    user_id = models.PositiveBigIntegerField(unique=True)
+    queued_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"user {self.user_id}"
+
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
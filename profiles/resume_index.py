@@ -0,0 +1,264 @@
+# profiles/resume_index.py
+"""
+Resume search index. Each candidate has one SQLite FTS5 row (rowid = user
+id) holding the text of every resume they use, on their profile or on
+applications, so consultants can search candidates by resume content.
+
+Saving or deleting a resume only queues the candidate (ResumeIndexQueue,
+see jobs/signals.py); the `index_resumes` command works the queue off the
+request path, extracting new files in a process pool (profiles/extraction.py).
+Text is stored per content hash in ResumeText, so a file is extracted
+again only when its content changes, and a candidate's row is rewritten
+only when the set of hashes behind it changes.
+"""
+from collections import deque
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from jobs.search import TOKEN_RE
+from .extraction import extract_text
+from .resumes import blob_digest, file_digest, resume_models, resume_storage
+
+FTS_TABLE = 'profiles_resume_fts'
+
+BATCH_SIZE = 100
+SEARCH_LIMIT = 50
+
+# Snippet highlight markers, turned into <mark> once the snippet is escaped
+MARK_START, MARK_END = '\x02', '\x03'
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+# ----------------------------
+# Queue
+# ----------------------------
+def queue_candidates(user_ids):
+    """
+    Queue candidates for (re)indexing; queueing one already queued moves
+    its time forward, so a change made while it is indexed isn't lost.
+    """
+    from .models import ResumeIndexQueue
+
+    now = timezone.now()
+    ResumeIndexQueue.objects.bulk_create(
+        [ResumeIndexQueue(user_id=user_id, queued_at=now) for user_id in set(user_ids)],
+        update_conflicts=True,
+        unique_fields=['user_id'],
+        update_fields=['queued_at'],
+    )
+
+
+def queue_all(batch_size=1000):
+    """
+    Queue every candidate with a resume or an index row, e.g. to backfill
+    the index. Returns the number queued.
+    """
+    user_ids = set()
+    for model in resume_models():
+        user_ids.update(model.objects.exclude(resume='').exclude(resume=None).values_list('user_id', flat=True))
+    if fts_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT rowid FROM {FTS_TABLE}")
+            user_ids.update(row[0] for row in cursor.fetchall())
+
+    user_ids = sorted(user_ids)
+    for start in range(0, len(user_ids), batch_size):
+        queue_candidates(user_ids[start:start + batch_size])
+    return len(user_ids)
+
+
+def index_queued(batch_size=BATCH_SIZE, executor=None, window=1):
+    """
+    Index the queued candidates, batch by batch, until the queue holds only
+    candidates queued after this call started. Returns the summed counts of
+    index_candidates.
+    """
+    from .models import ResumeIndexQueue
+
+    started = timezone.now()
+    totals = {'candidates': 0, 'extracted': 0, 'failed': 0, 'indexed': 0, 'removed': 0}
+    while True:
+        batch = list(
+            ResumeIndexQueue.objects.filter(queued_at__lte=started)
+            .order_by('queued_at')
+            .values_list('user_id', flat=True)[:batch_size]
+        )
+        if not batch:
+            return totals
+
+        counts = index_candidates(batch, executor=executor, window=window)
+        for key, value in counts.items():
+            totals[key] += value
+        # Candidates queued again meanwhile have a later time: indexed again
+        ResumeIndexQueue.objects.filter(user_id__in=batch, queued_at__lte=started).delete()
+
+
+# ----------------------------
+# Indexing
+# ----------------------------
+def resume_digest(name):
+    """
+    Content hash of a stored resume, read from the name of a blob and
+    computed for files stored under their upload name; None if missing.
+    """
+    if not resume_storage.exists(name):
+        return None
+    return blob_digest(name) or file_digest(name)
+
+
+def extract_resumes(files, executor=None, window=1):
+    """
+    Extract the text of (digest, name) resumes, yielding (digest, text,
+    error). With an executor, files are read here and extracted in its
+    workers, at most `window` at a time so memory stays bounded. A file
+    gone from storage meanwhile yields None for text.
+    """
+    pending = deque()
+    for digest, name in files:
+        try:
+            with resume_storage.open(name, 'rb') as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            yield digest, None, "Missing from storage."
+            continue
+        if executor is None:
+            yield (digest, *extract_text(data, name))
+            continue
+
+        pending.append((digest, executor.submit(extract_text, data, name)))
+        if len(pending) >= window:
+            digest, future = pending.popleft()
+            yield (digest, *future.result())
+    while pending:
+        digest, future = pending.popleft()
+        yield (digest, *future.result())
+
+
+def index_candidates(user_ids, executor=None, window=1):
+    """
+    Bring the index rows of the given candidates up to date: extract the
+    resumes no text is stored for yet, then rewrite the rows whose resumes
+    changed and remove those of candidates without any.
+
+    Returns counts of the candidates looked at, files extracted (and of
+    those, failed), rows written and rows removed.
+    """
+    from .models import ResumeText
+
+    counts = {'candidates': len(user_ids), 'extracted': 0, 'failed': 0, 'indexed': 0, 'removed': 0}
+    if not fts_available():
+        return counts
+
+    names = {user_id: [] for user_id in user_ids}
+    for model in resume_models():
+        rows = (
+            model.objects.filter(user_id__in=user_ids).exclude(resume='').exclude(resume=None)
+            .order_by('id').values_list('user_id', 'resume')
+        )
+        for user_id, name in rows:
+            if name not in names[user_id]:
+                names[user_id].append(name)
+
+    digests = {}
+    for name in {name for user_names in names.values() for name in user_names}:
+        digests[name] = resume_digest(name)
+
+    wanted = {}
+    for user_id, user_names in names.items():
+        user_digests = []
+        for name in user_names:
+            if digests[name] and digests[name] not in user_digests:
+                user_digests.append(digests[name])
+        wanted[user_id] = ' '.join(user_digests)
+
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT rowid, digests FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", list(user_ids))
+        indexed = dict(cursor.fetchall())
+    changed = [user_id for user_id in user_ids if wanted[user_id] != indexed.get(user_id, '')]
+    if not changed:
+        return counts
+
+    needed = {digest for user_id in changed for digest in wanted[user_id].split()}
+    known = set(ResumeText.objects.filter(digest__in=needed).values_list('digest', flat=True))
+    files = {digest: name for name, digest in digests.items() if digest in needed - known}
+
+    extracted = []
+    for digest, text, error in extract_resumes(sorted(files.items()), executor=executor, window=window):
+        counts['extracted'] += 1
+        counts['failed'] += bool(error)
+        # Nothing stored for a missing file: extracted if it comes back
+        if text is not None:
+            extracted.append(ResumeText(digest=digest, text=text, error=error))
+    ResumeText.objects.bulk_create(extracted, ignore_conflicts=True)
+
+    texts = dict(ResumeText.objects.filter(digest__in=needed).exclude(text='').values_list('digest', 'text'))
+    rows = []
+    for user_id in changed:
+        text = '\n\n'.join(texts[digest] for digest in wanted[user_id].split() if digest in texts)
+        if wanted[user_id]:
+            rows.append([user_id, text, wanted[user_id]])
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[user_id] for user_id in changed])
+        cursor.executemany(f"INSERT INTO {FTS_TABLE} (rowid, text, digests) VALUES (%s, %s, %s)", rows)
+    counts['indexed'] = len(rows)
+    counts['removed'] = sum(1 for user_id in changed if not wanted[user_id] and user_id in indexed)
+    return counts
+
+
+def optimize_index():
+    if not fts_available():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+
+# ----------------------------
+# Querying
+# ----------------------------
+def build_match_expression(query):
+    """
+    Every word of the query must appear (as a word prefix) in the resume
+    text, e.g. "djang postgres" -> text : ("djang"* AND "postgres"*).
+    Returns an empty string when the query has no searchable words.
+    """
+    tokens = TOKEN_RE.findall(str(query).lower())
+    if not tokens:
+        return ''
+    return 'text : ({})'.format(' AND '.join(f'"{token}"*' for token in tokens))
+
+
+def highlight(snippet):
+    return mark_safe(escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>'))
+
+
+def search_resumes(query, user_ids, limit=SEARCH_LIMIT):
+    """
+    Candidates among `user_ids` (a values('user_id') style queryset) whose
+    resumes match `query`, best match first (FTS5 bm25 rank).
+
+    Returns [(user id, highlighted snippet)].
+    """
+    expression = build_match_expression(query)
+    if not expression or not fts_available():
+        return []
+
+    subquery, params = user_ids.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, snippet({FTS_TABLE}, 0, %s, %s, ' … ', 16) FROM {FTS_TABLE} "
+            # +rowid: a plain rowid IN (...) is handed to FTS5, which then
+            # runs the whole query once per candidate in the subquery
+            f"WHERE {FTS_TABLE} MATCH %s AND +rowid IN ({subquery}) "
+            "ORDER BY rank LIMIT %s",
+            [MARK_START, MARK_END, expression, *params, limit],
+        )
+        return [(user_id, highlight(snippet)) for user_id, snippet in cursor.fetchall()]
@@ -0,0 +1,273 @@
+# profiles/resumes.py
+"""
+Content-addressed resume storage. An upload is hashed in chunks and
+stored once, under its SHA-256, however many profiles and applications
+use the same bytes. CandidateProfile.resume and Application.resume hold
+the blob name; ResumeBlob counts the rows referring to each blob (kept
+up to date by the save/delete signals in jobs/signals.py) and a blob is
+deleted with its last reference.
+"""
+import hashlib
+import os
+
+from django.core.files.storage import Storage, default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+BLOB_DIR = 'resumes/sha256'
+
+
+def blob_name(digest, filename):
+    """
+    'resumes/sha256/3f/3fa9...e1.pdf': the extension is kept for the
+    content type the file is served with.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    return f"{BLOB_DIR}/{digest[:2]}/{digest}{extension}"
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_DIR + '/')
+
+
+def blob_digest(name):
+    """
+    The SHA-256 a blob is named after, None for other names (and for a
+    blob the backend had to rename, see ResumeStorage._save).
+    """
+    if not is_blob(name):
+        return None
+    digest = os.path.splitext(os.path.basename(name))[0]
+    return digest if len(digest) == 64 else None
+
+
+class ResumeStorage(Storage):
+    """
+    Content-addressed layer over the default storage: a file is saved under
+    the hash of its content, and not written again when that content is
+    already stored.
+    """
+
+    @property
+    def backend(self):
+        return default_storage
+
+    def get_available_name(self, name, max_length=None):
+        # The stored name comes from the content (see _save)
+        return name
+
+    def _save(self, name, content):
+        # Hashed in chunks, so a large upload is never read into memory
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        name = blob_name(digest.hexdigest(), name)
+        if not self.backend.exists(name):
+            # Two first uploads of the same content racing each other
+            # store it twice (the backend renames the second), no worse
+            name = self.backend.save(name, content)
+        return name
+
+    def _open(self, name, mode='rb'):
+        return self.backend.open(name, mode)
+
+    def delete(self, name):
+        self.backend.delete(name)
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def listdir(self, path):
+        return self.backend.listdir(path)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def url(self, name):
+        return self.backend.url(name)
+
+    def path(self, name):
+        return self.backend.path(name)
+
+
+resume_storage = ResumeStorage()
+
+
+def get_resume_storage():
+    return resume_storage
+
+
+def file_digest(name, storage=None):
+    storage = storage or resume_storage
+    digest = hashlib.sha256()
+    with storage.open(name, 'rb') as handle:
+        for chunk in handle.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ----------------------------
+# Reference counts
+# ----------------------------
+def acquire(name, content=None):
+    """
+    Count one more row referring to blob `name`. `content`, the file just
+    saved under that name, puts the blob back if the last reference to
+    it was released (and the file deleted) after ResumeStorage._save
+    found it stored, but before this reference was counted.
+    """
+    from .models import ResumeBlob
+
+    if not is_blob(name):
+        return
+    if ResumeBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            ResumeBlob.objects.create(name=name, ref_count=1)
+    except IntegrityError:
+        # Created concurrently
+        ResumeBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+        return
+    # No row: a new blob, or one deleted by delete_unreferenced meanwhile
+    if content is not None and not resume_storage.exists(name):
+        restore_blob(name, content)
+
+
+def restore_blob(name, content):
+    try:
+        content.open('rb')
+    except OSError:
+        # Not an upload: only the name was assigned, nothing to restore from
+        return
+    resume_storage.backend.save(name, content)
+
+
+def release(name):
+    """
+    Count one row less referring to blob `name`; the blob is deleted once
+    the transaction commits if nothing refers to it any more.
+    """
+    from .models import ResumeBlob
+
+    if not is_blob(name):
+        return
+    ResumeBlob.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+    transaction.on_commit(lambda: delete_unreferenced([name]))
+
+
+def delete_unreferenced(names):
+    from .models import ResumeBlob, ResumeText
+
+    for name in names:
+        # The file goes before the row's deletion commits: an acquire() of
+        # the same blob either counts on the row first (and the blob is
+        # kept) or waits for this, finds neither and restores the file
+        with transaction.atomic():
+            deleted, _ = ResumeBlob.objects.filter(name=name, ref_count=0).delete()
+            if deleted:
+                resume_storage.delete(name)
+                ResumeText.objects.filter(digest=blob_digest(name)).delete()
+
+
+def resume_models():
+    from jobs.models import Application
+    from .models import CandidateProfile
+
+    return (CandidateProfile, Application)
+
+
+def referenced_names():
+    """
+    {resume name: number of rows referring to it} over every resume field.
+    """
+    counts = {}
+    for model in resume_models():
+        rows = model.objects.exclude(resume='').exclude(resume=None).values('resume').annotate(count=Count('id'))
+        for row in rows.values_list('resume', 'count'):
+            counts[row[0]] = counts.get(row[0], 0) + row[1]
+    return counts
+
+
+def reconcile_blobs(fix=True):
+    """
+    Recompute the reference count of every blob from the rows referring to
+    it. With `fix`, wrong counts are corrected and blobs nothing refers to
+    (rows and files) deleted. Returns {'drift': {name: (stored, actual)},
+    'unreferenced': [names]}.
+    """
+    from .models import ResumeBlob
+
+    actual = {name: count for name, count in referenced_names().items() if is_blob(name)}
+    stored = dict(ResumeBlob.objects.values_list('name', 'ref_count'))
+    drift = {
+        name: (stored.get(name), actual.get(name, 0))
+        for name in stored.keys() | actual.keys()
+        if stored.get(name) != actual.get(name, 0)
+    }
+
+    files = set()
+    if resume_storage.exists(BLOB_DIR):
+        for prefix in resume_storage.listdir(BLOB_DIR)[0]:
+            files.update(f"{BLOB_DIR}/{prefix}/{name}" for name in resume_storage.listdir(f"{BLOB_DIR}/{prefix}")[1])
+    unreferenced = sorted((files | stored.keys()) - actual.keys())
+
+    if fix:
+        with transaction.atomic():
+            for name, (_, count) in drift.items():
+                if count:
+                    ResumeBlob.objects.update_or_create(name=name, defaults={'ref_count': count})
+        for name in unreferenced:
+            ResumeBlob.objects.filter(name=name).delete()
+            resume_storage.delete(name)
+
+    return {'drift': drift, 'unreferenced': unreferenced}
+
+
+# ----------------------------
+# Deduplicating stored files
+# ----------------------------
+def dedupe_resumes(fix=True, stdout=None):
+    """
+    Move every resume stored under a per-upload name (resumes/user_<id>/,
+    applications/resumes/) to its content-addressed blob and point the rows
+    at it, then reconcile the reference counts. Files missing from storage
+    are reported and left alone.
+
+    Returns counts of the files, rows and bytes involved.
+    """
+    result = {'files': 0, 'blobs': 0, 'rows': 0, 'bytes_freed': 0, 'missing': []}
+    blobs = set()
+
+    for name in sorted(referenced_names()):
+        if is_blob(name):
+            continue
+        if not resume_storage.exists(name):
+            result['missing'].append(name)
+            continue
+
+        blob = blob_name(file_digest(name), name)
+        new = blob not in blobs and not resume_storage.exists(blob)
+        blobs.add(blob)
+        result['files'] += 1
+        if new:
+            result['blobs'] += 1
+        else:
+            result['bytes_freed'] += resume_storage.size(name)
+        if stdout:
+            stdout.write(f"{name} -> {blob}")
+        if not fix:
+            continue
+
+        if new:
+            with resume_storage.open(name, 'rb') as handle:
+                resume_storage.save(name, handle)
+        with transaction.atomic():
+            for model in resume_models():
+                # UPDATE without signals: the counts are reconciled below
+                result['rows'] += model.objects.filter(resume=name).update(resume=blob)
+        resume_storage.delete(name)
+
+    if fix:
+        reconcile_blobs()
+    return result
@@ -1,3 +1,314 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from jobs.models import Application, Job
+from . import resume_index
+from .extraction import extract_text
+from .models import CandidateProfile, ResumeBlob, ResumeIndexQueue, ResumeText
+from .resumes import BLOB_DIR, blob_name, reconcile_blobs, resume_storage
+
+
+class ResumeTestCase(TestCase):
+    """
+    A consultant's job and two candidates, with resumes stored in a
+    temporary MEDIA_ROOT.
+    """
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        settings = override_settings(MEDIA_ROOT=self.media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.consultant = User.objects.create_user(
+            email='consultant@example.com', password='pass12345', role='CONSULTANT'
+        )
+        self.job = Job.objects.create(
+            posted_by=self.consultant, title='Python Developer', company='Vetri', location='Chennai',
+            experience=2, job_type='FT', domain='Web', skills='python', description='Build things.',
+        )
+        self.candidates = [
+            User.objects.create_user(email=f'candidate{i}@example.com', password='pass12345') for i in range(2)
+        ]
+
+    def upload(self, user, content, filename='cv.pdf'):
+        self.client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('profiles:candidate_profile'), {
+                'first_name': 'Asha',
+                'resume': SimpleUploadedFile(filename, content, content_type='application/pdf'),
+            })
+        return CandidateProfile.objects.get(user=user)
+
+
+class ResumeStorageTests(ResumeTestCase):
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.media)
+            for root, _, names in os.walk(self.media) for name in names
+        )
+
+    def ref_counts(self):
+        return dict(ResumeBlob.objects.values_list('name', 'ref_count'))
+
+    def test_identical_uploads_are_stored_once(self):
+        first = self.upload(self.candidates[0], b'%PDF same bytes', 'asha.pdf')
+        second = self.upload(self.candidates[1], b'%PDF same bytes', 'Resume (final).PDF')
+
+        self.assertEqual(first.resume.name, second.resume.name)
+        self.assertTrue(first.resume.name.startswith(BLOB_DIR + '/'))
+        self.assertTrue(first.resume.name.endswith('.pdf'))
+        self.assertEqual(self.stored_files(), [first.resume.name])
+        self.assertEqual(self.ref_counts(), {first.resume.name: 2})
+        with first.resume.open('rb') as handle:
+            self.assertEqual(handle.read(), b'%PDF same bytes')
+
+    def test_blob_deleted_with_its_last_reference(self):
+        profile = self.upload(self.candidates[0], b'%PDF v1')
+        first = profile.resume.name
+        # Applying with the profile resume shares the blob
+        application = Application.objects.create(user=self.candidates[0], job=self.job, resume=first)
+
+        profile = self.upload(self.candidates[0], b'%PDF v2')
+        second = profile.resume.name
+        self.assertEqual(self.ref_counts(), {first: 1, second: 1})
+        self.assertTrue(resume_storage.exists(first))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application.delete()
+        self.assertEqual(self.ref_counts(), {second: 1})
+        self.assertEqual(self.stored_files(), [second])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.candidates[0].delete()
+        self.assertEqual(self.ref_counts(), {})
+        self.assertEqual(self.stored_files(), [])
+
+    def test_blob_restored_when_deleted_while_saving(self):
+        first = self.upload(self.candidates[0], b'%PDF same bytes')
+        name = first.resume.name
+        save = type(resume_storage)._save
+
+        def save_then_release(storage, *args):
+            # The last reference goes between the blob being found stored
+            # and the new row's reference being counted
+            stored = save(storage, *args)
+            with self.captureOnCommitCallbacks(execute=True):
+                first.delete()
+            self.assertEqual(self.stored_files(), [])
+            return stored
+
+        with mock.patch.object(type(resume_storage), '_save', save_then_release):
+            second = self.upload(self.candidates[1], b'%PDF same bytes')
+
+        self.assertEqual(second.resume.name, name)
+        self.assertEqual(self.ref_counts(), {name: 1})
+        with second.resume.open('rb') as handle:
+            self.assertEqual(handle.read(), b'%PDF same bytes')
+
+    def test_saves_without_the_resume_keep_the_count(self):
+        profile = self.upload(self.candidates[0], b'%PDF v1')
+        profile.skills = 'python'
+        profile.save(update_fields=['skills'])
+        profile.save()
+        self.assertEqual(self.ref_counts(), {profile.resume.name: 1})
+
+    def test_dedupe_command(self):
+        legacy = {
+            'resumes/user_1/cv.pdf': b'%PDF shared',
+            'applications/resumes/cv_Ab12.pdf': b'%PDF shared',
+            'resumes/user_2/other.docx': b'PK other',
+        }
+        for name, content in legacy.items():
+            # Written as the plain FileSystemStorage used to
+            os.makedirs(os.path.dirname(os.path.join(self.media, name)), exist_ok=True)
+            with open(os.path.join(self.media, name), 'wb') as handle:
+                handle.write(content)
+        CandidateProfile.objects.filter(user=self.candidates[0]).update(resume='resumes/user_1/cv.pdf')
+        CandidateProfile.objects.filter(user=self.candidates[1]).update(resume='resumes/user_2/other.docx')
+        Application.objects.create(user=self.candidates[0], job=self.job, resume='applications/resumes/cv_Ab12.pdf')
+        Application.objects.create(user=self.candidates[1], job=self.job, resume='resumes/user_gone/missing.pdf')
+
+        out = StringIO()
+        call_command('dedupe_resumes', dry_run=True, stdout=out)
+        self.assertIn('3 files would move to 2 blobs, freeing 11\xa0bytes', out.getvalue())
+        self.assertEqual(len(self.stored_files()), 3)
+
+        call_command('dedupe_resumes', stdout=out)
+        shared = blob_name(hashlib.sha256(b'%PDF shared').hexdigest(), 'cv.pdf')
+        other = blob_name(hashlib.sha256(b'PK other').hexdigest(), 'other.docx')
+        self.assertIn('Missing from storage, left as is: resumes/user_gone/missing.pdf', out.getvalue())
+        self.assertEqual(self.stored_files(), sorted([shared, other]))
+        self.assertEqual(
+            set(CandidateProfile.objects.exclude(resume='').values_list('resume', flat=True)), {shared, other}
+        )
+        self.assertEqual(self.ref_counts(), {shared: 2, other: 1})
+
+    def test_reconcile_blobs(self):
+        profile = self.upload(self.candidates[0], b'%PDF v1')
+        orphan = resume_storage.save('stray.pdf', ContentFile(b'%PDF stray'))
+        ResumeBlob.objects.update(ref_count=5)
+
+        result = reconcile_blobs()
+        self.assertEqual(result['drift'], {profile.resume.name: (5, 1)})
+        self.assertEqual(result['unreferenced'], [orphan])
+        self.assertEqual(self.ref_counts(), {profile.resume.name: 1})
+        self.assertEqual(self.stored_files(), [profile.resume.name])
+
+
+def make_pdf(*lines):
+    content = b'BT /F1 12 Tf 72 712 Td '
+    for line in lines:
+        content += b'(' + line.encode().replace(b'(', b'\\(').replace(b')', b'\\)') + b') Tj 0 -14 Td '
+    stream = zlib.compress(content + b'ET')
+    return (
+        b'%PDF-1.4\n4 0 obj\n<< /Length ' + str(len(stream)).encode() + b' /Filter /FlateDecode >>\nstream\n'
+        + stream + b'\nendstream\nendobj\n%%EOF\n'
+    )
+
+
+def make_docx(*paragraphs, compression=zipfile.ZIP_STORED):
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression) as archive:
+        archive.writestr(
+            'word/document.xml',
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{body}</w:body></w:document>',
+        )
+    return buffer.getvalue()
+
+
+class ResumeExtractionTests(TestCase):
+    def test_pdf_and_docx(self):
+        pdf = make_pdf('Senior Django (Python) developer', 'PostgreSQL   expert')
+        self.assertEqual(extract_text(pdf, 'cv.PDF'), ('Senior Django (Python) developer\nPostgreSQL expert', ''))
+        docx = make_docx('Data engineer', '', 'Café ﬁve years')
+        self.assertEqual(extract_text(docx, 'cv.docx'), ('Data engineer\nCafé five years', ''))
+
+    def test_unreadable_files_report_why(self):
+        self.assertEqual(extract_text(b'%PDF-1.4 no streams', 'cv.pdf'), ('', 'No text found.'))
+        self.assertEqual(extract_text(b'not a zip', 'cv.docx'), ('', 'Unreadable DOCX: File is not a zip file'))
+        self.assertEqual(extract_text(b'\xd0\xcf\x11\xe0', 'cv.doc'), ('', 'Unsupported file type .doc.'))
+
+    def test_corrupt_docx_is_reported(self):
+        docx = make_docx('Data engineer', compression=zipfile.ZIP_DEFLATED)
+        # Invalid deflate block type: zipfile raises zlib.error
+        start = docx.index(b'word/document.xml') + len('word/document.xml')
+        corrupt = docx[:start] + b'\xff' * 8 + docx[start + 8:]
+        text, error = extract_text(corrupt, 'cv.docx')
+        self.assertEqual(text, '')
+        self.assertTrue(error.startswith('Unreadable DOCX: '), error)
+
+    def test_extracts_in_worker_processes(self):
+        files = {'a' * 64: make_pdf('Kotlin'), 'b' * 64: make_docx('Swift'), 'c' * 64: make_pdf('Rust')}
+        opened = lambda name, mode: ContentFile(files[name[:64]])
+        with mock.patch.object(resume_storage, 'open', side_effect=opened):
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                results = list(resume_index.extract_resumes(
+                    [(digest, digest + ('.docx' if digest[0] == 'b' else '.pdf')) for digest in files],
+                    executor=executor, window=2,
+                ))
+        self.assertEqual(results, [('a' * 64, 'Kotlin', ''), ('b' * 64, 'Swift', ''), ('c' * 64, 'Rust', '')])
+
+
+class ResumeIndexTests(ResumeTestCase):
+    def index(self):
+        out = StringIO()
+        with mock.patch.object(resume_index, 'extract_text', wraps=extract_text) as extract:
+            call_command('index_resumes', workers=1, stdout=out)
+        return extract.call_count, out.getvalue()
+
+    def search(self, query):
+        self.client.force_login(self.consultant)
+        response = self.client.get(reverse('jobs:resume_search'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [(result['application'].user, result['snippet']) for result in response.context['results']]
+
+    def apply(self, user, resume):
+        return Application.objects.create(user=user, job=self.job, resume=resume)
+
+    def test_search_ranks_the_consultants_applicants(self):
+        asha, ravi = self.candidates
+        outsider = User.objects.create_user(email='outsider@example.com', password='pass12345')
+        self.apply(asha, self.upload(asha, make_pdf('Django developer', 'Django REST developer')).resume.name)
+        self.apply(ravi, self.upload(ravi, make_docx('Java developer', 'Spring, Hibernate'), 'cv.docx').resume.name)
+        self.upload(outsider, make_pdf('Django Django Django'))
+
+        extracted, out = self.index()
+        self.assertEqual(extracted, 3)
+        self.assertIn('3 candidates checked: 3 resumes extracted (0 without text), 3 index rows written', out)
+        self.assertFalse(ResumeIndexQueue.objects.exists())
+
+        self.assertEqual([user for user, _ in self.search('developer')], [asha, ravi])
+        (user, snippet), = self.search('djan rest')
+        self.assertEqual(user, asha)
+        self.assertIn('<mark>Django</mark> <mark>REST</mark>', snippet)
+        self.assertEqual(self.search('hibernate <script>'), [])
+        self.assertEqual([user for user, _ in self.search('spring')], [ravi])
+
+        self.client.force_login(asha)
+        self.assertEqual(self.client.get(reverse('jobs:resume_search'), {'q': 'java'}).status_code, 403)
+
+    def test_reextracts_only_changed_content(self):
+        asha, ravi = self.candidates
+        profile = self.upload(asha, make_pdf('Kotlin developer'))
+        self.apply(asha, profile.resume.name)
+        self.index()
+
+        # Same bytes again, from the same or another candidate: nothing extracted
+        self.upload(asha, make_pdf('Kotlin developer'), 'renamed.pdf')
+        self.apply(ravi, self.upload(ravi, make_pdf('Kotlin developer')).resume.name)
+        self.assertEqual(self.index()[0], 0)
+        self.assertEqual({user for user, _ in self.search('kotlin')}, {asha, ravi})
+
+        self.upload(asha, make_pdf('Swift developer'))
+        self.assertEqual(self.index()[0], 1)
+        self.assertEqual(ResumeText.objects.count(), 2)
+        # The application still uses the first resume
+        self.assertEqual([user for user, _ in self.search('swift')], [asha])
+        self.assertEqual({user for user, _ in self.search('kotlin')}, {asha, ravi})
+
+    def test_bad_and_missing_files_dont_stop_indexing(self):
+        asha, ravi = self.candidates
+        docx = make_docx('Go developer', compression=zipfile.ZIP_DEFLATED)
+        start = docx.index(b'word/document.xml') + len('word/document.xml')
+        self.upload(asha, docx[:start] + b'\xff' * 8 + docx[start + 8:], 'cv.docx')
+        missing = self.upload(ravi, make_pdf('Rust developer')).resume.name
+        resume_storage.delete(missing)
+
+        extracted, out = self.index()
+        self.assertEqual(extracted, 1)
+        self.assertIn('2 candidates checked: 1 resumes extracted (1 without text)', out)
+        self.assertFalse(ResumeIndexQueue.objects.exists())
+        self.assertIn('Unreadable DOCX', ResumeText.objects.get().error)
+
+    def test_deleted_resumes_leave_the_index(self):
+        asha, _ = self.candidates
+        application = self.apply(asha, self.upload(asha, make_pdf('Scala developer')).resume.name)
+        self.index()
+        self.assertEqual(len(self.search('scala')), 1)
+
+        CandidateProfile.objects.filter(user=asha).first().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            application.delete()
+        self.assertIn('1 removed', self.index()[1])
+        self.assertFalse(ResumeText.objects.exists())
+        self.assertEqual(resume_index.search_resumes('scala', Application.objects.values('user_id')), [])
 
-# Create your tests here.
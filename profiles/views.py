@@ -24,9 +24,9 @@ def candidate_profile_view(request):
 
 
         # ✅ HANDLE RESUME
+        # The previous file is deleted with its last reference
+        # (applications may share it): see profiles/resumes.py
         if "resume" in request.FILES:
-            if profile.resume:
-                profile.resume.delete(save=False)
             profile.resume = request.FILES["resume"]
         profile.full_clean()
         profile.save()
@@ -34,7 +34,7 @@ def candidate_profile_view(request):
         return redirect("profiles:candidate_profile")
 
     skills_list = (
-        [s.strip() for s in profile.skills.split(",") if s.strip()]
+        list(profile.normalized_skills.values_list("name", flat=True))
         if profile.skills else []
     )
 
@@ -44,7 +44,8 @@ def course_detail_view(request, course_id):
 
 @login_required
 def enroll_course_view(request, course_id):
-    if not request.user.subscription.is_pro():
+    subscription = getattr(request.user, 'subscription', None)
+    if not subscription or not subscription.is_pro():
         messages.warning(request, "You need a Pro subscription to enroll in courses.")
         return redirect('subscriptions:plans')
 